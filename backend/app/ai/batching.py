@@ -0,0 +1,174 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import replace
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.ai.classifier import ImageClassifier, load_classifier
+from app.core.jobs import CLASSIFY, enqueue
+from app.core.stats import apply_report_stats_sync, report_facts
+from app.models.report import Report
+
+MAX_BATCH_SIZE = int(os.getenv("CLASSIFIER_MAX_BATCH_SIZE", "32"))
+MAX_WAIT_SECONDS = float(os.getenv("CLASSIFIER_MAX_WAIT_MS", "20")) / 1000
+# How long a classify job waits for its prediction before failing (and retrying)
+PREDICT_TIMEOUT_SECONDS = float(os.getenv("CLASSIFIER_TIMEOUT_SECONDS", "30"))
+
+logger = logging.getLogger("app.classifier")
+
+
+class ClassificationQueue:
+    """
+    Micro-batching front for an ImageClassifier.
+
+    Callers `submit` an image and wait on the returned future. A single
+    worker thread waits for the first image, keeps collecting until
+    `max_batch_size` images or `max_wait` seconds have passed, and runs one
+    `predict_batch` call for the lot, so the job workers classifying
+    reports at the same time share one inference call.
+    """
+
+    def __init__(
+        self,
+        classifier: ImageClassifier | None = None,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait: float = MAX_WAIT_SECONDS,
+    ):
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            if self.classifier is None:
+                self.classifier = load_classifier()
+            self._thread = threading.Thread(
+                target=self._run, name="classifier", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            if self._thread is None:
+                return
+            self._jobs.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, image_path: str, filename: str | None = None) -> Future:
+        # Started with the app or worker process; this only covers callers
+        # that did not (scripts, tests)
+        self.start()
+        future = Future()
+        self._jobs.put((image_path, filename, future))
+        return future
+
+    def _next_batch(self):
+        first = self._jobs.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = self._jobs.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if job is None:
+                self._jobs.put(None)  # finish this batch, then stop
+                break
+            batch.append(job)
+
+        return batch
+
+    def _run(self):
+        while (batch := self._next_batch()) is not None:
+            try:
+                predictions = self.classifier.predict_batch(
+                    [(path, filename) for path, filename, _ in batch]
+                )
+            except Exception as exc:
+                # Never let one bad batch kill the worker; its jobs retry
+                logger.exception("classification batch of %d images failed", len(batch))
+                for _, _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (_, _, future), prediction in zip(batch, predictions):
+                future.set_result(prediction)
+
+
+classification_queue = ClassificationQueue()
+
+
+def queue_classification(db, report_id: int, image_path: str, filename: str | None):
+    """
+    Classify a report's image in the background. Enqueued in the caller's
+    transaction, so it survives a restart and is dropped with a rollback.
+    """
+    enqueue(db, CLASSIFY, {
+        "report_id": report_id,
+        "image_path": image_path,
+        "filename": filename,
+    })
+
+
+def classify_report(db: Session, payload: dict):
+    """Job handler: predict the category of a report's image and store it."""
+    report_id, image_path = payload["report_id"], payload["image_path"]
+    # Skip reports deleted or re-photographed since (that enqueued its own job)
+    current = db.scalar(
+        select(Report.id).where(Report.id == report_id, Report.image_path == image_path)
+    )
+    if current is None:
+        return
+
+    future = classification_queue.submit(image_path, payload.get("filename"))
+    category, confidence = future.result(timeout=PREDICT_TIMEOUT_SECONDS)
+    _store_prediction(db, report_id, image_path, category, confidence)
+
+
+def _store_prediction(db, report_id: int, image_path: str, category: str, confidence: float):
+    # The category moves the report between analytics rows. The write is
+    # conditional on the facts the deltas were computed from, so a status
+    # change committed in between makes it miss and it is recomputed.
+    while True:
+        row = db.execute(
+            select(Report.created_at, Report.status, Report.predicted_category, Report.resolved_at)
+            # Skip reports whose image changed while queued
+            .where(Report.id == report_id, Report.image_path == image_path)
+        ).first()
+        if row is None:
+            return
+
+        before = report_facts(row)
+        updated = db.execute(
+            update(Report)
+            .where(
+                Report.id == report_id,
+                Report.image_path == image_path,
+                Report.status == before.status,
+                Report.predicted_category.is_not_distinct_from(before.category),
+                Report.resolved_at.is_not_distinct_from(before.resolved_at),
+            )
+            .values(predicted_category=category, confidence_score=confidence)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if updated:
+            apply_report_stats_sync(db, before, replace(before, category=category))
+            return
+
+classification_queue = ClassificationQueue()
@@ -1,3 +1,21 @@
+import logging
+import os
+
+try:
+    import joblib
+    import numpy as np
+    from PIL import Image
+except ImportError:  # the feature model is optional; fall back to filenames
+    joblib = None
+
+# (stored image path, original upload filename)
+ImageInput = tuple[str, str | None]
+
+MODEL_PATH = os.getenv("CLASSIFIER_MODEL_PATH", "models/classifier.joblib")
+
+logger = logging.getLogger("app.classifier")
+
+
 def classify_image(filename: str):
     filename = filename.lower()
 
@@ -9,3 +27,104 @@ def classify_image(filename: str):
         return "streetlight", 0.90
 
     return "other", 0.60
+
+
+class ImageClassifier:
+    """
+    Interface for classifier backends. `predict_batch` receives a whole
+    micro-batch at once and returns one (category, confidence) per input.
+    """
+    name = "base"
+
+    def predict_batch(self, images: list[ImageInput]) -> list[tuple[str, float]]:
+        raise NotImplementedError
+
+
+class FilenameClassifier(ImageClassifier):
+    name = "filename"
+
+    def predict_batch(self, images):
+        return [
+            classify_image(filename or os.path.basename(path))
+            for path, filename in images
+        ]
+
+
+def image_features(path: str):
+    """
+    128-dim feature vector: a 4x4x4 RGB colour histogram plus an 8x8
+    grayscale thumbnail. Cheap enough to compute per upload on CPU.
+    """
+    with Image.open(path) as img:
+        img.draft("RGB", (64, 64))  # JPEG: decode at reduced scale
+        small = img.convert("RGB").resize((32, 32))
+
+    pixels = np.asarray(small, dtype=np.uint8).reshape(-1, 3) // 64
+    bins = pixels[:, 0] * 16 + pixels[:, 1] * 4 + pixels[:, 2]
+    histogram = np.bincount(bins, minlength=64).astype(np.float32)
+    histogram /= histogram.sum()
+
+    gray = np.asarray(small.convert("L").resize((8, 8)), dtype=np.float32)
+    gray = gray.reshape(-1) / 255.0
+
+    return np.concatenate([histogram, gray])
+
+
+class FeatureModelClassifier(ImageClassifier):
+    """
+    scikit-learn model (anything with predict_proba) over `image_features`,
+    trained with `python -m app.ai.train`.
+    """
+    name = "feature_model"
+
+    def __init__(self, model_path: str = MODEL_PATH):
+        self.model = joblib.load(model_path)
+        self.fallback = FilenameClassifier()
+
+    def predict_batch(self, images):
+        results: list[tuple[str, float] | None] = [None] * len(images)
+        rows, positions = [], []
+
+        for i, (path, _) in enumerate(images):
+            try:
+                rows.append(image_features(path))
+                positions.append(i)
+            except OSError:
+                results[i] = self.fallback.predict_batch([images[i]])[0]
+
+        if rows:
+            # One inference call for the whole batch
+            probabilities = self.model.predict_proba(np.stack(rows))
+            labels = self.model.classes_
+            for i, probs in zip(positions, probabilities):
+                best = int(probs.argmax())
+                results[i] = (str(labels[best]), float(probs[best]))
+
+        return results
+
+
+def load_classifier() -> ImageClassifier:
+    """
+    Pick the backend once at startup. CLASSIFIER_BACKEND=filename forces the
+    heuristic. Otherwise the feature model is used; if it cannot be loaded
+    that is an error when CLASSIFIER_BACKEND=feature_model was set
+    explicitly, and a logged fallback to the heuristic when it was not.
+    """
+    backend = os.getenv("CLASSIFIER_BACKEND")
+    if backend == "filename":
+        return FilenameClassifier()
+
+    if joblib is None:
+        problem = "its dependencies (joblib, numpy, Pillow) are not installed"
+    elif not os.path.exists(MODEL_PATH):
+        problem = f"{MODEL_PATH} does not exist; train it with `python -m app.ai.train`"
+    else:
+        return FeatureModelClassifier(MODEL_PATH)
+
+    if backend == "feature_model":
+        raise RuntimeError(f"Cannot load the feature-model classifier: {problem}")
+    logger.error(
+        "Feature-model classifier unavailable, %s. Classifying by filename instead; "
+        "set CLASSIFIER_BACKEND=filename to make that explicit.", problem,
+    )
+    return FilenameClassifier()
@@ -0,0 +1,235 @@
+import heapq
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import combinations
+
+from app.core.geohash import haversine_m
+from app.database import SessionLocal
+from app.models.report import Report
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; duplicate detection is skipped
+    Image = None
+
+HASH_BITS = 64
+MAX_DISTANCE = int(os.getenv("DUPLICATE_MAX_DISTANCE", "7"))
+WINDOW = timedelta(days=int(os.getenv("DUPLICATE_WINDOW_DAYS", "7")))
+# Two photos of the same problem are taken at the same place
+RADIUS_M = float(os.getenv("DUPLICATE_RADIUS_M", "200"))
+# The index is per process: it sees its own reports at once and reloads from
+# the database this often to pick up reports hashed by other processes
+REFRESH_SECONDS = float(os.getenv("DUPLICATE_INDEX_REFRESH_SECONDS", "300"))
+
+
+def dhash(path: str) -> int:
+    """64-bit difference hash: brightness gradients of a 9x8 grayscale image."""
+    with Image.open(path) as img:
+        img.draft("L", (64, 64))
+        small = img.convert("L").resize((9, 8))
+
+    pixels = small.tobytes()
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class MultiIndexHash:
+    """
+    Multi-index hashing over 64-bit perceptual hashes.
+
+    The hash is split into `chunks` substrings, each with its own lookup
+    table. If two hashes differ in at most r bits, at least one substring
+    differs in at most r // chunks bits (pigeonhole), so a search only probes
+    the buckets within that small radius of each substring and verifies the
+    few candidates it finds, instead of scanning every stored hash.
+    """
+
+    def __init__(self, chunks: int = 4):
+        self.chunks = chunks
+        self.chunk_bits = HASH_BITS // chunks
+        self.mask = (1 << self.chunk_bits) - 1
+        self.tables = [defaultdict(set) for _ in range(chunks)]
+        self.entries: dict[int, tuple[int, datetime]] = {}
+        # (created_at, item_id), oldest first, for evicting by age; entries
+        # re-added or removed since are skipped when they reach the top
+        self._by_age: list[tuple[datetime, int]] = []
+        self.loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    def _substrings(self, value: int):
+        for i in range(self.chunks):
+            yield i, (value >> (i * self.chunk_bits)) & self.mask
+
+    def _neighbours(self, substring: int, radius: int):
+        for r in range(radius + 1):
+            for bits in combinations(range(self.chunk_bits), r):
+                flipped = substring
+                for bit in bits:
+                    flipped ^= 1 << bit
+                yield flipped
+
+    def add(self, item_id: int, value: int, created_at: datetime):
+        with self._lock:
+            self._add(item_id, value, created_at)
+
+    def _add(self, item_id: int, value: int, created_at: datetime):
+        self._remove(item_id)
+        self.entries[item_id] = (value, created_at)
+        heapq.heappush(self._by_age, (created_at, item_id))
+        for i, substring in self._substrings(value):
+            self.tables[i][substring].add(item_id)
+
+    def remove(self, item_id: int):
+        with self._lock:
+            self._remove(item_id)
+
+    def _remove(self, item_id: int):
+        entry = self.entries.pop(item_id, None)
+        if entry is None:
+            return
+        for i, substring in self._substrings(entry[0]):
+            bucket = self.tables[i][substring]
+            bucket.discard(item_id)
+            if not bucket:
+                del self.tables[i][substring]
+
+    def evict(self, before: datetime) -> int:
+        """Drop entries created before `before`; returns how many."""
+        evicted = 0
+        with self._lock:
+            while self._by_age and self._by_age[0][0] < before:
+                created_at, item_id = heapq.heappop(self._by_age)
+                entry = self.entries.get(item_id)
+                if entry is not None and entry[1] == created_at:
+                    self._remove(item_id)
+                    evicted += 1
+        return evicted
+
+    def search(self, value: int, max_distance: int, since: datetime | None = None):
+        """Return [(item_id, distance)] within `max_distance`, closest first."""
+        radius = max_distance // self.chunks
+        found = {}
+
+        with self._lock:
+            for i, substring in self._substrings(value):
+                table = self.tables[i]
+                for key in self._neighbours(substring, radius):
+                    for item_id in table.get(key, ()):
+                        if item_id in found:
+                            continue
+                        other, created_at = self.entries[item_id]
+                        distance = hamming(value, other)
+                        if distance <= max_distance and (since is None or created_at >= since):
+                            found[item_id] = distance
+
+        return sorted(found.items(), key=lambda item: (item[1], item[0]))
+
+    def load(self, db, since: datetime):
+        """Replace the contents with the hashed reports created since `since`."""
+        rows = (
+            db.query(Report.id, Report.image_phash, Report.created_at)
+            .filter(Report.image_phash.isnot(None), Report.created_at >= since)
+            .all()
+        )
+        with self._lock:
+            self.tables = [defaultdict(set) for _ in range(self.chunks)]
+            self.entries = {}
+            self._by_age = []
+            for row in rows:
+                self._add(row.id, int(row.image_phash, 16), row.created_at)
+            self.loaded_at = time.monotonic()
+
+    def stale(self, max_age: float) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= max_age
+
+
+duplicate_index = MultiIndexHash()
+
+
+def _same_place(report, other) -> bool:
+    if report.latitude is not None and other.latitude is not None:
+        return haversine_m(
+            report.latitude, report.longitude, other.latitude, other.longitude
+        ) <= RADIUS_M
+    # Without coordinates on both, only the same written location counts
+    return (
+        report.latitude is None and other.latitude is None
+        and " ".join(report.location.lower().split()) == " ".join(other.location.lower().split())
+    )
+
+
+def detect_duplicates(report_id: int, image_path: str):
+    """
+    Background task: hash the report's image, link it to the closest recent
+    report nearby with a near-identical photo (following that report's own
+    link, so a whole cluster points at the first report), and add it to the
+    index.
+
+    Index hits are re-read from the database before use, so reports deleted
+    or re-photographed by another process since the last reload are not
+    matched.
+    """
+    if Image is None:
+        return
+
+    try:
+        value = dhash(image_path)
+    except OSError:
+        return
+
+    db = SessionLocal()
+    try:
+        report = db.query(Report).filter(Report.id == report_id).first()
+        if report is None or report.image_path != image_path:
+            return
+
+        if duplicate_index.stale(REFRESH_SECONDS):
+            duplicate_index.load(db, since=datetime.utcnow() - WINDOW)
+        else:
+            duplicate_index.evict(before=datetime.utcnow() - WINDOW)
+
+        hits = [
+            item_id
+            for item_id, _ in duplicate_index.search(
+                value, MAX_DISTANCE, since=report.created_at - WINDOW
+            )
+            if item_id != report_id
+        ]
+        candidates = []
+        if hits:
+            candidates = db.query(
+                Report.id, Report.duplicate_of_id, Report.image_phash,
+                Report.latitude, Report.longitude, Report.location,
+            ).filter(Report.id.in_(hits), Report.image_phash.isnot(None)).all()
+
+        matches = []
+        for candidate in candidates:
+            distance = hamming(value, int(candidate.image_phash, 16))
+            if distance <= MAX_DISTANCE and _same_place(report, candidate):
+                matches.append((distance, candidate.id, candidate))
+        matches.sort()
+
+        duplicate_of_id = None
+        if matches:
+            match = matches[0][2]
+            duplicate_of_id = match.duplicate_of_id or match.id
+
+        report.image_phash = format(value, "016x")
+        report.duplicate_of_id = duplicate_of_id
+        db.commit()
+
+        duplicate_index.add(report_id, value, report.created_at)
+    finally:
+        db.close()
@@ -0,0 +1,42 @@
+"""
+Train the feature-model classifier from a folder of labelled photos:
+
+    python -m app.ai.train training_images/ models/classifier.joblib
+
+where each sub-folder of `training_images/` is a category name
+(flood/, road_damage/, streetlight/, other/ ...).
+"""
+import os
+import sys
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from app.ai.classifier import MODEL_PATH, image_features
+
+
+def train(data_dir: str, model_path: str = MODEL_PATH):
+    features, labels = [], []
+
+    for category in sorted(os.listdir(data_dir)):
+        folder = os.path.join(data_dir, category)
+        if not os.path.isdir(folder):
+            continue
+        for filename in os.listdir(folder):
+            try:
+                features.append(image_features(os.path.join(folder, filename)))
+                labels.append(category)
+            except OSError:
+                print(f"Skipping unreadable image {filename}")
+
+    model = LogisticRegression(max_iter=1000)
+    model.fit(np.stack(features), labels)
+
+    os.makedirs(os.path.dirname(model_path) or ".", exist_ok=True)
+    joblib.dump(model, model_path)
+    print(f"Trained on {len(labels)} images, saved to {model_path}")
+
+
+if __name__ == "__main__":
+    train(*sys.argv[1:3])
@@ -0,0 +1,33 @@
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.report import Report
+
+REACTION_COUNTERS = {
+    "like": "like_count",
+    "dislike": "dislike_count",
+}
+
+
+async def adjust_report_counters(db: AsyncSession, report_id: int, **deltas: int):
+    """
+    Atomically add `deltas` to the counter columns of one report, e.g.
+    adjust_report_counters(db, 1, like_count=-1, dislike_count=1).
+
+    Runs as an `UPDATE ... SET col = col + n` inside the caller's transaction,
+    so it commits (or rolls back) together with the reaction/comment row.
+    """
+    values = {
+        column: getattr(Report, column) + delta
+        for column, delta in deltas.items()
+        if delta
+    }
+    if not values:
+        return
+
+    await db.execute(
+        update(Report)
+        .where(Report.id == report_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
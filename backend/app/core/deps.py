@@ -1,32 +1,92 @@
+from dataclasses import dataclass
+import os
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-import os
-from app.database import SessionLocal
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from app.database import get_async_db
 from app.models.user import User
+from app.core.cache import TTLCache
+from app.core.jwt import SECRET_KEY, ALGORITHM
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
+# Also the bound on staleness for user changes this process does not see
+# (see _note_changed_user)
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+
+# When enabled, require_admin trusts the `role` claim in the token and never
+# touches the database. A demoted admin keeps access until the token expires.
+AUTH_TRUST_TOKEN_ROLE = os.getenv("AUTH_TRUST_TOKEN_ROLE", "false").lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by route handlers (no ORM session)."""
+    id: int
+    name: str | None
+    email: str | None
+    role: str
+
+
+principal_cache = TTLCache(max_size=AUTH_CACHE_MAX_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    principal_cache.pop(user_id)
+
+
+_CHANGED_USERS = "changed_user_ids"
+_ALL_USERS = "changed_all_users"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _note_changed_user(mapper, connection, target):
+    """
+    Role changes and deletions must not be served from the cache. They are
+    noted at flush and evicted once committed, so a request cannot re-cache
+    the old row between the two and a rolled-back change evicts nothing. Changes
+    made outside this process's ORM (raw SQL, other workers) are only
+    picked up when the entry expires, after AUTH_CACHE_TTL_SECONDS.
+    """
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_bulk_user_change(orm_execute_state):
+    # update(User) / delete(User) do not say which rows they hit
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and any(
+        mapper.class_ is User for mapper in orm_execute_state.all_mappers
+    ):
+        orm_execute_state.session.info[_ALL_USERS] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session):
+    if session.info.pop(_ALL_USERS, False):
+        principal_cache.clear()
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop(_ALL_USERS, None)
+    session.info.pop(_CHANGED_USERS, None)
+
+def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
     try:
-        payload = jwt.decode(
-            token,
-            os.getenv("SECRET_KEY"),
-            algorithms=[os.getenv("ALGORITHM")]
-        )
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
-        if user_id is None:
+        if user_id is None or not str(user_id).isdigit():
             raise HTTPException(status_code=401, detail="Invalid token")
     except JWTError:
         raise HTTPException(
@@ -34,13 +94,54 @@ def get_current_user(
             detail="Invalid or expired token"
         )
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    return payload
+
+def _cache_principal(user: User | None) -> Principal:
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
+    principal = Principal(
+        id=user.id, name=user.name, email=user.email, role=user.role
+    )
+    principal_cache.set(user.id, principal)
+    return principal
+
+async def load_principal_async(user_id: int, db: AsyncSession) -> Principal:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    return _cache_principal(result.scalar_one_or_none())
+
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    return await load_principal_async(int(payload["sub"]), db)
+
+async def get_optional_user(
+    token: str | None = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal | None:
+    """Like get_current_user, but anonymous callers get None instead of a 401."""
+    if token is None:
+        return None
+    payload = get_token_payload(token)
+    return await load_principal_async(int(payload["sub"]), db)
+
+async def require_admin(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    if AUTH_TRUST_TOKEN_ROLE:
+        current_user = Principal(
+            id=int(payload["sub"]), name=None, email=None,
+            role=payload.get("role") or "user",
+        )
+    else:
+        current_user = await load_principal_async(int(payload["sub"]), db)
 
-def require_admin(current_user = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -49,8 +150,8 @@ def require_admin(current_user = Depends(get_current_user)):
     return current_user
 
 def get_current_admin(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     Dependency to ensure the current user is an admin.
     """
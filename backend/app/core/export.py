@@ -0,0 +1,166 @@
+import csv
+import io
+import zlib
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models.report import Report
+from app.models.user import User
+from app.core.responses import dumps
+
+# Rows per server-side cursor batch, and bytes per response chunk
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+EXPORT_COLUMNS = (
+    Report.id,
+    Report.title,
+    Report.description,
+    Report.location,
+    Report.latitude,
+    Report.longitude,
+    Report.status,
+    Report.predicted_category,
+    Report.confidence_score,
+    Report.user_id,
+    User.name.label("reporter"),
+    Report.created_at,
+    Report.resolved_at,
+    Report.like_count,
+    Report.dislike_count,
+    Report.comment_count,
+    Report.image_path,
+)
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+
+def export_query(filters=()):
+    return (
+        select(*EXPORT_COLUMNS)
+        .join(User, Report.user_id == User.id)
+        .where(*filters)
+        .order_by(Report.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+# Cells starting with these are run as formulas by spreadsheet apps
+FORMULA_PREFIXES = frozenset("=+-@\t\r")
+
+
+def _csv_encoder(columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # Only free-text columns can carry a formula
+    text = [
+        index for index, column in enumerate(columns)
+        if column.type.python_type is str
+    ]
+
+    def spreadsheet_safe(row):
+        for index in text:
+            value = row[index]
+            if value and value[0] in FORMULA_PREFIXES:
+                row = list(row)
+                for index in text:
+                    value = row[index]
+                    if value and value[0] in FORMULA_PREFIXES:
+                        row[index] = "'" + value
+                return row
+        return row
+
+    def header() -> bytes:
+        writer.writerow([column.key for column in columns])
+        return _drain()
+
+    def encode(rows) -> bytes:
+        writer.writerows(map(spreadsheet_safe, rows))
+        return _drain()
+
+    def _drain() -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    return header, encode
+
+
+def _ndjson_encoder(columns):
+    fields = [column.key for column in columns]
+
+    def header() -> bytes:
+        return b""
+
+    def encode(rows) -> bytes:
+        return b"".join(dumps(dict(zip(fields, row))) + b"\n" for row in rows)
+
+    return header, encode
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows a gzip response: gzip (or
+    x-gzip, or else *) must be listed with a non-zero q-value.
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, *params = (item.strip() for item in part.split(";"))
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.lower()] = q
+
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+async def stream_export(query, format: str, compress: bool):
+    """
+    Yield the export in chunks of about EXPORT_CHUNK_BYTES. Rows come from a
+    server-side cursor EXPORT_BATCH_SIZE at a time and are encoded (and
+    gzipped) as they arrive, so memory stays flat however many rows match.
+    Uses its own session, which lives exactly as long as the stream.
+    """
+    columns = query.selected_columns
+    header, encode = (_csv_encoder if format == "csv" else _ndjson_encoder)(columns)
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    pending = [header()]
+    size = len(pending[0])
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            data = encode(rows)
+            pending.append(data)
+            size += len(data)
+            if size < EXPORT_CHUNK_BYTES:
+                continue
+
+            chunk = b"".join(pending)
+            pending, size = [], 0
+            if gzip is not None:
+                chunk = gzip.compress(chunk)
+            if chunk:
+                yield chunk
+
+    chunk = b"".join(pending)
+    if gzip is not None:
+        chunk = gzip.compress(chunk) + gzip.flush()
+    if chunk:
+        yield chunk
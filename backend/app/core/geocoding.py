@@ -0,0 +1,122 @@
+import csv
+import os
+import re
+
+from app.database import SessionLocal
+from app.models.report import Report
+from app.core.geohash import encode
+from app.core.response_cache import report_tag, response_cache
+
+GEOCODER_BACKEND = os.getenv("GEOCODER_BACKEND", "offline")
+# Optional CSV of name,lat,lon rows that extends the built-in place list
+GEOCODER_GAZETTEER = os.getenv("GEOCODER_GAZETTEER")
+
+# Built-in places for the offline geocoder (Klang Valley)
+PLACES = {
+    "ampang": (3.1500, 101.7600),
+    "bangsar": (3.1290, 101.6790),
+    "bukit bintang": (3.1466, 101.7107),
+    "cheras": (3.1060, 101.7250),
+    "cyberjaya": (2.9213, 101.6559),
+    "kajang": (2.9935, 101.7874),
+    "kepong": (3.2100, 101.6360),
+    "klang": (3.0449, 101.4456),
+    "klcc": (3.1579, 101.7116),
+    "kuala lumpur": (3.1390, 101.6869),
+    "mont kiara": (3.1707, 101.6505),
+    "petaling jaya": (3.1073, 101.6067),
+    "puchong": (3.0250, 101.6170),
+    "putrajaya": (2.9264, 101.6964),
+    "sentul": (3.1850, 101.6930),
+    "serdang": (3.0210, 101.7160),
+    "seri kembangan": (3.0220, 101.7050),
+    "setapak": (3.1960, 101.7180),
+    "shah alam": (3.0738, 101.5183),
+    "subang jaya": (3.0567, 101.5851),
+    "sunway": (3.0730, 101.6070),
+    "wangsa maju": (3.2050, 101.7320),
+}
+
+# The whole location must be the pair, or an address like "Lot 5, 7 Jalan
+# Ampang" would geocode to (5, 7)
+_COORDINATES = re.compile(r"\s*(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*")
+
+
+class Geocoder:
+    """Interface: free-text location -> (lat, lon), or None when unknown."""
+
+    def geocode(self, text: str) -> tuple[float, float] | None:
+        raise NotImplementedError
+
+
+class OfflineGeocoder(Geocoder):
+    """
+    Local stand-in with no network access: accepts a location that is just
+    "lat, lon", otherwise matches the longest known place name it contains.
+    """
+
+    def __init__(self, places: dict[str, tuple[float, float]] | None = None):
+        self.places = dict(PLACES if places is None else places)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "OfflineGeocoder":
+        places = dict(PLACES)
+        with open(path, newline="") as f:
+            for name, lat, lon in csv.reader(f):
+                places[name.strip().lower()] = (float(lat), float(lon))
+        return cls(places)
+
+    def geocode(self, text):
+        match = _COORDINATES.fullmatch(text)
+        if match:
+            lat, lon = float(match.group(1)), float(match.group(2))
+            if -90 <= lat <= 90 and -180 <= lon <= 180:
+                return lat, lon
+
+        normalised = " ".join(re.findall(r"\w+", text.lower()))
+        for name in sorted(self.places, key=len, reverse=True):
+            if re.search(rf"\b{re.escape(name)}\b", normalised):
+                return self.places[name]
+        return None
+
+
+def load_geocoder() -> Geocoder:
+    if GEOCODER_BACKEND != "offline":
+        raise RuntimeError(f"Unknown GEOCODER_BACKEND: {GEOCODER_BACKEND}")
+    if GEOCODER_GAZETTEER:
+        return OfflineGeocoder.from_csv(GEOCODER_GAZETTEER)
+    return OfflineGeocoder()
+
+
+geocoder = load_geocoder()
+
+
+def geocode_report(report_id: int, location: str):
+    """
+    Background task: fill in coordinates for a report created without them.
+    Skipped if the location text changed again in the meantime.
+    """
+    point = geocoder.geocode(location)
+    if point is None:
+        return
+
+    db = SessionLocal()
+    try:
+        (
+            db.query(Report)
+            .filter(Report.id == report_id, Report.location == location,
+                    Report.latitude.is_(None))
+            .update(
+                {
+                    Report.latitude: point[0],
+                    Report.longitude: point[1],
+                    Report.geohash: encode(*point),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    response_cache.invalidate_sync(report_tag(report_id))
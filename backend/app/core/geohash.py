@@ -0,0 +1,126 @@
+import math
+
+from sqlalchemy import and_, or_
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MAX_PRECISION = 12
+EARTH_RADIUS_M = 6_371_000
+
+# Sorts after every geohash character, so [prefix, prefix + PREFIX_END) is the
+# set of hashes starting with prefix; an index-friendly range instead of LIKE.
+PREFIX_END = "~"
+
+
+def encode(lat: float, lon: float, precision: int = MAX_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+        rng, coord = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """(lat, lon) size in degrees of a cell at `precision`."""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180 / 2 ** lat_bits, 360 / 2 ** lon_bits
+
+
+def covering_prefixes(
+    min_lat: float, min_lon: float, max_lat: float, max_lon: float, max_cells: int = 16
+) -> list[str]:
+    """
+    The longest geohash prefixes (all the same length) whose cells cover the
+    box, using at most `max_cells` of them.
+    """
+    precision = MAX_PRECISION
+    while precision > 1:
+        lat_step, lon_step = cell_size(precision)
+        rows = math.floor((max_lat + 90) / lat_step) - math.floor((min_lat + 90) / lat_step) + 1
+        cols = math.floor((max_lon + 180) / lon_step) - math.floor((min_lon + 180) / lon_step) + 1
+        if rows * cols <= max_cells:
+            break
+        precision -= 1
+
+    lat_step, lon_step = cell_size(precision)
+    prefixes = set()
+    lat = min_lat
+    while True:
+        lon = min_lon
+        while True:
+            prefixes.add(encode(min(lat, max_lat), min(lon, max_lon), precision))
+            if lon >= max_lon:
+                break
+            lon += lon_step
+        if lat >= max_lat:
+            break
+        lat += lat_step
+
+    return sorted(prefixes)
+
+
+def in_box(lat_col, lon_col, geohash_col, min_lat, min_lon, max_lat, max_lon):
+    """
+    WHERE clause for points inside the box: geohash prefix ranges narrow the
+    scan through the index, the coordinate comparison makes it exact.
+    """
+    prefixes = covering_prefixes(min_lat, min_lon, max_lat, max_lon)
+    return and_(
+        or_(*(
+            and_(geohash_col >= prefix, geohash_col < prefix + PREFIX_END)
+            for prefix in prefixes
+        )),
+        lat_col.between(min_lat, max_lat),
+        lon_col.between(min_lon, max_lon),
+    )
+
+
+def radius_bbox(lat: float, lon: float, radius_m: float) -> tuple[float, float, float, float]:
+    """(min_lat, min_lon, max_lat, max_lon) around a circle, clipped to valid ranges."""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+    return (
+        max(lat - dlat, -90.0),
+        max(lon - dlon, -180.0),
+        min(lat + dlat, 90.0),
+        min(lon + dlon, 180.0),
+    )
+
+
+def approx_distance_sq(lat_col, lon_col, lat: float, lon: float):
+    """
+    SQL expression for the squared distance in metres from (lat, lon), on a
+    flat projection around that point: plain arithmetic any database can
+    sort by, within about 1% of haversine_m over MAX_NEARBY_RADIUS_M.
+    """
+    metres_per_degree = math.radians(EARTH_RADIUS_M)
+    dy = (lat_col - lat) * metres_per_degree
+    dx = (lon_col - lon) * (metres_per_degree * math.cos(math.radians(lat)))
+    return dy * dy + dx * dx
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
@@ -0,0 +1,156 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+
+import anyio.to_thread
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from app.core.metrics import (
+    COLLECTORS,
+    DB_LATENCY,
+    DB_QUERIES,
+    DB_SLOW_QUERIES,
+    HTTP_IN_FLIGHT,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    PASSWORD_HASH_POOL,
+    THREADPOOL_BUSY,
+    THREADPOOL_SIZE,
+    THREADPOOL_WAITING,
+)
+from app.core.security import password_hasher
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Adds X-Query-Count and X-DB-Time to every response; meant for dev/staging
+DEBUG_QUERY_HEADERS = os.getenv("DEBUG_QUERY_HEADERS", "false").lower() in ("1", "true", "yes")
+
+logger = logging.getLogger("app.sql")
+
+# Route label for statements issued outside any request (startup, threads)
+BACKGROUND = "background"
+
+
+class RequestStats:
+    """SQL statements and database time of the current request."""
+
+    __slots__ = ("scope", "queries", "db_time")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.db_time = 0.0
+
+    @property
+    def route(self) -> str:
+        # Set by the router once matched; the template, not the raw path,
+        # so /reports/{report_id} is one label rather than one per report
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+
+    stats = _request_stats.get()
+    if stats is None:
+        route = BACKGROUND
+    else:
+        route = stats.route
+        stats.queries += 1
+        stats.db_time += elapsed
+
+    DB_QUERIES.inc(route)
+    DB_LATENCY.observe(route, value=elapsed)
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        DB_SLOW_QUERIES.inc(route)
+        logger.warning(
+            "slow query (%.1f ms) from %s: %s",
+            elapsed * 1000, route, " ".join(statement.split())[:1000],
+        )
+
+
+def _handle_error(context):
+    # The statement failed, so after_cursor_execute never runs for it
+    started = context.connection.info.get("query_started") if context.connection else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine):
+    """Count and time every statement; pass `async_engine.sync_engine` for async."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class InstrumentationMiddleware:
+    """
+    Per-request latency, status and in-flight metrics, labelled with the
+    matched route. Also scopes the SQL counters above to the request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status = 500
+        started = time.perf_counter()
+        finished = None
+
+        async def send_wrapper(message):
+            nonlocal status, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if DEBUG_QUERY_HEADERS:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-Query-Count"] = str(stats.queries)
+                    headers["X-DB-Time"] = f"{stats.db_time * 1000:.1f}ms"
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                # Background tasks run after this; they are not response time
+                finished = time.perf_counter()
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(method)
+            elapsed = (finished or time.perf_counter()) - started
+            route = stats.route
+            HTTP_REQUESTS.inc(method, route, str(status))
+            HTTP_LATENCY.observe(method, route, value=elapsed)
+            _request_stats.reset(token)
+
+
+def _collect_pools():
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+    except RuntimeError:  # no event loop running
+        pass
+    else:
+        THREADPOOL_SIZE.set(value=limiter.total_tokens)
+        THREADPOOL_BUSY.set(value=limiter.borrowed_tokens)
+        THREADPOOL_WAITING.set(value=limiter.statistics().tasks_waiting)
+
+    hasher = password_hasher.stats()
+    for state in ("workers", "running", "queued"):
+        PASSWORD_HASH_POOL.set(state, value=hasher[state])
+
+
+COLLECTORS.append(_collect_pools)
@@ -0,0 +1,320 @@
+import importlib
+import logging
+import os
+import random
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, event, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.metrics import JOB_DURATION, JOBS_PROCESSED
+from app.database import SessionLocal
+from app.models.job import Job
+
+# Worker threads started with the app; 0 when a separate
+# `python -m app.jobs run` process does the work
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Idle workers re-check this often; commits in this process wake them sooner
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+JOB_VISIBILITY_SECONDS = float(os.getenv("JOB_VISIBILITY_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "8"))
+JOB_BACKOFF_SECONDS = float(os.getenv("JOB_BACKOFF_SECONDS", "2"))
+JOB_MAX_BACKOFF_SECONDS = float(os.getenv("JOB_MAX_BACKOFF_SECONDS", "3600"))
+# Finished jobs are kept this long; dead ones until retried or purged by hand
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "24"))
+PURGE_INTERVAL_SECONDS = 600
+
+NOTIFY = "notify"
+RELEASE_UPLOAD = "release_upload"
+CLASSIFY = "classify"
+
+# kind -> "module:function", imported on first use so the modules that
+# enqueue a kind can also define its handler without an import cycle.
+# Handlers take (db, payload), must be safe to run more than once, and may
+# return a callable to run after their transaction has committed.
+HANDLERS = {
+    NOTIFY: "app.core.notifications:deliver_notification",
+    RELEASE_UPLOAD: "app.core.uploads:remove_unused_upload",
+    CLASSIFY: "app.ai.batching:classify_report",
+}
+
+logger = logging.getLogger("app.jobs")
+
+_ENQUEUED = "jobs_enqueued"
+_handlers = {}
+
+
+def enqueue(db, kind: str, payload: dict, delay: float = 0) -> Job:
+    """
+    Add a job to the caller's session (sync or async). It is written by the
+    caller's commit, atomically with the change that caused it, and is
+    dropped if that transaction rolls back.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    job = Job(
+        kind=kind,
+        payload=payload,
+        max_attempts=JOB_MAX_ATTEMPTS,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+    db.add(job)
+    db.info[_ENQUEUED] = True
+    return job
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session):
+    if session.info.pop(_ENQUEUED, False):
+        job_queue.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session):
+    session.info.pop(_ENQUEUED, None)
+
+
+def _handler(kind: str):
+    handler = _handlers.get(kind)
+    if handler is None:
+        module, name = HANDLERS[kind].split(":")
+        handler = _handlers[kind] = getattr(importlib.import_module(module), name)
+    return handler
+
+
+def _backoff(attempts: int) -> timedelta:
+    # Exponential with jitter, so jobs that failed together retry apart
+    delay = min(JOB_MAX_BACKOFF_SECONDS, JOB_BACKOFF_SECONDS * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def claim_job(db: Session, visibility: float = JOB_VISIBILITY_SECONDS):
+    """
+    Atomically take the next due job, or return None. The claim holds for
+    `visibility` seconds; after that the job is handed out again, so a
+    worker that died mid-job does not lose it.
+    """
+    now = datetime.utcnow()
+    claimable = or_(
+        and_(Job.status == "pending", Job.run_at <= now),
+        and_(Job.status == "running", Job.locked_until < now),
+    )
+    next_id = (
+        select(Job.id)
+        .where(claimable)
+        .order_by(Job.run_at, Job.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    # Re-checking `claimable` makes a concurrent claim of the same row a no-op
+    job = db.execute(
+        update(Job)
+        .where(Job.id == next_id, claimable)
+        .values(
+            status="running",
+            attempts=Job.attempts + 1,
+            locked_until=now + timedelta(seconds=visibility),
+            lock_token=uuid.uuid4().hex,
+        )
+        .returning(
+            Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts, Job.lock_token
+        )
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.commit()
+    return job
+
+
+def _settle(db: Session, job, **values) -> bool:
+    # Only while we still hold the claim: if it expired, another worker owns the job
+    result = db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.lock_token == job.lock_token)
+        .values(locked_until=None, lock_token=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def _fail(db: Session, job, error: str):
+    if job.attempts >= job.max_attempts:
+        outcome = "dead"
+        values = {"status": "dead", "finished_at": datetime.utcnow()}
+        logger.error("job %s (%s) failed %d times, dead-lettered: %s",
+                     job.id, job.kind, job.attempts, error.strip().splitlines()[-1])
+    else:
+        outcome = "retry"
+        values = {"status": "pending", "run_at": datetime.utcnow() + _backoff(job.attempts)}
+        logger.warning("job %s (%s) failed, attempt %d of %d: %s",
+                       job.id, job.kind, job.attempts, job.max_attempts,
+                       error.strip().splitlines()[-1])
+
+    _settle(db, job, last_error=error[-4000:], **values)
+    db.commit()
+    JOBS_PROCESSED.inc(job.kind, outcome)
+
+
+def run_job(db: Session, job):
+    """
+    Run a claimed job. The handler's writes commit in the same transaction
+    that marks the job done, so a retry never sees them half applied.
+    """
+    if job.attempts > job.max_attempts:
+        # Its last claim expired without the worker settling it
+        _fail(db, job, "visibility timeout expired on the final attempt")
+        return
+
+    started = time.perf_counter()
+    try:
+        after_commit = _handler(job.kind)(db, job.payload)
+        if not _settle(db, job, status="done", finished_at=datetime.utcnow(), last_error=None):
+            db.rollback()
+            return
+        db.commit()
+    except Exception:
+        db.rollback()
+        _fail(db, job, traceback.format_exc())
+        return
+    finally:
+        JOB_DURATION.observe(job.kind, value=time.perf_counter() - started)
+
+    JOBS_PROCESSED.inc(job.kind, "done")
+    if after_commit is not None:
+        try:
+            after_commit()
+        except Exception:
+            # Best effort (e.g. live push); the job itself is done
+            logger.exception("after-commit hook of job %s (%s) failed", job.id, job.kind)
+
+
+def run_next_job(session_factory=SessionLocal) -> bool:
+    """Claim and run one due job. Returns False when none was due."""
+    db = session_factory()
+    try:
+        job = claim_job(db)
+        if job is None:
+            return False
+        run_job(db, job)
+        return True
+    finally:
+        db.close()
+
+
+def purge_finished_jobs(db: Session, older_than_hours: float = JOB_RETENTION_HOURS) -> int:
+    cutoff = datetime.utcnow() - timedelta(hours=older_than_hours)
+    removed = db.execute(
+        delete(Job)
+        .where(Job.status == "done", Job.finished_at < cutoff)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return removed
+
+
+def job_counts(db: Session) -> list[tuple[str, str, int]]:
+    """(kind, status, jobs) for every kind and status present."""
+    return db.execute(
+        select(Job.kind, Job.status, func.count())
+        .group_by(Job.kind, Job.status)
+        .order_by(Job.kind, Job.status)
+    ).all()
+
+
+def retry_dead_jobs(db: Session, ids: list[int] | None = None) -> int:
+    """Give dead jobs (all, or the given ids) a fresh set of attempts."""
+    stmt = update(Job).where(Job.status == "dead")
+    if ids:
+        stmt = stmt.where(Job.id.in_(ids))
+    requeued = db.execute(
+        stmt.values(status="pending", attempts=0, run_at=datetime.utcnow(), finished_at=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return requeued
+
+
+class JobQueue:
+    """
+    Pool of worker threads draining the jobs table.
+
+    Each worker claims one due job at a time, runs it and loops; when
+    nothing is due it sleeps until `wake` (a commit that enqueued jobs in
+    this process) or `poll_interval`, which also picks up jobs enqueued by
+    other processes and retries whose backoff has elapsed.
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        poll_interval: float = JOB_POLL_SECONDS,
+        session_factory=SessionLocal,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.session_factory = session_factory
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._woken = False
+        self._stopping = False
+        self._last_purge = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._threads or self.workers <= 0:
+                return
+            self._stopping = False
+            self._threads = [
+                threading.Thread(target=self._run, name=f"jobs-{n}", daemon=True)
+                for n in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self):
+        """Let running jobs finish, then stop the workers."""
+        with self._lock:
+            with self._wakeup:
+                self._stopping = True
+                self._wakeup.notify_all()
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+
+    def wake(self):
+        with self._wakeup:
+            self._woken = True
+            self._wakeup.notify_all()
+
+    def _idle(self):
+        with self._wakeup:
+            if not self._woken and not self._stopping:
+                self._wakeup.wait(self.poll_interval)
+            self._woken = False
+
+        if time.monotonic() - self._last_purge >= PURGE_INTERVAL_SECONDS:
+            self._last_purge = time.monotonic()
+            db = self.session_factory()
+            try:
+                purge_finished_jobs(db)
+            finally:
+                db.close()
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                if run_next_job(self.session_factory):
+                    continue
+                self._idle()
+            except Exception:
+                # e.g. database briefly unavailable; never let a worker die
+                logger.exception("job worker error")
+                self._idle()
+
+
+job_queue = JobQueue()
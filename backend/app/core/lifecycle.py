@@ -0,0 +1,102 @@
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.report import Report, STATUS_TRANSITIONS
+from app.models.report_stats import ReportStateDuration
+from app.models.report_status_event import ReportStatusEvent
+from app.core.stats import (
+    UNCATEGORISED,
+    ReportFacts,
+    apply_stat_deltas,
+    sketch_bucket,
+    stat_deltas,
+)
+
+
+def record_created(db: AsyncSession, report: Report, actor_id: int | None):
+    """Log the initial status of a new (flushed) report."""
+    db.add(ReportStatusEvent(
+        report_id=report.id,
+        from_status=None,
+        to_status=report.status,
+        changed_by=actor_id,
+        created_at=report.created_at,
+    ))
+
+
+async def change_status(
+    db: AsyncSession, report: Report, status: str, actor_id: int | None
+) -> bool:
+    """
+    Move a report to `status` inside the caller's transaction: validates the
+    transition, appends the status event, maintains resolved_at and the
+    analytics, and adds the time spent in the old state to its sketch.
+    Returns False when the report already has that status.
+
+    The write is conditional on the status (and resolved_at) that was read,
+    so of two concurrent changes only one applies; the other gets a 409 and
+    adds nothing to the event log or the analytics. `report` is not updated;
+    refresh it after committing.
+    """
+    if status == report.status:
+        return False
+
+    if status not in STATUS_TRANSITIONS.get(report.status, ()):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Cannot change status from {report.status} to {status}",
+        )
+
+    now = datetime.utcnow()
+    old_status, old_resolved_at = report.status, report.resolved_at
+    resolved_at = now if status == "resolved" else None
+
+    row = (await db.execute(
+        update(Report)
+        .where(
+            Report.id == report.id,
+            Report.status == old_status,
+            Report.resolved_at.is_not_distinct_from(old_resolved_at),
+        )
+        .values(status=status, resolved_at=resolved_at)
+        # Not touched here, but may have changed since `report` was loaded
+        .returning(Report.created_at, Report.predicted_category)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if row is None:
+        raise HTTPException(
+            status_code=409,
+            detail="Report status was changed concurrently, reload and try again",
+        )
+
+    # When the report entered its current state; missing for reports that
+    # predate the event log, whose time in that state is then not counted
+    entered_at = await db.scalar(
+        select(ReportStatusEvent.created_at)
+        .where(ReportStatusEvent.report_id == report.id,
+               ReportStatusEvent.to_status == old_status)
+        .order_by(ReportStatusEvent.created_at.desc(), ReportStatusEvent.id.desc())
+        .limit(1)
+    )
+
+    db.add(ReportStatusEvent(
+        report_id=report.id,
+        from_status=old_status,
+        to_status=status,
+        changed_by=actor_id,
+        created_at=now,
+    ))
+
+    before = ReportFacts(row.created_at, old_status, row.predicted_category, old_resolved_at)
+    after = ReportFacts(row.created_at, status, row.predicted_category, resolved_at)
+    deltas = stat_deltas(before, after)
+    if entered_at is not None:
+        seconds = (now - entered_at).total_seconds()
+        key = (before.category or UNCATEGORISED, old_status, sketch_bucket(seconds))
+        deltas[(ReportStateDuration, key)] += 1
+    await apply_stat_deltas(db, deltas)
+
+    return True
@@ -0,0 +1,177 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import case, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.jobs import NOTIFY, enqueue
+from app.core.pubsub import hub
+from app.models.notification import Notification
+
+COALESCE_SECONDS = int(os.getenv("NOTIFICATION_COALESCE_SECONDS", "3600"))
+RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "30"))
+
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def user_channel(user_id: int) -> str:
+    return f"notifications:user:{user_id}"
+
+
+def serialize_notification(n: Notification) -> dict:
+    return {
+        "id": n.id,
+        "actor": n.actor_name,
+        "count": n.actor_count,
+        "type": n.type,
+        "report_id": n.report_id,
+        "is_read": n.is_read,
+        "created_at": n.created_at,
+    }
+
+
+def queue_notification(db, receiver_id: int, actor, type: str, report_id: int):
+    """
+    Enqueue a notification in the caller's transaction; a job worker
+    records and pushes it once that transaction has committed.
+    """
+    enqueue(db, NOTIFY, {
+        "receiver_id": receiver_id,
+        "actor_id": actor.id,
+        "actor_name": actor.name,
+        "type": type,
+        "report_id": report_id,
+        # coalescing window of the event, not of its (possibly retried) delivery
+        "at": time.time(),
+    })
+
+
+def deliver_notification(db: Session, payload: dict):
+    """Job handler for `queue_notification`."""
+    note_id = record_notification(
+        db,
+        payload["receiver_id"],
+        payload["actor_id"],
+        payload["actor_name"],
+        payload["type"],
+        payload["report_id"],
+        bucket=int(payload["at"]) // COALESCE_SECONDS,
+    )
+    return lambda: publish_notification(db, note_id)
+
+
+def record_notification(
+    db: Session,
+    receiver_id: int,
+    actor_id: int,
+    actor_name: str,
+    type: str,
+    report_id: int,
+    bucket: int | None = None,
+) -> int:
+    """
+    Upsert the receiver's notification for (report, type) in the current
+    coalescing window and return its id. Runs in the caller's transaction.
+
+    A repeat event bumps `actor_count`, names the latest actor, moves the row
+    to the top and marks it unread. The same actor twice in a row (e.g.
+    toggling like -> dislike -> like) is not counted again, which also makes
+    a retried delivery harmless.
+    """
+    values = {
+        "user_id": receiver_id,
+        "actor_name": actor_name,
+        "last_actor_id": actor_id,
+        "type": type,
+        "report_id": report_id,
+        "bucket": int(time.time()) // COALESCE_SECONDS if bucket is None else bucket,
+        "actor_count": 1,
+        "is_read": False,
+        "created_at": datetime.utcnow(),
+    }
+
+    dialect_insert = _UPSERT_INSERTS.get(db.bind.dialect.name)
+    if dialect_insert is None:
+        return _record_without_upsert(db, values)
+
+    stmt = dialect_insert(Notification).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "report_id", "type", "bucket"],
+        set_={
+            "actor_count": Notification.actor_count + case(
+                (Notification.last_actor_id == stmt.excluded.last_actor_id, 0),
+                else_=1,
+            ),
+            "actor_name": stmt.excluded.actor_name,
+            "last_actor_id": stmt.excluded.last_actor_id,
+            "created_at": stmt.excluded.created_at,
+            "is_read": False,
+        },
+    ).returning(Notification.id)
+
+    return db.execute(stmt).scalar_one()
+
+
+def _record_without_upsert(db: Session, values: dict) -> int:
+    existing = db.scalar(
+        select(Notification)
+        .where(
+            Notification.user_id == values["user_id"],
+            Notification.report_id == values["report_id"],
+            Notification.type == values["type"],
+            Notification.bucket == values["bucket"],
+        )
+        .with_for_update()
+    )
+    if existing is None:
+        result = db.execute(insert(Notification).values(**values))
+        return result.inserted_primary_key[0]
+
+    if existing.last_actor_id != values["last_actor_id"]:
+        existing.actor_count += 1
+    existing.actor_name = values["actor_name"]
+    existing.last_actor_id = values["last_actor_id"]
+    existing.created_at = values["created_at"]
+    existing.is_read = False
+    db.flush()
+    return existing.id
+
+
+def publish_notification(db: Session, notification_id: int):
+    """Push a committed notification to the receiver's open streams."""
+    n = db.get(Notification, notification_id, populate_existing=True)
+    if n is not None:
+        hub.publish(user_channel(n.user_id), jsonable_encoder(serialize_notification(n)))
+
+
+def compact_notifications(
+    db: Session, older_than_days: int = RETENTION_DAYS, batch_size: int = 1000
+) -> int:
+    """
+    Delete read notifications older than the retention window, in small
+    batches so the writer lock is never held for long. Returns rows removed.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    removed = 0
+
+    while True:
+        ids = [
+            row.id
+            for row in db.query(Notification.id)
+            .filter(Notification.is_read.is_(True), Notification.created_at < cutoff)
+            .limit(batch_size)
+        ]
+        if not ids:
+            return removed
+
+        db.query(Notification).filter(Notification.id.in_(ids)).delete(
+            synchronize_session=False
+        )
+        db.commit()
+        removed += len(ids)
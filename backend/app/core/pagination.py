@@ -0,0 +1,88 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(
+    created_col, id_col, cursor: str, descending: bool, inclusive: bool = False
+):
+    """
+    WHERE clause that continues a (created_at, id) ordered scan after the
+    cursor (or from it, when `inclusive`).
+    """
+    created_at, row_id = decode_cursor(cursor)
+
+    if descending:
+        id_cmp = id_col <= row_id if inclusive else id_col < row_id
+        return or_(
+            created_col < created_at,
+            and_(created_col == created_at, id_cmp),
+        )
+    id_cmp = id_col >= row_id if inclusive else id_col > row_id
+    return or_(
+        created_col > created_at,
+        and_(created_col == created_at, id_cmp),
+    )
+
+
+def encode_score_cursor(score: float, row_id: int) -> str:
+    raw = f"{score!r}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_score_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        score, row_id = raw.split("|", 1)
+        return float(score), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def score_filter(score_col, id_col, cursor: str):
+    """Continue a `score DESC, id DESC` ordered scan (ranked results) after the cursor."""
+    score, row_id = decode_score_cursor(cursor)
+    return or_(
+        score_col < score,
+        and_(score_col == score, id_col < row_id),
+    )
+
+
+def keyset_order(created_col, id_col, descending: bool):
+    if descending:
+        return (created_col.desc(), id_col.desc())
+    return (created_col.asc(), id_col.asc())
+
+
+def next_cursor(rows, limit: int, key, encode=encode_cursor):
+    """
+    Trim the look-ahead row and return (page, cursor for the following page).
+    `rows` must have been fetched with `limit + 1`; `key` maps a row to
+    its (created_at, id) pair, or (score, id) with encode_score_cursor.
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    return page, encode(*key(page[-1]))
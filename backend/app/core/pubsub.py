@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+import threading
+from contextlib import asynccontextmanager
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+except ImportError:  # only needed for PUBSUB_URL=redis://...
+    redis = None
+
+PUBSUB_URL = os.getenv("PUBSUB_URL", "memory://")
+SUBSCRIBER_BUFFER = 100
+
+
+class Subscription:
+    """
+    One listener's mailbox. `deliver` may be called from any thread (route
+    handlers run in the threadpool); messages are handed to the listener's
+    event loop. A slow listener drops messages rather than growing memory.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_BUFFER)
+
+    def deliver(self, message: dict):
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message: dict):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self, timeout: float) -> dict | None:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PubSubHub:
+    """Interface: fan messages published on a channel out to its subscribers."""
+
+    def publish(self, channel: str, message: dict):
+        raise NotImplementedError
+
+    def subscribe(self, channel: str):
+        """Async context manager yielding a Subscription."""
+        raise NotImplementedError
+
+
+class InProcessHub(PubSubHub):
+    """Default hub; only reaches subscribers connected to this worker."""
+
+    def __init__(self):
+        self._channels: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        subscription = Subscription()
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subscribers = self._channels.get(channel, set())
+                subscribers.discard(subscription)
+                if not subscribers:
+                    self._channels.pop(channel, None)
+
+
+class RedisHub(PubSubHub):
+    """
+    Broker-backed hub for multi-worker deployments. Works against Redis or any
+    Redis-protocol stand-in running locally.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        self._client.publish(channel, json.dumps(message, default=str))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        subscription = Subscription()
+        client = redis_asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(channel)
+
+        async def forward():
+            async for item in pubsub.listen():
+                if item["type"] == "message":
+                    subscription._put(json.loads(item["data"]))
+
+        task = asyncio.create_task(forward())
+        try:
+            yield subscription
+        finally:
+            task.cancel()
+            await pubsub.unsubscribe(channel)
+            await client.aclose()
+
+
+def create_hub(url: str = PUBSUB_URL) -> PubSubHub:
+    if url.startswith(("redis://", "rediss://")):
+        if redis is None:
+            raise RuntimeError("PUBSUB_URL=redis://... requires the redis package")
+        return RedisHub(url)
+    return InProcessHub()
+
+
+hub = create_hub()
@@ -0,0 +1,176 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.core.deps import get_current_user
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # only needed for RATE_LIMIT_URL=redis://...
+    redis_asyncio = None
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+RATE_LIMIT_URL = os.getenv("RATE_LIMIT_URL", "memory://")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Behind a reverse proxy the client address is the proxy's; trust the first
+# X-Forwarded-For hop instead (only enable when the proxy sets it)
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A token bucket: bursts of `capacity`, refilled evenly over `period` seconds."""
+    name: str
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+def _budget(name: str, default: str) -> RateLimit:
+    # e.g. RATE_LIMIT_REACTION=30/60 -> 30 requests per 60 seconds
+    capacity, _, period = os.getenv(f"RATE_LIMIT_{name.upper()}", default).partition("/")
+    return RateLimit(name, int(capacity), float(period))
+
+
+REACTION_LIMIT = _budget("reaction", "30/60")
+COMMENT_LIMIT = _budget("comment", "10/60")
+REPORT_LIMIT = _budget("report", "10/600")
+LOGIN_LIMIT = _budget("login", "10/60")
+REGISTER_LIMIT = _budget("register", "5/3600")
+
+
+class RateLimitStore:
+    """Holds the buckets; `take` must be atomic per key."""
+
+    async def take(self, key: str, limit: RateLimit) -> tuple[bool, float]:
+        """Take one token. Returns (allowed, tokens left afterwards)."""
+        raise NotImplementedError
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Default; per worker process, so each worker enforces its own budget."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key, limit):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated) * limit.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # Evicting the least recently used bucket only ever refills it
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# Refill and take in one step on the server, using the server's clock so
+# every worker agrees. Floats are returned as strings (Lua numbers would be
+# truncated to integers).
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Shared buckets for multi-worker deployments. Works against Redis or any
+    Redis-protocol stand-in running locally.
+    """
+
+    PREFIX = "rate-limit"
+
+    def __init__(self, url: str):
+        self._client = redis_asyncio.Redis.from_url(url)
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key, limit):
+        allowed, tokens = await self._take(
+            keys=[f"{self.PREFIX}:{key}"],
+            args=[limit.capacity, limit.rate],
+        )
+        return bool(allowed), float(tokens)
+
+
+def create_rate_limit_store(url: str = RATE_LIMIT_URL) -> RateLimitStore:
+    if url.startswith(("redis://", "rediss://")):
+        if redis_asyncio is None:
+            raise RuntimeError("RATE_LIMIT_URL=redis://... requires the redis package")
+        return RedisRateLimitStore(url)
+    return MemoryRateLimitStore()
+
+
+rate_limit_store = create_rate_limit_store()
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def _check(limit: RateLimit, key: str, response: Response):
+    if not RATE_LIMIT_ENABLED:
+        return
+
+    allowed, tokens = await rate_limit_store.take(f"{limit.name}:{key}", limit)
+    headers = {
+        "X-RateLimit-Limit": str(limit.capacity),
+        "X-RateLimit-Remaining": str(int(tokens)),
+        # Seconds until the bucket is full again
+        "X-RateLimit-Reset": str(math.ceil((limit.capacity - tokens) / limit.rate)),
+    }
+    if not allowed:
+        headers["Retry-After"] = str(max(1, math.ceil((1 - tokens) / limit.rate)))
+        raise HTTPException(status_code=429, detail="Too many requests", headers=headers)
+    response.headers.update(headers)
+
+
+def limit_per_user(limit: RateLimit):
+    """Route dependency: one bucket per authenticated user."""
+    async def dependency(response: Response, current_user=Depends(get_current_user)):
+        await _check(limit, f"user:{current_user.id}", response)
+    return dependency
+
+
+def limit_per_ip(limit: RateLimit):
+    """Route dependency for unauthenticated routes: one bucket per client IP."""
+    async def dependency(request: Request, response: Response):
+        await _check(limit, f"ip:{client_ip(request)}", response)
+    return dependency
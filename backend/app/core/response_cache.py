@@ -0,0 +1,176 @@
+import hashlib
+import os
+import threading
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from app.core.cache import TTLCache
+from app.core.responses import ORJSONResponse
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+except ImportError:  # only needed for RESPONSE_CACHE_URL=redis://...
+    redis = None
+
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "memory://")
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+
+FEED_TAG = "feed"
+
+
+def report_tag(report_id: int) -> str:
+    return f"report:{report_id}"
+
+
+def weak_etag(body: bytes) -> str:
+    return f'W/"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # Weak comparison: the W/ prefix is ignored on both sides
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+class ResponseCache:
+    """
+    Cache of serialized JSON responses for the public GET endpoints.
+
+    Entries are keyed by URL plus the current generation of each of their
+    tags; `invalidate(tag)` bumps the generation, so every entry built from
+    older data is simply never looked up again (and ages out). A response
+    computed while a write was committing is stored under the old
+    generation, which makes invalidation race-free without locks.
+    """
+
+    async def generations(self, tags: list[str]) -> list[int]:
+        raise NotImplementedError
+
+    async def get(self, key: str) -> tuple[str, bytes] | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, etag: str, body: bytes):
+        raise NotImplementedError
+
+    async def invalidate(self, *tags: str):
+        """For async routes; never blocks the event loop."""
+        raise NotImplementedError
+
+    def invalidate_sync(self, *tags: str):
+        """invalidate for background threads (sync tasks, job handlers)."""
+        raise NotImplementedError
+
+    async def respond(self, request: Request, tags: list[str], build) -> Response:
+        """
+        Serve `build()` (an async callable returning the payload) through the
+        cache, with a weak ETag and If-None-Match -> 304 handling.
+        """
+        query = urlencode(sorted(request.query_params.multi_items()))
+        generations = await self.generations(tags)
+        key = f"{request.url.path}?{query}|{','.join(map(str, generations))}"
+
+        entry = await self.get(key)
+        if entry is None:
+            payload = await build()
+            body = ORJSONResponse(content=payload).body
+            entry = (weak_etag(body), body)
+            await self.set(key, *entry)
+
+        etag, body = entry
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+class MemoryResponseCache(ResponseCache):
+    """Default; per worker process, so only use it with a single worker."""
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL):
+        self._entries = TTLCache(max_size=max_size, ttl=ttl)
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def generations(self, tags):
+        with self._lock:
+            return [self._generations.get(tag, 0) for tag in tags]
+
+    async def get(self, key):
+        return self._entries.get(key)
+
+    async def set(self, key, etag, body):
+        self._entries.set(key, (etag, body))
+
+    async def invalidate(self, *tags):
+        self.invalidate_sync(*tags)
+
+    def invalidate_sync(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def clear(self):
+        self._entries.clear()
+
+
+class RedisResponseCache(ResponseCache):
+    """
+    Shared cache for multi-worker deployments. Works against Redis or any
+    Redis-protocol stand-in running locally.
+    """
+
+    PREFIX = "response-cache"
+
+    def __init__(self, url: str, ttl: float = RESPONSE_CACHE_TTL):
+        self.ttl = max(1, int(ttl))
+        self._client = redis_asyncio.Redis.from_url(url)
+        # For invalidate_sync from background threads, off the event loop
+        self._sync_client = redis.Redis.from_url(url)
+
+    def _generation_key(self, tag: str) -> str:
+        return f"{self.PREFIX}:gen:{tag}"
+
+    async def generations(self, tags):
+        values = await self._client.mget([self._generation_key(tag) for tag in tags])
+        return [int(value or 0) for value in values]
+
+    async def get(self, key):
+        value = await self._client.get(f"{self.PREFIX}:entry:{key}")
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return etag.decode(), body
+
+    async def set(self, key, etag, body):
+        await self._client.set(
+            f"{self.PREFIX}:entry:{key}", etag.encode() + b"\n" + body, ex=self.ttl
+        )
+
+    async def invalidate(self, *tags):
+        async with self._client.pipeline() as pipe:
+            for tag in tags:
+                pipe.incr(self._generation_key(tag))
+            await pipe.execute()
+
+    def invalidate_sync(self, *tags):
+        pipe = self._sync_client.pipeline()
+        for tag in tags:
+            pipe.incr(self._generation_key(tag))
+        pipe.execute()
+
+
+def create_response_cache(url: str = RESPONSE_CACHE_URL) -> ResponseCache:
+    if url.startswith(("redis://", "rediss://")):
+        if redis is None:
+            raise RuntimeError("RESPONSE_CACHE_URL=redis://... requires the redis package")
+        return RedisResponseCache(url)
+    return MemoryResponseCache()
+
+
+response_cache = create_response_cache()
@@ -0,0 +1,41 @@
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the standard JSON path
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is None:
+        return json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+        ).encode()
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson, which handles datetimes, dicts and row
+    values natively. Returning it directly from a route also skips FastAPI's
+    jsonable_encoder pass, which is most of the cost on large lists.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def row_dicts(rows) -> list[dict]:
+    """
+    Column-only result rows -> dicts for ORJSONResponse. Zipping with the
+    field names once is several times cheaper than Row._asdict() per row.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    fields = rows[0]._fields
+    return [dict(zip(fields, row)) for row in rows]
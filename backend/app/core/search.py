@@ -0,0 +1,69 @@
+import re
+
+from sqlalchemy import func, literal, literal_column, or_, select, table, column
+
+from app.models.report import Report
+
+# SQLite: FTS5 external-content table over reports, kept in sync by triggers.
+# Postgres: generated tsvector column with a GIN index. Both are created by
+# migration 11 (app/migrations.py).
+reports_fts = table("reports_fts", column("rowid"))
+
+# bm25 column weights: title, description, location
+FTS_WEIGHTS = (10.0, 1.0, 5.0)
+
+
+def fts_query(text: str) -> str | None:
+    """
+    Turn free text into a safe FTS5 query: every word must match, the last
+    one as a prefix (search-as-you-type). Operators in the input are ignored.
+    """
+    terms = re.findall(r"\w+", text.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+def search_matches(dialect_name: str, text: str):
+    """
+    Subquery of (id, score) for the reports matching `text`, higher score =
+    better match, or None when there is nothing to search for.
+    """
+    if dialect_name == "sqlite":
+        query = fts_query(text)
+        if query is None:
+            return None
+        fts = literal_column("reports_fts")
+        return (
+            select(
+                reports_fts.c.rowid.label("id"),
+                (-func.bm25(fts, *FTS_WEIGHTS)).label("score"),
+            )
+            .select_from(reports_fts)
+            .where(fts.op("MATCH")(query))
+            .subquery()
+        )
+
+    if not text.strip():
+        return None
+
+    if dialect_name == "postgresql":
+        vector = literal_column("reports.search_vector")
+        tsquery = func.websearch_to_tsquery("english", text)
+        return (
+            select(Report.id.label("id"), func.ts_rank_cd(vector, tsquery).label("score"))
+            .where(vector.op("@@")(tsquery))
+            .subquery()
+        )
+
+    # No full-text index on other databases: unranked substring match
+    pattern = f"%{text.strip()}%"
+    return (
+        select(Report.id.label("id"), literal(0.0).label("score"))
+        .where(or_(
+            Report.title.ilike(pattern),
+            Report.description.ilike(pattern),
+            Report.location.ilike(pattern),
+        ))
+        .subquery()
+    )
@@ -1,9 +1,111 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# First scheme hashes new passwords; the rest are only verified (and then
+# upgraded on login). e.g. PASSWORD_SCHEMES=argon2,bcrypt needs argon2-cffi.
+PASSWORD_SCHEMES = os.getenv("PASSWORD_SCHEMES", "bcrypt").split(",")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))
+
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+pwd_context = CryptContext(
+    schemes=PASSWORD_SCHEMES,
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    argon2__type="ID",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
+
+
+class PasswordHasher:
+    """
+    Runs hashing/verification on its own bounded pool so a login burst can
+    only occupy `workers` threads, never FastAPI's shared threadpool.
+    Beyond `max_pending` queued jobs new requests are rejected with 503.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, max_pending: int = HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+        self._completed = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def _call(self, fn, *args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _release(self, future):
+        # Runs exactly once per job: when it finishes, or when it is cancelled
+        # while still queued (the awaiting request went away) and never runs
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self._completed += 1
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many authentication requests, try again shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(self._call, fn, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        # Cancelling the await also cancels the job if it has not started yet
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self.run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """
+        Verify a password; the second value is a fresh hash when the stored
+        one uses a deprecated scheme or an outdated cost factor.
+        """
+        return await self.run(pwd_context.verify_and_update, password, hashed)
+
+
+password_hasher = PasswordHasher()
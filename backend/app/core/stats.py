@@ -0,0 +1,238 @@
+import math
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.report import Report
+from app.models.report_stats import (
+    ReportDailyStat,
+    ReportResolutionStat,
+    ReportStateDuration,
+)
+
+UNCATEGORISED = "uncategorised"
+
+# Resolution-time histogram: BUCKETS_PER_DOUBLING buckets per power of two
+# seconds, i.e. each bucket is ~19% wide
+BUCKETS_PER_DOUBLING = 4
+
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+_KEYS = {
+    ReportDailyStat: ("day", "status", "category"),
+    ReportResolutionStat: ("day", "category", "bucket"),
+    ReportStateDuration: ("category", "state", "bucket"),
+}
+
+# Derived from the reports table alone, so they can be rebuilt from it
+REPORT_AGGREGATES = (ReportDailyStat, ReportResolutionStat)
+
+
+@dataclass(frozen=True)
+class ReportFacts:
+    """The fields of a report that the aggregates depend on."""
+    created_at: datetime
+    status: str
+    category: str | None
+    resolved_at: datetime | None
+
+
+def report_facts(report) -> ReportFacts:
+    """Snapshot a Report (or a row with the same attributes)."""
+    return ReportFacts(
+        created_at=report.created_at,
+        status=report.status,
+        category=report.predicted_category,
+        resolved_at=report.resolved_at,
+    )
+
+
+def resolution_bucket(seconds: float) -> int:
+    return int(math.floor(BUCKETS_PER_DOUBLING * math.log2(max(seconds, 1))))
+
+
+def bucket_seconds(bucket: int) -> float:
+    """Geometric midpoint of a histogram bucket."""
+    return 2 ** ((bucket + 0.5) / BUCKETS_PER_DOUBLING)
+
+
+def stat_deltas(before: ReportFacts | None, after: ReportFacts | None) -> Counter:
+    """
+    Changes to the aggregate rows when one report goes from `before` to
+    `after` (None = does not exist). Keys are (model, key tuple).
+    Reports without a created_at (rows older than its default) have no
+    day to count under and are left out.
+    """
+    deltas = Counter()
+    for facts, sign in ((before, -1), (after, 1)):
+        if facts is None or facts.created_at is None:
+            continue
+
+        category = facts.category or UNCATEGORISED
+        deltas[(ReportDailyStat, (facts.created_at.date(), facts.status, category))] += sign
+
+        if facts.resolved_at is not None:
+            seconds = (facts.resolved_at - facts.created_at).total_seconds()
+            key = (facts.resolved_at.date(), category, resolution_bucket(seconds))
+            deltas[(ReportResolutionStat, key)] += sign
+
+    return Counter({key: delta for key, delta in deltas.items() if delta})
+
+
+def _upsert(dialect_name: str, model, key: tuple, delta: int):
+    dialect_insert = _UPSERT_INSERTS[dialect_name]
+    values = dict(zip(_KEYS[model], key), count=delta)
+    stmt = dialect_insert(model).values(**values)
+    return stmt.on_conflict_do_update(
+        index_elements=list(_KEYS[model]),
+        set_={"count": model.count + stmt.excluded.count},
+    )
+
+
+def _increment(model, key: tuple, delta: int):
+    return (
+        update(model)
+        .where(*(getattr(model, name) == value for name, value in zip(_KEYS[model], key)))
+        .values(count=model.count + delta)
+    )
+
+
+def _insert(model, key: tuple, delta: int):
+    return insert(model).values(**dict(zip(_KEYS[model], key)), count=delta)
+
+
+async def apply_stat_deltas(db: AsyncSession, deltas: Counter):
+    """
+    Add {(model, key): delta} to the aggregate rows inside the caller's
+    transaction, so they commit (or roll back) together with the change.
+    """
+    dialect_name = db.bind.dialect.name
+    for (model, key), delta in deltas.items():
+        if dialect_name in _UPSERT_INSERTS:
+            await db.execute(_upsert(dialect_name, model, key, delta))
+        elif (await db.execute(_increment(model, key, delta))).rowcount == 0:
+            await db.execute(_insert(model, key, delta))
+
+
+def apply_stat_deltas_sync(db: Session, deltas: Counter):
+    """apply_stat_deltas for sync sessions (background threads, CLI)."""
+    dialect_name = db.bind.dialect.name
+    for (model, key), delta in deltas.items():
+        if dialect_name in _UPSERT_INSERTS:
+            db.execute(_upsert(dialect_name, model, key, delta))
+        elif db.execute(_increment(model, key, delta)).rowcount == 0:
+            db.execute(_insert(model, key, delta))
+
+
+async def apply_report_stats(
+    db: AsyncSession, before: ReportFacts | None, after: ReportFacts | None
+):
+    """Apply one report's change to the aggregates."""
+    await apply_stat_deltas(db, stat_deltas(before, after))
+
+
+def apply_report_stats_sync(
+    db: Session, before: ReportFacts | None, after: ReportFacts | None
+):
+    apply_stat_deltas_sync(db, stat_deltas(before, after))
+
+
+def expected_stats(bind) -> Counter:
+    """Aggregates recomputed from the reports table (`bind`: Session or Connection)."""
+    totals = Counter()
+    rows = bind.execute(
+        select(
+            Report.created_at,
+            Report.status,
+            Report.predicted_category,
+            Report.resolved_at,
+        ).execution_options(yield_per=1000)
+    )
+    for row in rows:
+        totals.update(stat_deltas(None, report_facts(row)))
+    return totals
+
+
+def materialized_stats(bind) -> Counter:
+    totals = Counter()
+    for model in REPORT_AGGREGATES:
+        keys = _KEYS[model]
+        columns = [getattr(model, name) for name in keys]
+        for *key, count in bind.execute(select(*columns, model.count)):
+            if count:
+                totals[(model, tuple(key))] = count
+    return totals
+
+
+def rebuild_report_stats(bind) -> int:
+    """Replace the aggregates with a fresh computation; returns rows written."""
+    totals = expected_stats(bind)
+    for model in REPORT_AGGREGATES:
+        bind.execute(delete(model))
+    for (model, key), count in totals.items():
+        bind.execute(_insert(model, key, count))
+    return len(totals)
+
+
+def check_report_stats(bind) -> list[tuple]:
+    """
+    Compare the aggregates with the raw table. Returns
+    (table, key, materialized, expected) for every row that differs.
+    """
+    expected = expected_stats(bind)
+    actual = materialized_stats(bind)
+    return [
+        (model.__tablename__, key, actual.get((model, key), 0), expected.get((model, key), 0))
+        for model, key in sorted(set(expected) | set(actual), key=repr)
+        if actual.get((model, key), 0) != expected.get((model, key), 0)
+    ]
+
+
+def median_seconds(histogram: Counter) -> float | None:
+    """Median of a {bucket: count} resolution histogram."""
+    total = sum(histogram.values())
+    if not total:
+        return None
+
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen * 2 >= total:
+            return bucket_seconds(bucket)
+
+
+# Quantile sketch for time-in-state (DDSketch-style): durations are counted in
+# log-spaced buckets, so any quantile comes back within SKETCH_ACCURACY
+# relative error from a few hundred counters, and sketches merge by adding.
+SKETCH_ACCURACY = 0.01
+_GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+
+
+def sketch_bucket(seconds: float) -> int:
+    return math.ceil(math.log(max(seconds, 1), _GAMMA))
+
+
+def sketch_value(bucket: int) -> float:
+    return 2 * _GAMMA ** bucket / (_GAMMA + 1)
+
+
+def sketch_quantile(sketch: Counter, q: float) -> float | None:
+    """Value at quantile `q` (0..1) of a {bucket: count} sketch."""
+    total = sum(sketch.values())
+    if not total:
+        return None
+
+    rank = q * (total - 1)
+    seen = 0
+    for bucket in sorted(sketch):
+        seen += sketch[bucket]
+        if seen > rank:
+            return sketch_value(bucket)
@@ -0,0 +1,84 @@
+import os
+
+from app.database import SessionLocal
+from app.models.report import Report
+from app.core.response_cache import FEED_TAG, report_tag, response_cache
+
+try:
+    from PIL import Image, ImageOps
+    # What decoding a corrupt, truncated or absurdly large upload raises
+    UNREADABLE_IMAGE = (OSError, ValueError, Image.DecompressionBombError)
+except ImportError:  # Pillow is optional; without it the feed uses originals
+    Image = None
+
+# name -> longest edge in pixels
+DERIVATIVE_SIZES = {
+    "thumb": 320,
+    "medium": 1024,
+}
+WEBP_QUALITY = 80
+
+
+def derivative_path(image_path: str, name: str) -> str:
+    return f"{os.path.splitext(image_path)[0]}.{name}.webp"
+
+
+def render_derivatives(image_path: str) -> dict[str, str]:
+    """Write the WebP derivatives next to the original; returns name -> path."""
+    paths = {}
+
+    with Image.open(image_path) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ("RGB", "RGBA"):
+            original = original.convert("RGB")
+
+        for name, edge in DERIVATIVE_SIZES.items():
+            path = derivative_path(image_path, name)
+            # Content-addressed originals mean an existing derivative is current
+            if not os.path.exists(path):
+                copy = original.copy()
+                copy.thumbnail((edge, edge))
+                tmp_path = f"{path}.part"
+                try:
+                    copy.save(tmp_path, "WEBP", quality=WEBP_QUALITY)
+                    os.replace(tmp_path, path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+            paths[name] = path
+
+    return paths
+
+
+def generate_derivatives(report_id: int, image_path: str):
+    """
+    Background task: build the WebP thumbnail/medium images for a report and
+    record their paths. Runs after the upload response has been sent.
+    """
+    if Image is None or not os.path.exists(image_path):
+        return
+
+    try:
+        paths = render_derivatives(image_path)
+    except UNREADABLE_IMAGE:
+        # Not a decodable image; the feed falls back to the original
+        return
+
+    db = SessionLocal()
+    try:
+        (
+            db.query(Report)
+            .filter(Report.id == report_id, Report.image_path == image_path)
+            .update(
+                {
+                    Report.thumb_path: paths["thumb"],
+                    Report.medium_path: paths["medium"],
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    response_cache.invalidate_sync(FEED_TAG, report_tag(report_id))
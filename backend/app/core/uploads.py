@@ -0,0 +1,169 @@
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+
+import anyio
+from fastapi import Depends, File, HTTPException, UploadFile
+from sqlalchemy import select, text, update
+from sqlalchemy.orm import Session
+
+from app.database import AsyncSessionLocal
+from app.models.report import Report
+from app.core.deps import get_current_user
+from app.core.jobs import RELEASE_UPLOAD, enqueue
+from app.core.thumbnails import DERIVATIVE_SIZES, derivative_path
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+# Uploads in progress and each request's extra link to its stored file (see
+# store_upload). Outside UPLOAD_DIR, which is served publicly, but it must be
+# on the same filesystem: files are hard-linked and renamed between the two.
+UPLOAD_STAGING_DIR = os.getenv("UPLOAD_STAGING_DIR", f"{UPLOAD_DIR}.staging")
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+CHUNK_SIZE = 256 * 1024
+
+
+def _extension(filename: str | None) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    if 1 < len(ext) <= 6 and ext[1:].isalnum():
+        return ext
+    return ""
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    filename: str | None
+    # This request's own link to the stored bytes, see store_upload
+    held_path: str
+
+
+async def store_upload(upload: UploadFile) -> StoredUpload:
+    """
+    Stream an upload to disk in chunks and store it under its content-addressed
+    path (`uploads/<sha256><ext>`). Identical files share one path on disk.
+
+    The temporary file stays as a second link to the bytes until the request
+    finishes (`finish_upload`): a concurrent release of the same content may
+    delete the shared path before this request's report references it.
+    """
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    os.makedirs(UPLOAD_STAGING_DIR, exist_ok=True)
+    tmp_path = os.path.join(UPLOAD_STAGING_DIR, f"{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        async with await anyio.open_file(tmp_path, "wb") as out:
+            while chunk := await upload.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Image exceeds {MAX_UPLOAD_BYTES} bytes",
+                    )
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    image_path = f"{UPLOAD_DIR}/{digest.hexdigest()}{_extension(upload.filename)}"
+
+    try:
+        os.link(tmp_path, image_path)
+    except FileExistsError:
+        pass  # Same bytes already stored for another report
+
+    return StoredUpload(path=image_path, filename=upload.filename, held_path=tmp_path)
+
+
+def finish_upload(upload: StoredUpload, referenced: bool):
+    """
+    Drop the request's own link. If the request committed a report that
+    references the image but the shared path was released meanwhile, put
+    the bytes back first.
+    """
+    if referenced and not os.path.exists(upload.path):
+        os.replace(upload.held_path, upload.path)
+    elif os.path.exists(upload.held_path):
+        os.remove(upload.held_path)
+
+
+async def stored_image(
+    image: UploadFile | None = File(None),
+    current_user = Depends(get_current_user),
+):
+    """
+    Dependency: streams the optional `image` form field to its stored path
+    before the route runs, without blocking the event loop.
+
+    Runs after authentication, so anonymous requests never write to disk.
+    Use with `Depends(stored_image, scope="function")`: if the route fails
+    (including form validation), the stored file is released again.
+    """
+    if image is None or not image.filename:
+        yield None
+        return
+
+    upload = await store_upload(image)
+    try:
+        yield upload
+    except BaseException:
+        finish_upload(upload, referenced=False)
+        # The content may be new and now unreferenced; its own transaction,
+        # since the request's session is mid-failure
+        async with AsyncSessionLocal() as db:
+            release_upload(db, upload.path)
+            await db.commit()
+        raise
+    else:
+        finish_upload(upload, referenced=True)
+
+
+def release_upload(db, image_path: str | None):
+    """
+    Enqueue deletion of an image in the caller's transaction, for when that
+    transaction drops a reference to it. The job removes the file only if no
+    report references it any more by the time it runs.
+    """
+    if image_path:
+        enqueue(db, RELEASE_UPLOAD, {"image_path": image_path})
+
+
+def remove_unused_upload(db: Session, payload: dict):
+    """
+    Job handler for `release_upload`. Checks for references and deletes the
+    files while holding off every write to reports; the job's commit
+    releases it, so no report can start referencing the image in between.
+    """
+    image_path = payload["image_path"]
+    if _lock_references(db, image_path):
+        return
+
+    paths = [image_path] + [
+        derivative_path(image_path, name) for name in DERIVATIVE_SIZES
+    ]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _lock_references(db: Session, image_path: str) -> bool:
+    """Block writes to reports until commit; returns whether `image_path` is used."""
+    if db.bind.dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE reports IN SHARE ROW EXCLUSIVE MODE"))
+        return db.scalar(
+            select(Report.id).where(Report.image_path == image_path).limit(1)
+        ) is not None
+
+    # SQLite has a single writer: any write statement takes the database lock
+    # for the rest of the transaction, even one that changes nothing
+    result = db.execute(
+        update(Report)
+        .where(Report.image_path == image_path)
+        .values(image_path=Report.image_path)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
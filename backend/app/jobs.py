@@ -0,0 +1,91 @@
+"""
+Background job queue (app.core.jobs) operations.
+
+    python -m app.jobs run [workers]   # worker process
+    python -m app.jobs status          # jobs per kind and status
+    python -m app.jobs dead            # dead-lettered jobs and their last error
+    python -m app.jobs retry [id ...]  # requeue dead jobs (all if no ids)
+
+The API starts JOB_WORKERS worker threads itself. To run them in their own
+process instead, start the API with JOB_WORKERS=0 and run `run` here; live
+notification pushes then need a shared PUBSUB_URL.
+"""
+import signal
+import sys
+import threading
+
+from app.ai.batching import classification_queue
+from app.database import SessionLocal
+from app.migrations import run_migrations
+from app.models.job import Job
+from app.core.jobs import JOB_WORKERS, JobQueue, job_counts, retry_dead_jobs
+
+
+def run(workers: int = JOB_WORKERS):
+    run_migrations()
+    queue = JobQueue(workers=max(workers, 1))
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+
+    # Classify jobs run here, so load the model before taking any
+    classification_queue.start()
+    queue.start()
+    print(f"Running {queue.workers} job workers; Ctrl+C to stop")
+    try:
+        while not stopping.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        queue.stop()
+        classification_queue.stop()
+
+
+def status():
+    db = SessionLocal()
+    try:
+        counts = job_counts(db)
+    finally:
+        db.close()
+
+    for kind, state, jobs in counts:
+        print(f"{kind:<20}{state:<10}{jobs:>8}")
+    if not counts:
+        print("No jobs")
+
+
+def dead():
+    db = SessionLocal()
+    try:
+        jobs = db.query(Job).filter(Job.status == "dead").order_by(Job.id).all()
+    finally:
+        db.close()
+
+    for job in jobs:
+        error = (job.last_error or "").strip().splitlines()
+        print(f"{job.id:>8}  {job.kind:<20}{job.attempts:>3} attempts  {error[-1] if error else ''}")
+    print(f"{len(jobs)} dead jobs")
+
+
+def retry(ids: list[int]):
+    db = SessionLocal()
+    try:
+        requeued = retry_dead_jobs(db, ids)
+    finally:
+        db.close()
+
+    print(f"Requeued {requeued} dead jobs")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    if command == "run":
+        run(int(sys.argv[2]) if len(sys.argv) > 2 else JOB_WORKERS)
+    elif command == "status":
+        status()
+    elif command == "dead":
+        dead()
+    elif command == "retry":
+        retry([int(arg) for arg in sys.argv[2:]])
+    else:
+        sys.exit(__doc__)
@@ -1,16 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.database import Base, engine
+from app.migrations import run_migrations
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from app.models import user, report as report_model
 from app.routes import auth, report as report_routes
 from app.routes import analytics, user
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import comment, reaction, notifications
+from app.ai.batching import classification_queue
+from app.core.jobs import job_queue
+from app.core.security import password_hasher
+from app.core.responses import ORJSONResponse
+from app.core.metrics import render as render_metrics
+from app.core.instrumentation import InstrumentationMiddleware, instrument_engine
+from app.database import async_engine, engine
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Side-effect workers (JOB_WORKERS=0 when `python -m app.jobs run` does it);
+    # they classify uploads, so load the classifier model before they start
+    if job_queue.workers:
+        classification_queue.start()
+    job_queue.start()
+    yield
+    job_queue.stop()
+    classification_queue.stop()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,9 +41,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Query-Count", "X-DB-Time"],
 )
+# Outermost, so its latency covers CORS and error handling too
+app.add_middleware(InstrumentationMiddleware)
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 
-Base.metadata.create_all(bind=engine)
+run_migrations()
 
 app.include_router(auth.router)
 app.include_router(report_routes.router)
@@ -37,4 +63,15 @@ app.include_router(notifications.router)
 
 @app.get("/health")
 def health():
-    return {"status": "Backend is running safely"}
+    return {
+        "status": "Backend is running safely",
+        "password_hashing": password_hasher.stats(),
+    }
+
+
+# Prometheus scrape target
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,284 @@
+"""
+Versioned schema migrations.
+
+Each migration runs once per database, in order, and the applied version is
+recorded in the `schema_version` table. Steps are written to be idempotent so
+databases that were created by the old `create_all` call upgrade cleanly.
+
+Run manually with `python -m app.migrations`; the app also runs them on startup.
+"""
+import re
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.database import Base, engine
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.stats import rebuild_report_stats
+from app.core.geocoding import geocoder
+from app.core.geohash import encode as geohash_encode
+
+
+def _create_indexes(conn: Connection, table_name: str, *index_names: str):
+    """
+    Create the named indexes of a model table. A migration names only the
+    indexes it introduces: the model has the indexes of every later version
+    too, whose columns may not exist yet at this step.
+    """
+    indexes = {index.name: index for index in Base.metadata.tables[table_name].indexes}
+    for name in index_names:
+        indexes[name].create(bind=conn, checkfirst=True)
+
+
+def _add_missing_columns(conn: Connection, table_name: str, *column_names: str):
+    existing = {c["name"] for c in inspect(conn).get_columns(table_name)}
+    table = Base.metadata.tables[table_name]
+    for name in column_names:
+        if name in existing:
+            continue
+        column = table.c[name]
+        ddl = f"ALTER TABLE {table_name} ADD COLUMN {name} {column.type.compile(conn.dialect)}"
+        if column.server_default is not None:
+            ddl += f" DEFAULT {column.server_default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+        conn.execute(text(ddl))
+
+
+def _initial_schema(conn: Connection):
+    Base.metadata.create_all(bind=conn)
+
+
+def _hot_path_indexes(conn: Connection):
+    _create_indexes(
+        conn, "reports",
+        "ix_reports_created_at_id", "ix_reports_status_created_at_id", "ix_reports_user_id",
+    )
+    _create_indexes(conn, "comments", "ix_comments_report_id_created_at")
+    _create_indexes(conn, "reactions", "ix_reactions_report_id_type")
+    _create_indexes(conn, "notifications", "ix_notifications_user_id_created_at")
+
+
+def _report_counters(conn: Connection):
+    _add_missing_columns(
+        conn, "reports", "like_count", "dislike_count", "comment_count"
+    )
+    conn.execute(text("""
+        UPDATE reports SET
+            like_count = (SELECT COUNT(*) FROM reactions
+                          WHERE reactions.report_id = reports.id
+                          AND reactions.type = 'like'),
+            dislike_count = (SELECT COUNT(*) FROM reactions
+                             WHERE reactions.report_id = reports.id
+                             AND reactions.type = 'dislike'),
+            comment_count = (SELECT COUNT(*) FROM comments
+                             WHERE comments.report_id = reports.id)
+    """))
+
+
+def _upload_refcount_index(conn: Connection):
+    _create_indexes(conn, "reports", "ix_reports_image_path")
+
+
+def _image_derivatives(conn: Connection):
+    _add_missing_columns(conn, "reports", "thumb_path", "medium_path")
+
+
+def _duplicate_detection(conn: Connection):
+    _add_missing_columns(conn, "reports", "image_phash", "duplicate_of_id")
+    _create_indexes(conn, "reports", "ix_reports_duplicate_of_id")
+
+
+def _notification_paging(conn: Connection):
+    _create_indexes(conn, "notifications", "ix_notifications_user_id_is_read")
+    if conn.dialect.name == "sqlite":
+        # Rows from the old server default lack the fractional seconds that
+        # SQLAlchemy writes, which breaks string ordering against cursors.
+        conn.execute(text("""
+            UPDATE notifications
+            SET created_at = strftime('%Y-%m-%d %H:%M:%f', created_at) || '000'
+            WHERE length(created_at) = 19
+        """))
+
+
+def _notification_coalescing(conn: Connection):
+    _add_missing_columns(
+        conn, "notifications", "bucket", "actor_count", "last_actor_id"
+    )
+    _create_indexes(conn, "notifications", "ux_notifications_coalesce")
+
+
+def _materialized_analytics(conn: Connection):
+    _add_missing_columns(conn, "reports", "resolved_at")
+    Base.metadata.create_all(
+        bind=conn,
+        tables=[
+            Base.metadata.tables["report_daily_stats"],
+            Base.metadata.tables["report_resolution_stats"],
+        ],
+    )
+    # Existing resolved reports have no resolved_at, so they only show up in
+    # the status counts, not in time-to-resolution.
+    rebuild_report_stats(conn)
+
+
+def _status_history(conn: Connection):
+    Base.metadata.create_all(
+        bind=conn,
+        tables=[
+            Base.metadata.tables["report_status_events"],
+            Base.metadata.tables["report_state_durations"],
+        ],
+    )
+    # Every report started out pending; when later changes happened is
+    # unknown, so those are not backfilled.
+    conn.execute(text("""
+        INSERT INTO report_status_events
+            (report_id, from_status, to_status, changed_by, created_at)
+        SELECT id, NULL, 'pending', user_id, created_at FROM reports
+        WHERE NOT EXISTS (SELECT 1 FROM report_status_events e
+                          WHERE e.report_id = reports.id)
+    """))
+
+
+def _full_text_search(conn: Connection):
+    if conn.dialect.name == "sqlite":
+        conn.execute(text("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5(
+                title, description, location,
+                content='reports', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """))
+        conn.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS reports_fts_insert AFTER INSERT ON reports
+            BEGIN
+                INSERT INTO reports_fts (rowid, title, description, location)
+                VALUES (new.id, new.title, new.description, new.location);
+            END
+        """))
+        conn.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS reports_fts_delete AFTER DELETE ON reports
+            BEGIN
+                INSERT INTO reports_fts (reports_fts, rowid, title, description, location)
+                VALUES ('delete', old.id, old.title, old.description, old.location);
+            END
+        """))
+        conn.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS reports_fts_update
+            AFTER UPDATE OF title, description, location ON reports
+            BEGIN
+                INSERT INTO reports_fts (reports_fts, rowid, title, description, location)
+                VALUES ('delete', old.id, old.title, old.description, old.location);
+                INSERT INTO reports_fts (rowid, title, description, location)
+                VALUES (new.id, new.title, new.description, new.location);
+            END
+        """))
+        conn.execute(text("INSERT INTO reports_fts (reports_fts) VALUES ('rebuild')"))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text("""
+            ALTER TABLE reports ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'C')
+            ) STORED
+        """))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_reports_search_vector "
+            "ON reports USING GIN (search_vector)"
+        ))
+
+
+def _report_coordinates(conn: Connection):
+    _add_missing_columns(conn, "reports", "latitude", "longitude", "geohash")
+    _create_indexes(conn, "reports", "ix_reports_geohash")
+
+    rows = conn.execute(text(
+        "SELECT id, location FROM reports WHERE latitude IS NULL"
+    )).all()
+    for report_id, location in rows:
+        point = geocoder.geocode(location)
+        if point is None:
+            continue
+        conn.execute(
+            text("UPDATE reports SET latitude = :lat, longitude = :lon, "
+                 "geohash = :geohash WHERE id = :id"),
+            {"lat": point[0], "lon": point[1],
+             "geohash": geohash_encode(*point), "id": report_id},
+        )
+
+
+def _address_numbers_as_coordinates(conn: Connection):
+    # The geocoder used to find "N, M" anywhere in the text, so "Lot 5, 7
+    # Jalan Ampang" was stored as (5, 7). Only rows whose point is exactly
+    # such a pair are redone; coordinates sent by the client are kept.
+    old_pattern = re.compile(r"(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)")
+    rows = conn.execute(text(
+        "SELECT id, location, latitude, longitude FROM reports WHERE latitude IS NOT NULL"
+    )).all()
+    for report_id, location, latitude, longitude in rows:
+        match = old_pattern.search(location)
+        if match is None or old_pattern.fullmatch(location.strip()):
+            continue
+        if (float(match.group(1)), float(match.group(2))) != (latitude, longitude):
+            continue
+        point = geocoder.geocode(location)
+        conn.execute(
+            text("UPDATE reports SET latitude = :lat, longitude = :lon, "
+                 "geohash = :geohash WHERE id = :id"),
+            {"lat": point[0] if point else None, "lon": point[1] if point else None,
+             "geohash": geohash_encode(*point) if point else None, "id": report_id},
+        )
+
+
+def _job_queue(conn: Connection):
+    Base.metadata.create_all(bind=conn, tables=[Base.metadata.tables["jobs"]])
+
+
+MIGRATIONS = [
+    (1, "initial schema", _initial_schema),
+    (2, "indexes for feed, comments, reactions and notifications", _hot_path_indexes),
+    (3, "like/dislike/comment counters on reports", _report_counters),
+    (4, "image_path index for upload reference counting", _upload_refcount_index),
+    (5, "thumbnail and medium image paths on reports", _image_derivatives),
+    (6, "perceptual hash and duplicate link on reports", _duplicate_detection),
+    (7, "unread index and cursor-safe timestamps on notifications", _notification_paging),
+    (8, "notification coalescing columns", _notification_coalescing),
+    (9, "materialized report analytics", _materialized_analytics),
+    (10, "report status history and time-in-state sketches", _status_history),
+    (11, "full-text search index on reports", _full_text_search),
+    (12, "coordinates and geohash index on reports", _report_coordinates),
+    (13, "background job queue", _job_queue),
+    (14, "re-geocode addresses misread as coordinates", _address_numbers_as_coordinates),
+]
+
+
+def current_version(conn: Connection) -> int:
+    return conn.execute(text("SELECT version FROM schema_version")).scalar() or 0
+
+
+def run_migrations(bind: Engine = engine) -> int:
+    with bind.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"
+        ))
+        version = current_version(conn)
+        if conn.execute(text("SELECT COUNT(*) FROM schema_version")).scalar() == 0:
+            conn.execute(text("INSERT INTO schema_version (version) VALUES (0)"))
+
+        for number, description, step in MIGRATIONS:
+            if number <= version:
+                continue
+            step(conn)
+            conn.execute(
+                text("UPDATE schema_version SET version = :v"), {"v": number}
+            )
+            print(f"Applied migration {number}: {description}")
+            version = number
+
+    return version
+
+
+if __name__ == "__main__":
+    run_migrations()
@@ -1,2 +1,12 @@
 from app.models.user import User
 from app.models.report import Report
+from app.models.comment import Comment
+from app.models.reaction import Reaction
+from app.models.notification import Notification
+from app.models.report_stats import (
+    ReportDailyStat,
+    ReportResolutionStat,
+    ReportStateDuration,
+)
+from app.models.report_status_event import ReportStatusEvent
+from app.models.job import Job
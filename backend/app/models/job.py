@@ -0,0 +1,29 @@
+from sqlalchemy import JSON, Column, Integer, String, Text, DateTime, Index
+from datetime import datetime
+from app.database import Base
+
+class Job(Base):
+    """
+    Outbox row for a side effect. Written in the same transaction as the
+    change that caused it and run afterwards by app.core.jobs workers.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(16), nullable=False, default="pending")  # pending/running/done/dead
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Visibility timeout: a running job whose lock has expired is claimable again
+    locked_until = Column(DateTime, nullable=True)
+    lock_token = Column(String(32), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # next claimable job
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
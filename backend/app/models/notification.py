@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.sql import func
+from datetime import datetime
 from app.database import Base
 
 class Notification(Base):
@@ -11,4 +12,24 @@ class Notification(Base):
     type = Column(String, nullable=False)               # comment | like | dislike
     report_id = Column(Integer, ForeignKey("reports.id"))
     is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Python-side default keeps microseconds, which the (created_at, id)
+    # pagination cursor relies on; server_default covers raw inserts.
+    created_at = Column(
+        DateTime(timezone=True), default=datetime.utcnow, server_default=func.now()
+    )
+
+    # Coalescing: one row per (receiver, report, type, time bucket) that
+    # counts actors, e.g. "B and 11 others liked your report"
+    bucket = Column(Integer, nullable=True)
+    actor_count = Column(Integer, default=1, server_default="1", nullable=False)
+    last_actor_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+        Index("ix_notifications_user_id_is_read", "user_id", "is_read"),
+        Index(
+            "ux_notifications_coalesce",
+            "user_id", "report_id", "type", "bucket",
+            unique=True,
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, Index
 from app.database import Base
 
 class Reaction(Base):
@@ -12,4 +12,5 @@ class Reaction(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "report_id", name="unique_user_report"),
+        Index("ix_reactions_report_id_type", "report_id", "type"),
     )
@@ -1,8 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Float, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Float, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
 
+REPORT_STATUSES = ("pending", "in_progress", "resolved")
+
+# Allowed status changes; a resolved report may be reopened into in_progress
+STATUS_TRANSITIONS = {
+    "pending": {"in_progress"},
+    "in_progress": {"resolved"},
+    "resolved": {"in_progress"},
+}
+
 class Report(Base):
     __tablename__ = "reports"
 
@@ -11,6 +20,7 @@ class Report(Base):
     description = Column(Text, nullable=False)
 
     # Standardised lifecycle: pending -> in_progress -> resolved
+    # (see STATUS_TRANSITIONS; every change is logged in report_status_events)
     status = Column(String, default="pending", nullable=False)
 
     # AI fields
@@ -20,5 +30,37 @@ class Report(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     user = relationship("User", backref="reports")
     location = Column(String, nullable=False)
+    # Optional coordinates (from the client or the geocoder) and their
+    # geohash, whose prefixes serve as the spatial index
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)
     image_path = Column(String, nullable=True)
+    # WebP derivatives, filled in by a background task after upload
+    thumb_path = Column(String, nullable=True)
+    medium_path = Column(String, nullable=True)
+
+    # Perceptual hash (hex dHash) and the earlier report it probably duplicates
+    image_phash = Column(String(16), nullable=True)
+    duplicate_of_id = Column(Integer, ForeignKey("reports.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Set when the status becomes "resolved", cleared if it is reopened
+    resolved_at = Column(DateTime, nullable=True)
+
+    # Denormalised counters, kept in step by the reaction/comment routes
+    like_count = Column(Integer, default=0, server_default="0", nullable=False)
+    dislike_count = Column(Integer, default=0, server_default="0", nullable=False)
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+    __table_args__ = (
+        # public feed: ORDER BY created_at, id with an optional status filter
+        Index("ix_reports_created_at_id", "created_at", "id"),
+        Index("ix_reports_status_created_at_id", "status", "created_at", "id"),
+        # /reports/me
+        Index("ix_reports_user_id", "user_id"),
+        # upload reference counting
+        Index("ix_reports_image_path", "image_path"),
+        Index("ix_reports_duplicate_of_id", "duplicate_of_id"),
+        # nearby / map queries: range scans over geohash prefixes
+        Index("ix_reports_geohash", "geohash"),
+    )
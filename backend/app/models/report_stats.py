@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Date, Integer, String
+from app.database import Base
+
+# Materialized analytics, maintained incrementally by the report routes and
+# the classifier (see app/core/stats.py). Rebuild with `python -m app.report_stats`.
+
+class ReportDailyStat(Base):
+    """Number of reports created on `day` currently in (status, category)."""
+    __tablename__ = "report_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    status = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)
+    count = Column(Integer, default=0, server_default="0", nullable=False)
+
+
+class ReportResolutionStat(Base):
+    """
+    Histogram of time-to-resolution for reports resolved on `day`. `bucket`
+    is a log-scale duration bucket, so medians can be read without keeping
+    every duration.
+    """
+    __tablename__ = "report_resolution_stats"
+
+    day = Column(Date, primary_key=True)
+    category = Column(String, primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    count = Column(Integer, default=0, server_default="0", nullable=False)
+
+
+class ReportStateDuration(Base):
+    """
+    Quantile sketch of how long reports of `category` stayed in `state`
+    before moving on; one row per sketch bucket (see app/core/stats.py).
+    """
+    __tablename__ = "report_state_durations"
+
+    category = Column(String, primary_key=True)
+    state = Column(String, primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    count = Column(Integer, default=0, server_default="0", nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from datetime import datetime
+from app.database import Base
+
+class ReportStatusEvent(Base):
+    """Append-only history of report status changes; never updated."""
+    __tablename__ = "report_status_events"
+
+    id = Column(Integer, primary_key=True)
+    report_id = Column(
+        Integer, ForeignKey("reports.id", ondelete="CASCADE"), nullable=False
+    )
+    from_status = Column(String, nullable=True)     # None for the creation event
+    to_status = Column(String, nullable=False)
+    changed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # latest event per report (time entered the current state)
+        Index("ix_report_status_events_report_id_created_at", "report_id", "created_at"),
+        Index("ix_report_status_events_to_status_created_at", "to_status", "created_at"),
+    )
@@ -0,0 +1,46 @@
+"""
+Maintenance for the materialized report analytics.
+
+    python -m app.report_stats check     # compare with the reports table
+    python -m app.report_stats rebuild   # recompute from the reports table
+
+`check` exits non-zero when the aggregates have drifted; run `rebuild` then.
+"""
+import sys
+
+from app.database import SessionLocal
+from app.core.stats import check_report_stats, rebuild_report_stats
+
+
+def check() -> bool:
+    db = SessionLocal()
+    try:
+        mismatches = check_report_stats(db)
+    finally:
+        db.close()
+
+    for table, key, actual, expected in mismatches:
+        print(f"{table} {key}: materialized={actual} expected={expected}")
+    print(f"{len(mismatches)} mismatched rows")
+    return not mismatches
+
+
+def rebuild():
+    db = SessionLocal()
+    try:
+        rows = rebuild_report_stats(db)
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"Rebuilt report analytics: {rows} rows")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+    if command == "rebuild":
+        rebuild()
+    elif command == "check":
+        sys.exit(0 if check() else 1)
+    else:
+        sys.exit(__doc__)
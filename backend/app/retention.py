@@ -0,0 +1,25 @@
+"""
+Retention job: compact old read notifications.
+
+    python -m app.retention [days]
+
+Schedule it daily (cron/systemd timer). Unread notifications are never removed.
+"""
+import sys
+
+from app.database import SessionLocal
+from app.core.notifications import RETENTION_DAYS, compact_notifications
+
+
+def run(days: int = RETENTION_DAYS):
+    db = SessionLocal()
+    try:
+        removed = compact_notifications(db, older_than_days=days)
+    finally:
+        db.close()
+
+    print(f"Removed {removed} read notifications older than {days} days")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else RETENTION_DAYS)
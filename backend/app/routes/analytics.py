@@ -1,36 +1,186 @@
-from fastapi import APIRouter, Depends
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from app.database import SessionLocal
-from app.models.report import Report
+from app.database import get_db
+from app.models.report import REPORT_STATUSES
+from app.models.report_stats import (
+    ReportDailyStat,
+    ReportResolutionStat,
+    ReportStateDuration,
+)
 from app.core.deps import require_admin
+from app.core.stats import median_seconds, sketch_quantile
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Every endpoint here reads the materialized aggregates in
+# app/models/report_stats.py, never the reports table.
+
+# Days are UTC, like created_at
+def _since(days: int) -> date:
+    return datetime.utcnow().date() - timedelta(days=days - 1)
 
 @router.get("/summary")
 def analytics_summary(
     db: Session = Depends(get_db),
     admin = Depends(require_admin),
 ):
-    total_reports = db.query(func.count(Report.id)).scalar()
-
     status_counts = (
-        db.query(Report.status, func.count(Report.id))
-        .group_by(Report.status)
+        db.query(ReportDailyStat.status, func.sum(ReportDailyStat.count))
+        .group_by(ReportDailyStat.status)
         .all()
     )
 
     return {
-        "total_reports": total_reports,
+        "total_reports": sum(count for _, count in status_counts),
         "reports_by_status": {
-            status: count for status, count in status_counts
+            status: count for status, count in status_counts if count
+        },
+    }
+
+# Reports created per day, split by status (optionally for one category)
+@router.get("/timeseries")
+def analytics_timeseries(
+    db: Session = Depends(get_db),
+    admin = Depends(require_admin),
+    days: int = Query(30, ge=1, le=366),
+    category: str | None = None,
+):
+    q = (
+        db.query(
+            ReportDailyStat.day,
+            ReportDailyStat.status,
+            func.sum(ReportDailyStat.count),
+        )
+        .filter(ReportDailyStat.day >= _since(days))
+    )
+
+    if category:
+        q = q.filter(ReportDailyStat.category == category)
+
+    series = defaultdict(dict)
+    for day, status, count in q.group_by(ReportDailyStat.day, ReportDailyStat.status):
+        if count:
+            series[day][status] = count
+
+    return [
+        {"day": day, "total": sum(counts.values()), "by_status": counts}
+        for day, counts in sorted(series.items())
+    ]
+
+# Status counts per predicted category
+@router.get("/categories")
+def analytics_categories(
+    db: Session = Depends(get_db),
+    admin = Depends(require_admin),
+    days: int | None = Query(None, ge=1, le=366),
+):
+    q = db.query(
+        ReportDailyStat.category,
+        ReportDailyStat.status,
+        func.sum(ReportDailyStat.count),
+    )
+
+    if days:
+        q = q.filter(ReportDailyStat.day >= _since(days))
+
+    categories = defaultdict(dict)
+    for category, status, count in q.group_by(
+        ReportDailyStat.category, ReportDailyStat.status
+    ):
+        if count:
+            categories[category][status] = count
+
+    return categories
+
+# Median time-to-resolution (hours) for reports resolved in the window,
+# estimated from the resolution histogram (within ~10%)
+@router.get("/resolution")
+def analytics_resolution(
+    db: Session = Depends(get_db),
+    admin = Depends(require_admin),
+    days: int = Query(30, ge=1, le=366),
+):
+    rows = (
+        db.query(
+            ReportResolutionStat.category,
+            ReportResolutionStat.bucket,
+            func.sum(ReportResolutionStat.count),
+        )
+        .filter(ReportResolutionStat.day >= _since(days))
+        .group_by(ReportResolutionStat.category, ReportResolutionStat.bucket)
+        .all()
+    )
+
+    overall = Counter()
+    by_category = defaultdict(Counter)
+    for category, bucket, count in rows:
+        if not count:
+            continue
+        overall[bucket] += count
+        by_category[category][bucket] += count
+
+    def summary(histogram: Counter) -> dict:
+        median = median_seconds(histogram)
+        return {
+            "resolved": sum(histogram.values()),
+            "median_hours": round(median / 3600, 2) if median is not None else None,
+        }
+
+    return {
+        **summary(overall),
+        "by_category": {
+            category: summary(histogram)
+            for category, histogram in by_category.items()
+        },
+    }
+
+# Time spent in each status before moving on, as p50/p90/p99 hours per
+# category. Read from the quantile sketches (~1% relative error), so the cost
+# does not grow with the number of status changes.
+@router.get("/sla")
+def analytics_sla(
+    db: Session = Depends(get_db),
+    admin = Depends(require_admin),
+    category: str | None = None,
+):
+    q = db.query(
+        ReportStateDuration.category,
+        ReportStateDuration.state,
+        ReportStateDuration.bucket,
+        ReportStateDuration.count,
+    )
+
+    if category:
+        q = q.filter(ReportStateDuration.category == category)
+
+    overall = defaultdict(Counter)
+    by_category = defaultdict(lambda: defaultdict(Counter))
+    for row_category, state, bucket, count in q:
+        if not count:
+            continue
+        overall[state][bucket] += count
+        by_category[row_category][state][bucket] += count
+
+    def percentiles(sketches: dict) -> dict:
+        result = {}
+        for state in REPORT_STATUSES:
+            sketch = sketches.get(state)
+            if not sketch:
+                continue
+            result[state] = {"count": sum(sketch.values())}
+            for name, quantile in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+                result[state][f"{name}_hours"] = round(sketch_quantile(sketch, quantile) / 3600, 2)
+        return result
+
+    return {
+        "all": percentiles(overall),
+        "by_category": {
+            row_category: percentiles(sketches)
+            for row_category, sketches in by_category.items()
         },
     }
@@ -1,50 +1,81 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
-from app.database import SessionLocal
+from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin
-from app.core.security import hash_password
-from app.core.security import verify_password
+from app.core.security import password_hasher
 from app.core.jwt import create_access_token
+from app.core.rate_limit import LOGIN_LIMIT, REGISTER_LIMIT, limit_per_ip
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Both helpers end their transaction before returning, so no pooled
+# connection is held while the password hasher queue is being waited on.
+def find_credentials(db: Session, email: str):
+    row = (
+        db.query(User.id, User.role, User.password_hash)
+        .filter(User.email == email)
+        .first()
+    )
+    db.rollback()
+    return row
+
+def save_user(db: Session, user: User):
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def update_password_hash(db: Session, user_id: int, password_hash: str):
+    (
+        db.query(User)
+        .filter(User.id == user_id)
+        .update({User.password_hash: password_hash}, synchronize_session=False)
+    )
+    db.commit()
 
-@router.post("/register", response_model=UserResponse)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user.email).first()
+# Async so password hashing waits on its own pool instead of holding a
+# threadpool worker; the short DB calls still run in the threadpool.
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    dependencies=[Depends(limit_per_ip(REGISTER_LIMIT))],
+)
+async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+    existing_user = await run_in_threadpool(find_credentials, db, user.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     new_user = User(
         name=user.name,
         email=user.email,
-        password_hash=hash_password(user.password)
+        password_hash=await password_hasher.hash(user.password)
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
-    return new_user
+    return await run_in_threadpool(save_user, db, new_user)
 
-@router.post("/login")
-def login_user(
+@router.post("/login", dependencies=[Depends(limit_per_ip(LOGIN_LIMIT))])
+async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await run_in_threadpool(find_credentials, db, form_data.username)
 
-    if not user or not verify_password(form_data.password, user.password_hash):
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update(
+            form_data.password, user.password_hash
+        )
+
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
+    if new_hash:
+        # Stored hash used an old scheme or cost factor; upgrade it
+        await run_in_threadpool(update_password_hash, db, user.id, new_hash)
+
     token = create_access_token({
         "sub": str(user.id),
         "role": user.role
@@ -53,4 +84,4 @@ def login_user(
     return {
         "access_token": token,
         "token_type": "bearer"
-    }
\ No newline at end of file
+    }
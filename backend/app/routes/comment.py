@@ -1,48 +1,60 @@
-from fastapi import APIRouter, Depends, Form, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Form, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.comment import Comment
 from app.models.report import Report
 from app.core.deps import get_current_user
+from app.core.counters import adjust_report_counters
+from app.core.notifications import queue_notification
+from app.core.response_cache import FEED_TAG, report_tag, response_cache
+from app.core.responses import row_dicts
+from app.core.rate_limit import COMMENT_LIMIT, limit_per_user
 from app.models.user import User
-from app.models.notification import Notification
 
 router = APIRouter(tags=["Comments"])
 
 
 @router.get("/reports/{report_id}/comments")
-def get_comments(
+async def get_comments(
     report_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    comments = (
-        db.query(Comment)
-        .join(User)
-        .filter(Comment.report_id == report_id)
+    return await response_cache.respond(
+        request, [report_tag(report_id)],
+        lambda: _comments(db, report_id),
+    )
+
+
+async def _comments(db, report_id):
+    rows = await db.execute(
+        select(
+            Comment.id,
+            Comment.content,
+            Comment.created_at,
+            User.name.label("username"),
+        )
+        .join(User, Comment.user_id == User.id)
+        .where(Comment.report_id == report_id)
         .order_by(Comment.created_at.desc())
-        .all()
     )
 
-    return [
-        {
-            "id": c.id,
-            "content": c.content,
-            "created_at": c.created_at,
-            "username": c.user.name,   # ✅ THIS IS KEY
-        }
-        for c in comments
-    ]
+    return row_dicts(rows)
 
 
-@router.post("/reports/{report_id}/comments")
-def add_comment(
+@router.post(
+    "/reports/{report_id}/comments",
+    dependencies=[Depends(limit_per_user(COMMENT_LIMIT))],
+)
+async def add_comment(
     report_id: int,
     content: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    report = db.query(Report).filter(Report.id == report_id).first()
+    report = await db.get(Report, report_id)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
@@ -52,27 +64,24 @@ def add_comment(
         report_id=report_id,
     )
     db.add(comment)
-    db.commit()
+    await adjust_report_counters(db, report_id, comment_count=1)
 
     if report.user_id != current_user.id:
-        note = Notification(
-            user_id=report.user_id,
-            actor_name=current_user.name,
-            type="comment",
-            report_id=report_id
-        )
-        db.add(note)
-        db.commit()
+        queue_notification(db, report.user_id, current_user, "comment", report_id)
+
+    await db.commit()
+    # comment count is part of the feed
+    await response_cache.invalidate(FEED_TAG, report_tag(report_id))
 
     return {"detail": "Comment added"}
 
 @router.delete("/{comment_id}")
-def delete_comment(
+async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.get(Comment, comment_id)
 
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -80,19 +89,21 @@ def delete_comment(
     if comment.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    db.delete(comment)
-    db.commit()
+    await db.delete(comment)
+    await adjust_report_counters(db, comment.report_id, comment_count=-1)
+    await db.commit()
+    await response_cache.invalidate(FEED_TAG, report_tag(comment.report_id))
 
     return {"detail": "Comment deleted"}
 
 @router.put("/{comment_id}")
-def update_comment(
+async def update_comment(
     comment_id: int,
     content: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.get(Comment, comment_id)
 
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -101,8 +112,10 @@ def update_comment(
         raise HTTPException(status_code=403, detail="Not allowed")
 
     comment.content = content
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
+    await db.refresh(comment)
+    # the feed shows the latest comments of each report
+    await response_cache.invalidate(FEED_TAG, report_tag(comment.report_id))
 
     return comment
 
@@ -1,50 +1,147 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
+import json
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal, get_async_db
 from app.models.notification import Notification
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_token_payload, load_principal_async
+from app.core.notifications import serialize_notification, user_channel
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    keyset_filter,
+    keyset_order,
+    next_cursor,
+)
+from app.core.pubsub import hub
+from app.core.responses import ORJSONResponse
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
+HEARTBEAT_SECONDS = 15
+
 @router.get("/")
-def get_notifications(
-    db: Session = Depends(get_db),
+async def get_notifications(
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+):
+    # Only the columns serialize_notification reads
+    q = select(
+        Notification.id,
+        Notification.actor_name,
+        Notification.actor_count,
+        Notification.type,
+        Notification.report_id,
+        Notification.is_read,
+        Notification.created_at,
+    ).where(Notification.user_id == current_user.id)
+
+    if cursor:
+        q = q.where(
+            keyset_filter(Notification.created_at, Notification.id, cursor, True)
+        )
+
+    notes = (await db.execute(
+        q.order_by(*keyset_order(Notification.created_at, Notification.id, True))
+        .limit(limit + 1)
+    )).all()
+    notes, cursor_token = next_cursor(
+        notes, limit, key=lambda n: (n.created_at, n.id)
+    )
+
+    return ORJSONResponse({
+        "items": [serialize_notification(n) for n in notes],
+        "next_cursor": cursor_token,
+    })
+
+@router.get("/unread-count")
+async def unread_count(
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    notes = (
-        db.query(Notification)
-        .filter(Notification.user_id == current_user.id)
-        .order_by(Notification.created_at.desc())
-        .all()
+    count = await db.scalar(
+        select(func.count(Notification.id))
+        .where(Notification.user_id == current_user.id,
+               Notification.is_read.is_(False))
+    )
+
+    return {"unread": count}
+
+async def _authenticate_stream(token: str):
+    payload = get_token_payload(token)
+    async with AsyncSessionLocal() as db:
+        return await load_principal_async(int(payload["sub"]), db)
+
+# Server-Sent Events. EventSource cannot set headers, so the bearer token is
+# passed as ?token=. No DB session is held while the stream is open.
+@router.get("/stream")
+async def notification_stream(request: Request, token: str = Query(...)):
+    current_user = await _authenticate_stream(token)
+
+    async def events():
+        async with hub.subscribe(user_channel(current_user.id)) as subscription:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                message = await subscription.get(timeout=HEARTBEAT_SECONDS)
+                if message is None:
+                    yield ": ping\n\n"
+                else:
+                    yield f"event: notification\ndata: {json.dumps(message)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Bulk mark-as-read. Without a cursor every notification is marked; with one
+# (a next_cursor from the list) only those from the newest down to and
+# including that position, i.e. the pages the user has already seen.
+@router.post("/read-all")
+async def mark_all_read(
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user)
+):
+    q = update(Notification).where(
+        Notification.user_id == current_user.id,
+        Notification.is_read.is_(False),
+    )
+
+    if cursor:
+        q = q.where(
+            keyset_filter(
+                Notification.created_at, Notification.id, cursor,
+                descending=False, inclusive=True,
+            )
+        )
+
+    result = await db.execute(
+        q.values(is_read=True).execution_options(synchronize_session=False)
     )
+    updated = result.rowcount
+    await db.commit()
 
-    return [
-        {
-            "id": n.id,
-            "actor": n.actor_name,
-            "type": n.type,
-            "report_id": n.report_id,
-            "is_read": n.is_read,
-            "created_at": n.created_at
-        }
-        for n in notes
-    ]
+    return {"detail": "ok", "updated": updated}
 
 @router.post("/{notification_id}/read")
-def mark_as_read(
+async def mark_as_read(
     notification_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    n = (
-        db.query(Notification)
-        .filter(Notification.id == notification_id,
-                Notification.user_id == current_user.id)
-        .first()
+    n = await db.scalar(
+        select(Notification)
+        .where(Notification.id == notification_id,
+               Notification.user_id == current_user.id)
     )
 
     if n:
         n.is_read = True
-        db.commit()
+        await db.commit()
 
     return {"detail": "ok"}
@@ -1,75 +1,90 @@
-from fastapi import APIRouter, Depends, Form, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Form, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.reaction import Reaction
 from app.models.report import Report
 from app.core.deps import get_current_user
-from app.models.notification import Notification
+from app.core.counters import REACTION_COUNTERS, adjust_report_counters
+from app.core.notifications import queue_notification
+from app.core.response_cache import FEED_TAG, report_tag, response_cache
+from app.core.rate_limit import REACTION_LIMIT, limit_per_user
 
 router = APIRouter(tags=["Reactions"])
 
 
-@router.post("/reports/{report_id}/reaction")
-def react(
+@router.post(
+    "/reports/{report_id}/reaction",
+    dependencies=[Depends(limit_per_user(REACTION_LIMIT))],
+)
+async def react(
     report_id: int,
     type: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
     if type not in ("like", "dislike"):
         raise HTTPException(status_code=400, detail="Invalid reaction type")
 
-    report = db.query(Report).filter(Report.id == report_id).first()
+    report = await db.get(Report, report_id)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    existing = db.query(Reaction).filter(
+    existing = await db.scalar(select(Reaction).where(
         Reaction.report_id == report_id,
         Reaction.user_id == current_user.id,
-    ).first()
+    ))
+
+    changed = existing is None or existing.type != type
 
     if existing:
-        existing.type = type
+        if changed:
+            await adjust_report_counters(db, report_id, **{
+                REACTION_COUNTERS[existing.type]: -1,
+                REACTION_COUNTERS[type]: 1,
+            })
+            existing.type = type
     else:
         db.add(Reaction(
             report_id=report_id,
             user_id=current_user.id,
             type=type,
         ))
+        await adjust_report_counters(db, report_id, **{REACTION_COUNTERS[type]: 1})
 
-    db.commit()
+    if changed and report.user_id != current_user.id:
+        # like or dislike, coalesced into the receiver's existing row
+        queue_notification(db, report.user_id, current_user, type, report_id)
 
-    if report.user_id != current_user.id:
-        note = Notification(
-            user_id=report.user_id,
-            actor_name=current_user.name,
-            type=type,   # like or dislike
-            report_id=report_id
-        )
-        db.add(note)
-        db.commit()
+    await db.commit()
+    if changed:
+        await response_cache.invalidate(FEED_TAG, report_tag(report_id))
 
     return {"detail": "Reaction saved"}
 
 @router.get("/reports/{report_id}/reactions")
-def get_reactions(
+async def get_reactions(
     report_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    likes = (
-        db.query(Reaction)
-        .filter(Reaction.report_id == report_id, Reaction.type == "like")
-        .count()
+    return await response_cache.respond(
+        request, [report_tag(report_id)],
+        lambda: _reaction_counts(db, report_id),
     )
 
-    dislikes = (
-        db.query(Reaction)
-        .filter(Reaction.report_id == report_id, Reaction.type == "dislike")
-        .count()
-    )
+
+async def _reaction_counts(db, report_id):
+    counts = (await db.execute(
+        select(Report.like_count, Report.dislike_count)
+        .where(Report.id == report_id)
+    )).first()
+
+    if counts is None:
+        return {"likes": 0, "dislikes": 0}
 
     return {
-        "likes": likes,
-        "dislikes": dislikes
+        "likes": counts.like_count,
+        "dislikes": counts.dislike_count
     }
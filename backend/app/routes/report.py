@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
-import shutil
-import os
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
 
-from app.database import SessionLocal
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Form, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models.comment import Comment
+from app.models.reaction import Reaction
 from app.models.report import Report
 from app.models.user import User
 from app.schemas.report import (
@@ -11,37 +16,89 @@ from app.schemas.report import (
     ReportResponse,
     ReportStatusUpdate,
 )
-from app.core.deps import get_current_user, require_admin
-from app.ai.classifier import classify_image
+from app.core.deps import get_current_user, get_optional_user, require_admin
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    encode_cursor,
+    encode_score_cursor,
+    keyset_filter,
+    keyset_order,
+    next_cursor,
+    score_filter,
+)
+from app.core.search import search_matches
+from app.core.geocoding import geocode_report
+from app.core.response_cache import FEED_TAG, report_tag, response_cache
+from app.core.responses import ORJSONResponse, row_dicts
+from app.core.export import EXPORT_FORMATS, accepts_gzip, export_query, stream_export
+from app.core.geohash import (
+    approx_distance_sq,
+    encode as geohash_encode,
+    haversine_m,
+    in_box,
+    radius_bbox,
+)
+from app.core.uploads import StoredUpload, stored_image, release_upload
+from app.core.stats import apply_report_stats, report_facts
+from app.core.lifecycle import change_status, record_created
+from app.core.thumbnails import generate_derivatives
+from app.core.rate_limit import REPORT_LIMIT, limit_per_user
+from app.ai.batching import queue_classification
+from app.ai.duplicates import detect_duplicates, duplicate_index
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+MAX_NEARBY_RADIUS_M = 50_000
+# Relative error allowed for the SQL distance estimate, and extra rows fetched
+# so reports it ranks slightly out of order still make the page
+NEARBY_MARGIN = 0.02
+NEARBY_SLACK = 20
+# Below this map zoom level /public/map returns clustered counts
+MARKER_ZOOM = 15
+MAX_MARKERS = 500
+# Latest comments shown on each card of /feed
+FEED_COMMENTS = 3
+MAX_FEED_COMMENTS = 10
+
+# Column-only selects for list endpoints: rows go straight to orjson without
+# building ORM entities or validating each one through ReportResponse.
+REPORT_COLUMNS = tuple(getattr(Report, name) for name in ReportResponse.model_fields)
+FEED_COLUMNS = (
+    Report.id,
+    Report.title,
+    Report.description,
+    Report.location,
+    Report.status,
+    Report.created_at,
+    Report.image_path,
+    Report.thumb_path,
+    Report.medium_path,
+    User.name.label("username"),
+    Report.like_count.label("likes"),
+    Report.dislike_count.label("dislikes"),
+    Report.comment_count.label("comments"),
+)
 
 # Create report (uses multipart/form-data because of image upload)
-@router.post("/", response_model=ReportResponse)
-def create_report(
+@router.post(
+    "/",
+    response_model=ReportResponse,
+    dependencies=[Depends(limit_per_user(REPORT_LIMIT))],
+)
+async def create_report(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: str = Form(...),
     location: str = Form(...),
-    image: UploadFile | None = File(None),
-    db: Session = Depends(get_db),
+    latitude: float | None = Form(None, ge=-90, le=90),
+    longitude: float | None = Form(None, ge=-180, le=180),
+    upload: StoredUpload | None = Depends(stored_image, scope="function"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    image_path = None
-
-    # ✅ ONLY save image if it exists
-    if image:
-        os.makedirs("uploads", exist_ok=True)
-        image_path = f"uploads/{image.filename}"
-
-        with open(image_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
+    image_path = upload.path if upload else None
+    has_point = latitude is not None and longitude is not None
 
     new_report = Report(
         title=title,
@@ -51,59 +108,386 @@ def create_report(
         user_id=current_user.id,
     )
 
+    if has_point:
+        new_report.latitude = latitude
+        new_report.longitude = longitude
+        new_report.geohash = geohash_encode(latitude, longitude)
+
     db.add(new_report)
-    db.commit()
-    db.refresh(new_report)
+    await db.flush()
+    record_created(db, new_report, current_user.id)
+    await apply_report_stats(db, None, report_facts(new_report))
+    if upload:
+        queue_classification(db, new_report.id, upload.path, upload.filename)
+    await db.commit()
+    await db.refresh(new_report)
+    await response_cache.invalidate(FEED_TAG)
+
+    if not has_point:
+        background_tasks.add_task(geocode_report, new_report.id, location)
+
+    if upload:
+        background_tasks.add_task(generate_derivatives, new_report.id, upload.path)
+        background_tasks.add_task(detect_duplicates, new_report.id, upload.path)
 
     return new_report
 
 @router.get("/public")
-def public_reports(
-    db: Session = Depends(get_db),
+async def public_reports(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    status: str | None = None,
+    sort: str = "newest",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+):
+    return await response_cache.respond(
+        request, [FEED_TAG],
+        lambda: _public_reports_page(db, status, sort, limit, cursor),
+    )
+
+async def _public_reports_page(db, status, sort, limit, cursor):
+    descending = sort != "oldest"
+
+    q = select(*FEED_COLUMNS).join(User, Report.user_id == User.id)
+
+    if status:
+        q = q.where(Report.status == status)
+
+    if cursor:
+        q = q.where(
+            keyset_filter(Report.created_at, Report.id, cursor, descending)
+        )
+
+    rows = (await db.execute(
+        q.order_by(*keyset_order(Report.created_at, Report.id, descending))
+        .limit(limit + 1)
+    )).all()
+    rows, cursor_token = next_cursor(
+        rows, limit, key=lambda row: (row.created_at, row.id)
+    )
+
+    return {
+        "items": row_dicts(rows),
+        "next_cursor": cursor_token,
+    }
+
+# Everything a feed card shows, for a whole page, in a fixed number of
+# queries: the page itself, the latest comments of every report on it
+# (one windowed query) and, when signed in, the caller's own reactions.
+@router.get("/feed")
+async def report_feed(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     status: str | None = None,
-    sort: str = "newest"
+    sort: str = "newest",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    comments: int = Query(FEED_COMMENTS, ge=0, le=MAX_FEED_COMMENTS),
+    current_user=Depends(get_optional_user),
 ):
-    q = db.query(Report).join(User)
+    if current_user is None:
+        return await response_cache.respond(
+            request, [FEED_TAG],
+            lambda: _feed_page(db, status, sort, limit, cursor, comments),
+        )
+
+    # Per-user, so built fresh; the shared part is the same as above
+    page = await _feed_page(db, status, sort, limit, cursor, comments)
+    own = dict((await db.execute(
+        select(Reaction.report_id, Reaction.type).where(
+            Reaction.user_id == current_user.id,
+            Reaction.report_id.in_([item["id"] for item in page["items"]]),
+        )
+    )).all())
+    for item in page["items"]:
+        item["my_reaction"] = own.get(item["id"])
+
+    return ORJSONResponse(page)
+
+async def _feed_page(db, status, sort, limit, cursor, comments):
+    page = await _public_reports_page(db, status, sort, limit, cursor)
+    latest = await _latest_comments(db, [item["id"] for item in page["items"]], comments)
+
+    for item in page["items"]:
+        item["latest_comments"] = latest.get(item["id"], [])
+        item["my_reaction"] = None
+
+    return page
+
+async def _latest_comments(db, report_ids, per_report):
+    if not report_ids or not per_report:
+        return {}
+
+    ranked = (
+        select(
+            Comment.id,
+            Comment.report_id,
+            Comment.content,
+            Comment.created_at,
+            User.name.label("username"),
+            func.row_number().over(
+                partition_by=Comment.report_id,
+                order_by=(Comment.created_at.desc(), Comment.id.desc()),
+            ).label("rank"),
+        )
+        .join(User, Comment.user_id == User.id)
+        .where(Comment.report_id.in_(report_ids))
+        .subquery()
+    )
+    rows = await db.execute(
+        select(
+            ranked.c.id,
+            ranked.c.report_id,
+            ranked.c.content,
+            ranked.c.created_at,
+            ranked.c.username,
+        )
+        .where(ranked.c.rank <= per_report)
+        .order_by(ranked.c.report_id, ranked.c.rank)
+    )
 
+    latest = defaultdict(list)
+    for row in rows:
+        latest[row.report_id].append({
+            "id": row.id,
+            "content": row.content,
+            "created_at": row.created_at,
+            "username": row.username,
+        })
+    return latest
+
+# Reaction/comment counts for many reports in one round-trip
+@router.get("/counts")
+async def report_counts(
+    ids: list[int] = Query(..., max_length=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = (await db.execute(
+        select(
+            Report.id,
+            Report.like_count,
+            Report.dislike_count,
+            Report.comment_count,
+        )
+        .where(Report.id.in_(ids))
+    )).all()
+
+    return {
+        row.id: {
+            "likes": row.like_count,
+            "dislikes": row.dislike_count,
+            "comments": row.comment_count,
+        }
+        for row in rows
+    }
+
+# Admin: stream every matching report as CSV or NDJSON (spreadsheet export).
+# Compressed on the fly when the client accepts gzip.
+@router.get("/export")
+async def export_reports(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status: str | None = None,
+    category: str | None = None,
+    created_from: date | None = None,
+    created_to: date | None = None,
+    admin: User = Depends(require_admin),
+):
+    filters = []
     if status:
-        q = q.filter(Report.status == status)
+        filters.append(Report.status == status)
+    if category:
+        filters.append(Report.predicted_category == category)
+    if created_from:
+        filters.append(Report.created_at >= datetime.combine(created_from, time.min))
+    if created_to:
+        # inclusive of the whole day
+        filters.append(
+            Report.created_at < datetime.combine(created_to + timedelta(days=1), time.min)
+        )
+
+    media_type, extension = EXPORT_FORMATS[format]
+    compress = accepts_gzip(request.headers.get("accept-encoding", ""))
+    headers = {
+        "Content-Disposition": f'attachment; filename="reports.{extension}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        stream_export(export_query(filters), format, compress),
+        media_type=media_type,
+        headers=headers,
+    )
 
-    if sort == "oldest":
-        q = q.order_by(Report.created_at.asc())
+# Admin: full-text search over title, description and location. Ranked by
+# relevance (default) or newest first, with keyset pagination either way.
+@router.get("/search")
+async def search_reports(
+    q: str = Query(..., min_length=1, max_length=200),
+    status: str | None = None,
+    category: str | None = None,
+    sort: str = Query("relevance", pattern="^(relevance|newest)$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(require_admin),
+):
+    matches = search_matches(db.bind.dialect.name, q)
+    if matches is None:
+        return {"items": [], "next_cursor": None}
+
+    query = select(*REPORT_COLUMNS, matches.c.score).join(matches, Report.id == matches.c.id)
+
+    if status:
+        query = query.where(Report.status == status)
+
+    if category:
+        query = query.where(Report.predicted_category == category)
+
+    if sort == "newest":
+        if cursor:
+            query = query.where(keyset_filter(Report.created_at, Report.id, cursor, True))
+        query = query.order_by(*keyset_order(Report.created_at, Report.id, True))
+        key, encode = (lambda row: (row.created_at, row.id)), encode_cursor
     else:
-        q = q.order_by(Report.created_at.desc())
-
-    reports = q.all()   
-
-    return [            
-        {
-            "id": r.id,
-            "title": r.title,
-            "description": r.description,
-            "location": r.location,
-            "status": r.status,
-            "created_at": r.created_at,
-            "image_path": r.image_path,
-            "username": r.user.name,   
+        if cursor:
+            query = query.where(score_filter(matches.c.score, Report.id, cursor))
+        query = query.order_by(matches.c.score.desc(), Report.id.desc())
+        key, encode = (lambda row: (row.score, row.id)), encode_score_cursor
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    rows, cursor_token = next_cursor(rows, limit, key=key, encode=encode)
+
+    return ORJSONResponse({
+        "items": row_dicts(rows),
+        "next_cursor": cursor_token,
+    })
+
+# Reports within `radius` metres of a point, nearest first
+@router.get("/public/nearby")
+async def nearby_reports(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius: float = Query(1000, gt=0, le=MAX_NEARBY_RADIUS_M),
+    status: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Nearest first in SQL, so only about a page of rows is fetched
+    distance_sq = approx_distance_sq(Report.latitude, Report.longitude, lat, lon)
+    q = select(
+        Report.id,
+        Report.title,
+        Report.status,
+        Report.location,
+        Report.latitude,
+        Report.longitude,
+        Report.thumb_path,
+        Report.created_at,
+    ).where(
+        in_box(Report.latitude, Report.longitude, Report.geohash,
+               *radius_bbox(lat, lon, radius)),
+        # The flat-earth distance can be a little off, so keep a margin in
+        # SQL and apply the exact radius below
+        distance_sq <= (radius * (1 + NEARBY_MARGIN)) ** 2,
+    )
+
+    if status:
+        q = q.where(Report.status == status)
+
+    hits = []
+    q = q.order_by(distance_sq).limit(limit + NEARBY_SLACK)
+    for row in (await db.execute(q)).all():
+        distance = haversine_m(lat, lon, row.latitude, row.longitude)
+        if distance <= radius:
+            hits.append({**row._asdict(), "distance_m": round(distance)})
+
+    hits.sort(key=lambda hit: hit["distance_m"])
+    return hits[:limit]
+
+# Map view for a bounding box. Below MARKER_ZOOM, reports are grouped by
+# geohash cell (cells shrink as the zoom grows) and only counts and centroids
+# are returned; closer in, individual markers up to MAX_MARKERS.
+@router.get("/public/map")
+async def map_reports(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=0, le=22),
+    status: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+
+    box = in_box(Report.latitude, Report.longitude, Report.geohash,
+                 min_lat, min_lon, max_lat, max_lon)
+
+    if zoom < MARKER_ZOOM:
+        # zoom 2 -> 1 character cells (~45 deg), zoom 14 -> 7 (~150 m)
+        precision = max(1, (zoom + 1) // 2)
+        cell = func.substr(Report.geohash, 1, precision)
+        q = select(
+            cell.label("geohash"),
+            func.count(Report.id).label("count"),
+            func.avg(Report.latitude).label("lat"),
+            func.avg(Report.longitude).label("lon"),
+        ).where(box)
+
+        if status:
+            q = q.where(Report.status == status)
+
+        rows = (await db.execute(q.group_by(cell))).all()
+        return {
+            "type": "clusters",
+            "items": row_dicts(rows),
         }
-        for r in reports
-    ]
+
+    q = select(
+        Report.id,
+        Report.title,
+        Report.status,
+        Report.latitude,
+        Report.longitude,
+    ).where(box)
+
+    if status:
+        q = q.where(Report.status == status)
+
+    rows = (await db.execute(q.limit(MAX_MARKERS + 1))).all()
+    return {
+        "type": "markers",
+        "items": row_dicts(rows[:MAX_MARKERS]),
+        "truncated": len(rows) > MAX_MARKERS,
+    }
 
 @router.get("/public/{report_id}")
-def public_report_detail(
+async def public_report_detail(
     report_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    report = (
-        db.query(Report)
-        .join(User)
-        .filter(Report.id == report_id)
-        .first()
+    return await response_cache.respond(
+        request, [report_tag(report_id)],
+        lambda: _public_report_detail(db, report_id),
     )
 
-    if not report:
+async def _public_report_detail(db, report_id):
+    row = (await db.execute(
+        select(Report, User.name)
+        .join(User, Report.user_id == User.id)
+        .where(Report.id == report_id)
+    )).first()
+
+    if not row:
         raise HTTPException(status_code=404, detail="Report not found")
 
+    report, username = row
+
     return {
         "id": report.id,
         "title": report.title,
@@ -112,28 +496,31 @@ def public_report_detail(
         "status": report.status,
         "created_at": report.created_at,
         "image_path": report.image_path,
-        "username": report.user.name,  
+        "thumb_path": report.thumb_path,
+        "medium_path": report.medium_path,
+        "latitude": report.latitude,
+        "longitude": report.longitude,
+        "username": username,
     }
 
 # View own reports
 @router.get("/me", response_model=list[ReportResponse])
-def get_my_reports(
-    db: Session = Depends(get_db),
+async def get_my_reports(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    return (
-        db.query(Report)
-        .filter(Report.user_id == current_user.id)
-        .all()
+    rows = await db.execute(
+        select(*REPORT_COLUMNS).where(Report.user_id == current_user.id)
     )
+    return ORJSONResponse(row_dicts(rows))
 
 @router.get("/{report_id}", response_model=ReportResponse)
-def get_report(
+async def get_report(
     report_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    report = db.query(Report).filter(Report.id == report_id).first()
+    report = await db.get(Report, report_id)
 
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
@@ -145,16 +532,20 @@ def get_report(
 
 # Update own report
 @router.put("/{report_id}", response_model=ReportResponse)
-def update_report(
+async def update_report(
     report_id: int,
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: str = Form(...),
     location: str = Form(...),
-    image: UploadFile | None = File(None),
-    db: Session = Depends(get_db),
+    latitude: float | None = Form(None, ge=-90, le=90),
+    longitude: float | None = Form(None, ge=-180, le=180),
+    upload: StoredUpload | None = Depends(stored_image, scope="function"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    report = db.query(Report).filter(Report.id == report_id).first()
+    image_path = upload.path if upload else None
+    report = await db.get(Report, report_id)
 
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
@@ -162,31 +553,62 @@ def update_report(
     if report.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    location_changed = location != report.location
+    has_point = latitude is not None and longitude is not None
+
     report.title = title
     report.description = description
     report.location = location
 
-    if image:
-        os.makedirs("uploads", exist_ok=True)
-        image_path = f"uploads/{image.filename}"
-        with open(image_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
+    if has_point:
+        report.latitude = latitude
+        report.longitude = longitude
+        report.geohash = geohash_encode(latitude, longitude)
+    elif location_changed:
+        # Stale coordinates; re-geocoded below
+        report.latitude = None
+        report.longitude = None
+        report.geohash = None
+
+    image_changed = image_path is not None and image_path != report.image_path
+    old_image_path = report.image_path
+    before = report_facts(report)
+
+    if image_changed:
         report.image_path = image_path
-
-    db.commit()
-    db.refresh(report)
+        report.thumb_path = None
+        report.medium_path = None
+        report.predicted_category = None
+        report.confidence_score = None
+        report.image_phash = None
+        report.duplicate_of_id = None
+        await apply_report_stats(db, before, report_facts(report))
+        release_upload(db, old_image_path)
+        queue_classification(db, report.id, image_path, upload.filename)
+
+    await db.commit()
+    await db.refresh(report)
+    await response_cache.invalidate(FEED_TAG, report_tag(report.id))
+
+    if location_changed and not has_point:
+        background_tasks.add_task(geocode_report, report.id, location)
+
+    if image_changed:
+        duplicate_index.remove(report.id)
+        background_tasks.add_task(generate_derivatives, report.id, image_path)
+        background_tasks.add_task(detect_duplicates, report.id, image_path)
 
     return report
 
 
 # Delete own report
 @router.delete("/{report_id}")
-def delete_report(
+async def delete_report(
     report_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    report = db.query(Report).filter(Report.id == report_id).first()
+    report = await db.get(Report, report_id)
 
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
@@ -194,41 +616,67 @@ def delete_report(
     if report.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    # Optional: delete image file
-    if report.image_path and os.path.exists(report.image_path):
-        os.remove(report.image_path)
+    image_path = report.image_path
+    await apply_report_stats(db, report_facts(report), None)
 
-    db.delete(report)
-    db.commit()
+    await db.execute(
+        update(Report)
+        .where(Report.duplicate_of_id == report_id)
+        .values(duplicate_of_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.delete(report)
+    # Only removes the file when no other report shares it
+    release_upload(db, image_path)
+    await db.commit()
+    duplicate_index.remove(report_id)
+    await response_cache.invalidate(FEED_TAG, report_tag(report_id))
 
     return {"detail": "Report deleted"}
 
 
 # Admin: view all reports
 @router.get("/", response_model=list[ReportResponse])
-def get_all_reports(
-    db: Session = Depends(get_db),
+async def get_all_reports(
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(require_admin),
+):
+    rows = await db.execute(select(*REPORT_COLUMNS))
+    return ORJSONResponse(row_dicts(rows))
+
+
+# Admin: reports flagged as probable duplicates of this one
+@router.get("/{report_id}/duplicates", response_model=list[ReportResponse])
+async def get_duplicates(
+    report_id: int,
+    db: AsyncSession = Depends(get_async_db),
     admin: User = Depends(require_admin),
 ):
-    return db.query(Report).all()
+    rows = await db.execute(
+        select(*REPORT_COLUMNS)
+        .where(Report.duplicate_of_id == report_id)
+        .order_by(Report.created_at.asc())
+    )
+    return ORJSONResponse(row_dicts(rows))
 
 
 # Admin: update report status
 @router.patch("/{report_id}/status", response_model=ReportResponse)
-def update_report_status(
+async def update_report_status(
     report_id: int,
     payload: ReportStatusUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin: User = Depends(require_admin),
 ):
-    report = db.query(Report).filter(Report.id == report_id).first()
+    report = await db.get(Report, report_id)
 
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    report.status = payload.status
-    db.commit()
-    db.refresh(report)
+    if await change_status(db, report, payload.status, admin.id):
+        await db.commit()
+        await db.refresh(report)
+        await response_cache.invalidate(FEED_TAG, report_tag(report_id))
 
     return report
 
@@ -1,13 +1,13 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 class ReportCreate(BaseModel):
     title: str
     description: str
 
 class ReportStatusUpdate(BaseModel):
-    status: str
+    status: Literal["pending", "in_progress", "resolved"]
 
 class ReportResponse(BaseModel):
     id: int
@@ -18,6 +18,11 @@ class ReportResponse(BaseModel):
     predicted_category: str | None
     confidence_score: float | None
     image_path: Optional[str]
+    thumb_path: Optional[str] = None
+    medium_path: Optional[str] = None
+    duplicate_of_id: Optional[int] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
\ No newline at end of file
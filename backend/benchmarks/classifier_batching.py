@@ -0,0 +1,105 @@
+"""
+Throughput/latency of the classification queue at different batch sizes.
+
+    python -m benchmarks.classifier_batching [--images 500] [--sizes 1,8,32,64]
+
+Simulates a burst of uploads arriving at once (as after a storm, with
+enough job workers to run their classify jobs together) against the
+feature-model backend, trained on the fly on synthetic images, and reports
+images/sec and p50/p99 submit-to-prediction latency per max batch size.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+from sklearn.linear_model import LogisticRegression
+
+from app.ai.batching import ClassificationQueue
+from app.ai.classifier import FeatureModelClassifier, image_features
+
+CATEGORIES = ["flood", "road_damage", "streetlight", "other"]
+
+
+def make_images(folder: str, count: int) -> list[str]:
+    paths = []
+    for i in range(count):
+        colour = tuple(random.randrange(256) for _ in range(3))
+        img = Image.new("RGB", (1600, 1200), colour)
+        img.paste(
+            tuple(random.randrange(256) for _ in range(3)),
+            (0, 0, random.randrange(200, 1600), random.randrange(200, 1200)),
+        )
+        path = os.path.join(folder, f"img_{i}.jpg")
+        img.save(path, "JPEG", quality=85)
+        paths.append(path)
+    return paths
+
+
+def make_classifier(paths: list[str]) -> FeatureModelClassifier:
+    features = np.stack([image_features(p) for p in paths[:50]])
+    labels = [CATEGORIES[i % len(CATEGORIES)] for i in range(len(features))]
+
+    classifier = FeatureModelClassifier.__new__(FeatureModelClassifier)
+    classifier.model = LogisticRegression(max_iter=500).fit(features, labels)
+    classifier.fallback = None
+    return classifier
+
+
+def run(classifier, paths: list[str], batch_size: int) -> dict:
+    q = ClassificationQueue(classifier, max_batch_size=batch_size, max_wait=0.02)
+    q.start()
+
+    submitted, finished = {}, {}
+    done = threading.Event()
+
+    def record(i):
+        def callback(_):
+            finished[i] = time.perf_counter()
+            if len(finished) == len(paths):
+                done.set()
+        return callback
+
+    start = time.perf_counter()
+    for i, path in enumerate(paths):
+        submitted[i] = time.perf_counter()
+        q.submit(path).add_done_callback(record(i))
+    done.wait()
+    elapsed = time.perf_counter() - start
+    q.stop()
+
+    latencies = sorted((finished[i] - submitted[i]) * 1000 for i in submitted)
+    return {
+        "batch_size": batch_size,
+        "images_per_sec": len(paths) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=500)
+    parser.add_argument("--sizes", default="1,8,32,64")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = make_images(folder, args.images)
+        classifier = make_classifier(paths)
+
+        print(f"{'batch':>6} {'img/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+        for size in (int(s) for s in args.sizes.split(",")):
+            result = run(classifier, paths, size)
+            print(
+                f"{result['batch_size']:>6} {result['images_per_sec']:>10.1f} "
+                f"{result['p50_ms']:>10.1f} {result['p99_ms']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
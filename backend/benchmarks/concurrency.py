@@ -0,0 +1,93 @@
+"""
+Throughput and tail latency of the authenticated read/write path under many
+concurrent clients, against a running server.
+
+    RATE_LIMIT_ENABLED=false uvicorn app.main:app --port 8000   # in another shell
+    python -m benchmarks.concurrency --url http://127.0.0.1:8000 [--clients 500] [--requests 20]
+
+Each client logs in once, then loops over a mix of report list/detail,
+comments, notification count and reactions. Run it once with the server at
+the commit before the async conversion and once at this one to compare the
+sync (threadpool) and async (AsyncSession) request paths.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.login_storm import percentile
+
+
+async def setup(client) -> tuple[dict, int]:
+    credentials = {"name": "Bench", "email": "bench@example.com", "password": "bench-password"}
+    await client.post("/auth/register", json=credentials)
+    response = await client.post(
+        "/auth/login",
+        data={"username": credentials["email"], "password": credentials["password"]},
+    )
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await client.post(
+        "/reports/",
+        data={"title": "Bench", "description": "Benchmark report", "location": "Here"},
+        headers=headers,
+    )
+    response.raise_for_status()
+    return headers, response.json()["id"]
+
+
+async def run_client(client, headers: dict, report_id: int, count: int, latencies: list, errors: list):
+    steps = [
+        ("GET", "/reports/public", None),
+        ("GET", f"/reports/public/{report_id}", None),
+        ("GET", f"/reports/{report_id}/comments", None),
+        ("GET", "/notifications/unread-count", None),
+        ("POST", f"/reports/{report_id}/reaction", {"type": "like"}),
+    ]
+    for i in range(count):
+        method, path, data = steps[i % len(steps)]
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, data=data, headers=headers)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except Exception as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def main(url: str, clients: int, requests: int):
+    import httpx
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        headers, report_id = await setup(client)
+
+        latencies: list[float] = []
+        errors: list = []
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            run_client(client, headers, report_id, requests, latencies, errors)
+            for _ in range(clients)
+        ))
+        elapsed = time.perf_counter() - start
+
+    print(f"{clients} clients x {requests} requests in {elapsed:.1f} s")
+    print(f"throughput {len(latencies) / elapsed:8.1f} req/s   errors {len(errors)}")
+    if latencies:
+        print(
+            f"latency    p50={statistics.median(latencies):7.1f} ms  "
+            f"p95={percentile(latencies, 95):7.1f} ms  "
+            f"p99={percentile(latencies, 99):7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.clients, args.requests))
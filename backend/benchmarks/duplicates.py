@@ -0,0 +1,96 @@
+"""
+Near-duplicate photo lookup: MultiIndexHash vs a linear scan of every hash.
+
+    python -m benchmarks.duplicates [--hashes 10000,100000] [--queries 1000]
+
+Fills the index with random 64-bit perceptual hashes and searches it with
+queries that are either a stored hash with up to DUPLICATE_MAX_DISTANCE
+bits flipped (a re-take of the same photo) or a fresh random hash (a new
+problem, the common case), reporting microseconds per lookup and how many
+stored hashes each lookup had to compare. Exits non-zero if the index
+returns different matches from the scan.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from app.ai.duplicates import HASH_BITS, MAX_DISTANCE, MultiIndexHash, hamming
+
+
+def linear_scan(hashes: dict[int, int], value: int, max_distance: int):
+    found = [(item_id, hamming(value, other)) for item_id, other in hashes.items()]
+    return sorted(
+        ((item_id, d) for item_id, d in found if d <= max_distance),
+        key=lambda item: (item[1], item[0]),
+    )
+
+
+def make_queries(rng: random.Random, hashes: dict[int, int], count: int) -> list[int]:
+    stored = list(hashes.values())
+    queries = []
+    for i in range(count):
+        if i % 4 == 0:
+            value = rng.choice(stored)
+            for bit in rng.sample(range(HASH_BITS), rng.randint(0, MAX_DISTANCE)):
+                value ^= 1 << bit
+        else:
+            value = rng.getrandbits(HASH_BITS)
+        queries.append(value)
+    return queries
+
+
+def timed(search, queries: list[int]) -> tuple[list, float]:
+    results, times = [], []
+    for value in queries:
+        begin = time.perf_counter()
+        results.append(search(value))
+        times.append((time.perf_counter() - begin) * 1e6)
+    return results, statistics.median(times)
+
+
+def main(sizes: list[int], queries: int):
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    print(f"{'hashes':>8}  {'method':<8}{'median us':>11}{'compared':>10}")
+    for size in sizes:
+        hashes = {item_id: rng.getrandbits(HASH_BITS) for item_id in range(size)}
+        index = MultiIndexHash()
+        for item_id, value in hashes.items():
+            index.add(item_id, value, now)
+        probe = make_queries(rng, hashes, queries)
+
+        # Candidates verified per lookup, i.e. entries the index had to look at
+        compared = []
+        original = index.entries
+
+        class Counting(dict):
+            def __getitem__(self, key):
+                compared[-1] += 1
+                return super().__getitem__(key)
+
+        index.entries = Counting(original)
+
+        def indexed(value):
+            compared.append(0)
+            return index.search(value, MAX_DISTANCE)
+
+        index_results, index_us = timed(indexed, probe)
+        scan_results, scan_us = timed(lambda v: linear_scan(hashes, v, MAX_DISTANCE), probe)
+
+        print(f"{size:>8}  {'index':<8}{index_us:>11.1f}{statistics.mean(compared):>10.1f}")
+        print(f"{size:>8}  {'scan':<8}{scan_us:>11.1f}{size:>10}")
+        if index_results != scan_results:
+            sys.exit(f"FAIL: index and scan disagree at {size} hashes")
+
+    print("OK: index matches the scan")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hashes", default="10000,100000")
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+    main([int(n) for n in args.hashes.split(",")], args.queries)
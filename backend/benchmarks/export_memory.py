@@ -0,0 +1,203 @@
+"""
+Peak memory of /reports/export: a small slice vs the whole table.
+
+    python -m benchmarks.export_memory [--reports 1000000] [--subset 10000]
+
+Seeds a throwaway SQLite database with `--reports` rows in a child process,
+then drives the ASGI app directly (no HTTP server, the response body is
+discarded as it is sent) and samples this process's RSS while each export
+runs. With the server-side cursor the full export should peak at roughly
+the same RSS as the `--subset` one; the run fails if growth exceeds
+`--max-growth-mb`.
+
+SQLite's page cache and mmap window also show up in RSS as the table is
+read; both are capped by configuration rather than row count, so they are
+pinned small here to keep the measurement about the export path.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+START = datetime(2025, 1, 1)
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE_SIZE
+
+
+class PeakRSS:
+    """Samples RSS in a background thread for the duration of the block."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_bytes())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.start = rss_bytes()
+        self.peak = self.start
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+
+def seed(count: int):
+    from sqlalchemy import insert
+    from app.database import engine
+    from app.models.report import Report
+    from app.models.user import User
+
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            insert(User).values(
+                name="Bench", email="bench@example.com", password_hash="x", role="admin"
+            )
+        ).inserted_primary_key[0]
+        for offset in range(0, count, 10_000):
+            conn.execute(insert(Report), [
+                {
+                    "title": f"Report {i}",
+                    "description": "Water pipe burst near the junction, road partly flooded.",
+                    "location": "Jalan Ampang",
+                    "status": ("pending", "in_progress", "resolved")[i % 3],
+                    "predicted_category": "flood",
+                    "confidence_score": 0.92,
+                    "image_path": f"uploads/{i:064x}.jpg",
+                    "user_id": user_id,
+                    "created_at": START + timedelta(seconds=i * 30),
+                }
+                for i in range(offset, min(offset + 10_000, count))
+            ])
+
+
+async def export(app, token: str, query: str) -> tuple[int, int]:
+    """Run one export through the ASGI app; returns (status, body bytes)."""
+    status = 0
+    received = 0
+
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive():
+        # The request has no body; after that, block like a client that
+        # stays connected (StreamingResponse listens for a disconnect)
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, received
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/reports/export",
+        "raw_path": b"/reports/export",
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"authorization", f"Bearer {token}".encode()),
+            (b"accept-encoding", b"identity"),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    await app(scope, receive, send)
+    finished.set()
+    return status, received
+
+
+def main(reports: int, subset: int, max_growth_mb: float):
+    from app.main import app
+    from app.core.jwt import create_access_token
+
+    token = create_access_token({"sub": "1", "role": "admin"})
+    subset_to = (START + timedelta(seconds=(subset - 1) * 30)).date()
+    runs = [
+        (f"first {subset_to:%Y-%m-%d}", f"created_to={subset_to}"),
+        ("all rows", ""),
+        ("all rows, ndjson", "format=ndjson"),
+    ]
+
+    # Warm up (first connection, lazy imports) outside the measurements
+    asyncio.run(export(app, token, runs[0][1]))
+
+    print(f"{reports} reports")
+    print(f"{'export':<28}{'MB sent':>10}{'seconds':>10}{'peak +MB':>10}")
+    growth = []
+    for label, query in runs:
+        with PeakRSS() as rss:
+            begin = time.perf_counter()
+            status, received = asyncio.run(export(app, token, query))
+            elapsed = time.perf_counter() - begin
+        assert status == 200, status
+        grown = (rss.peak - rss.start) / 2**20
+        growth.append(grown)
+        print(f"{label:<28}{received / 2**20:>10.1f}{elapsed:>10.1f}{grown:>10.1f}")
+
+    worst = max(growth)
+    if worst > max_growth_mb:
+        sys.exit(f"FAIL: peak RSS grew {worst:.1f} MB (limit {max_growth_mb} MB)")
+    print(f"OK: peak RSS growth {worst:.1f} MB, within {max_growth_mb} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=1_000_000)
+    parser.add_argument("--subset", type=int, default=10_000)
+    parser.add_argument("--max-growth-mb", type=float, default=32)
+    parser.add_argument("--seed-only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed_only:
+        # Child process: its memory never counts against the export
+        import app.main  # noqa: F401  (runs the migrations)
+        seed(args.reports)
+        sys.exit()
+
+    os.environ.setdefault("SQLITE_MMAP_SIZE", "0")
+    os.environ.setdefault("SQLITE_CACHE_SIZE_KB", "8192")
+
+    # The app uses ./dev.db; keep it out of the checkout
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.makedirs("uploads")
+        begin = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.export_memory", "--seed-only",
+             "--reports", str(args.reports)],
+            check=True,
+            env={**os.environ, "PYTHONPATH": backend},
+        )
+        print(f"seeded in {time.perf_counter() - begin:.1f} s")
+        main(args.reports, args.subset, args.max_growth_mb)
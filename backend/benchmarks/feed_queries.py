@@ -0,0 +1,147 @@
+"""
+SQL statements and HTTP requests per feed page: /reports/feed vs the old
+per-card fan-out (GET /reports/public, then /reactions and /comments for
+every card).
+
+    python -m benchmarks.feed_queries [--reports 300] [--comments 8]
+
+Runs the real app in-process (httpx ASGI transport) against a throwaway
+SQLite database, with the response cache cleared before every page so each
+one is built from the database. Statements are counted on the engine.
+
+Exits non-zero if /reports/feed issues a different number of statements
+for different page sizes, i.e. if it has regressed to N+1.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+PAGE_SIZES = (5, 20, 50)
+
+
+def seed(reports: int, comments: int):
+    from sqlalchemy import insert
+    from app.database import engine
+    from app.models.comment import Comment
+    from app.models.reaction import Reaction
+    from app.models.report import Report
+    from app.models.user import User
+
+    rng = random.Random(7)
+    start = datetime.utcnow() - timedelta(days=30)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"name": f"User {i}", "email": f"user{i}@example.com", "password_hash": "x"}
+            for i in range(1, 51)
+        ])
+        conn.execute(insert(Report), [
+            {
+                "title": f"Report {i}",
+                "description": "Streetlight out at the junction.",
+                "location": "Jalan Ampang",
+                "status": "pending",
+                "user_id": rng.randint(1, 50),
+                "created_at": start + timedelta(minutes=i),
+                "comment_count": comments,
+            }
+            for i in range(reports)
+        ])
+        conn.execute(insert(Comment), [
+            {
+                "content": f"Comment {n} on report {report_id}",
+                "user_id": rng.randint(1, 50),
+                "report_id": report_id,
+                "created_at": start + timedelta(minutes=report_id, seconds=n),
+            }
+            for report_id in range(1, reports + 1)
+            for n in range(comments)
+        ])
+        conn.execute(insert(Reaction), [
+            {"type": rng.choice(("like", "dislike")), "user_id": user_id, "report_id": report_id}
+            for report_id in range(1, reports + 1)
+            for user_id in rng.sample(range(1, 51), 5)
+        ])
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+async def fan_out(client, limit: int) -> int:
+    page = (await client.get("/reports/public", params={"limit": limit})).json()
+    for item in page["items"]:
+        await client.get(f"/reports/{item['id']}/reactions")
+        await client.get(f"/reports/{item['id']}/comments")
+    return 1 + 2 * len(page["items"])
+
+
+async def feed(client, limit: int, headers: dict | None = None) -> int:
+    response = await client.get("/reports/feed", params={"limit": limit}, headers=headers)
+    response.raise_for_status()
+    assert len(response.json()["items"]) == limit
+    return 1
+
+
+async def main(reports: int, comments: int):
+    import httpx
+    from app.main import app
+    from app.database import async_engine
+    from app.core.jwt import create_access_token
+    from app.core.response_cache import response_cache
+
+    seed(reports, comments)
+    counter = StatementCounter(async_engine.sync_engine)
+    signed_in = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up: first connection, cached principal for the signed-in user
+        await feed(client, 1, signed_in)
+
+        print(f"{'page':>5}  {'path':<22}{'HTTP':>6}{'SQL':>6}{'ms':>9}")
+        statements = {"feed": set(), "feed, signed in": set()}
+        for limit in PAGE_SIZES:
+            runs = [
+                ("fan-out", lambda: fan_out(client, limit)),
+                ("feed", lambda: feed(client, limit)),
+                ("feed, signed in", lambda: feed(client, limit, signed_in)),
+            ]
+            for label, run in runs:
+                response_cache.clear()
+                counter.count = 0
+                begin = time.perf_counter()
+                requests = await run()
+                elapsed = (time.perf_counter() - begin) * 1000
+                if label in statements:
+                    statements[label].add(counter.count)
+                print(f"{limit:>5}  {label:<22}{requests:>6}{counter.count:>6}{elapsed:>9.1f}")
+
+    for label, counts in statements.items():
+        if len(counts) != 1:
+            sys.exit(f"FAIL: {label} statements vary with page size: {sorted(counts)}")
+    print("OK: feed statements are constant across page sizes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=300)
+    parser.add_argument("--comments", type=int, default=8)
+    args = parser.parse_args()
+
+    # The app uses ./dev.db and ./uploads; keep them out of the checkout
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.makedirs("uploads")
+        asyncio.run(main(args.reports, args.comments))
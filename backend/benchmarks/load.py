@@ -0,0 +1,353 @@
+"""
+Scripted load scenarios with per-endpoint throughput and latency, and a JSON
+baseline to diff later runs against.
+
+    python -m benchmarks.load [--scenarios feed,create,reactions,admin]
+                              [--clients 20] [--duration 10]
+                              [--save baseline.json] [--compare baseline.json]
+
+By default the app runs in-process (httpx ASGI transport, lifespan included)
+against a throwaway database filled by benchmarks.seed (`--users`,
+`--reports`). With `--url` it drives a running server instead. That server
+must be seeded with `python -m benchmarks.seed` and started with
+RATE_LIMIT_ENABLED=false. In-process, a response only completes after its
+background tasks (thumbnails, geocoding) have run, so report creation reads
+slower than it would over a real server.
+
+Scenarios; each client loops through its scenario until `--duration` is up:
+  feed       anonymous and signed-in feed pages following the cursor, then
+             one report's detail and comments
+  create     report creation with a unique JPEG upload
+  reactions  every client likes/dislikes the same few hot reports
+  admin      analytics dashboard, full-text search and the admin report list
+
+For each endpoint (method + route template) it prints requests/s and
+p50/p95/p99. `--compare` flags endpoints whose p95 grew, or whose throughput
+fell, by more than `--tolerance` (default 25%), and exits 1 if any did.
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from benchmarks.login_storm import percentile
+from benchmarks.seed import ADMIN_EMAIL, PASSWORD, user_email
+
+SCENARIOS = ("feed", "create", "reactions", "admin")
+HOT_REPORTS = 5
+SEARCH_TERMS = ("pothole", "flood", "streetlight", "drain", "dark")
+
+
+class Recorder:
+    """Latency samples and errors per endpoint label."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+
+    async def request(self, client, label: str, method: str, url: str, **kwargs):
+        begin = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception:
+            self.errors[label] += 1
+            return None
+        self.samples[label].append((time.perf_counter() - begin) * 1000)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+
+def sample_images(count: int = 8) -> list[bytes]:
+    from PIL import Image
+
+    rng = random.Random(3)
+    images = []
+    for _ in range(count):
+        image = Image.new("RGB", (1024, 768), tuple(rng.randrange(256) for _ in range(3)))
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=85)
+        images.append(buffer.getvalue())
+    return images
+
+
+async def login(client, email: str) -> dict:
+    response = await client.post("/auth/login", data={"username": email, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+# One iteration of each scenario
+
+async def feed(client, rec: Recorder, headers: dict, shared: dict, rng: random.Random):
+    signed_in = rng.random() < 0.5
+    cursor = None
+    items = []
+    for _ in range(rng.randint(1, 3)):
+        params = {"cursor": cursor} if cursor else {}
+        response = await rec.request(
+            client, "GET /reports/feed", "GET", "/reports/feed",
+            params=params, headers=headers if signed_in else None,
+        )
+        if response is None or response.status_code != 200:
+            return
+        page = response.json()
+        items = page["items"] or items
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    if items:
+        report_id = rng.choice(items)["id"]
+        await rec.request(
+            client, "GET /reports/public/{report_id}", "GET", f"/reports/public/{report_id}"
+        )
+        await rec.request(
+            client, "GET /reports/{report_id}/comments", "GET", f"/reports/{report_id}/comments"
+        )
+
+
+async def create(client, rec: Recorder, headers: dict, shared: dict, rng: random.Random):
+    # Trailing bytes make every upload distinct (content-addressed storage)
+    image = rng.choice(shared["images"]) + os.urandom(16)
+    await rec.request(
+        client, "POST /reports/", "POST", "/reports/",
+        data={
+            "title": "Pothole on the main road",
+            "description": "Deep pothole in the left lane, cars swerving around it.",
+            "location": rng.choice(("Bangsar", "Cheras", "Petaling Jaya", "Kepong")),
+        },
+        files={"image": ("pothole.jpg", image, "image/jpeg")},
+        headers=headers,
+    )
+
+
+async def reactions(client, rec: Recorder, headers: dict, shared: dict, rng: random.Random):
+    report_id = rng.choice(shared["hot_reports"])
+    await rec.request(
+        client, "POST /reports/{report_id}/reaction", "POST", f"/reports/{report_id}/reaction",
+        data={"type": rng.choice(("like", "dislike"))},
+        headers=headers,
+    )
+
+
+async def admin(client, rec: Recorder, headers: dict, shared: dict, rng: random.Random):
+    headers = shared["admin_headers"]
+    for path in (
+        "/analytics/summary",
+        "/analytics/timeseries",
+        "/analytics/categories",
+        "/analytics/resolution",
+        "/analytics/sla",
+    ):
+        await rec.request(client, f"GET {path}", "GET", path, headers=headers)
+    await rec.request(
+        client, "GET /reports/search", "GET", "/reports/search",
+        params={"q": rng.choice(SEARCH_TERMS)}, headers=headers,
+    )
+    # The admin list returns every report; hit it less often
+    if rng.random() < 0.1:
+        await rec.request(client, "GET /reports/", "GET", "/reports/", headers=headers)
+
+
+async def run_scenario(client, name: str, clients: int, duration: float, shared: dict) -> dict:
+    step = globals()[name]
+    rec = Recorder()
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        rng = random.Random(index)
+        headers = shared["user_headers"][index % len(shared["user_headers"])]
+        while time.perf_counter() < deadline:
+            await step(client, rec, headers, shared, rng)
+
+    begin = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(clients)))
+    elapsed = time.perf_counter() - begin
+
+    return {
+        label: {
+            "requests": len(samples),
+            "errors": rec.errors[label],
+            "throughput": len(samples) / elapsed,
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+        }
+        for label, samples in sorted(rec.samples.items())
+    }
+
+
+async def setup(client, clients: int) -> dict:
+    # Distinct users so per-user work (reactions, own reports) is spread out
+    user_headers = []
+    for offset in range(0, clients, 8):
+        user_headers += await asyncio.gather(*(
+            login(client, user_email(user_id))
+            for user_id in range(2 + offset, 2 + min(offset + 8, clients))
+        ))
+    feed_page = (await client.get("/reports/feed")).json()
+    return {
+        "user_headers": user_headers,
+        "admin_headers": await login(client, ADMIN_EMAIL),
+        "hot_reports": [item["id"] for item in feed_page["items"][:HOT_REPORTS]],
+        "images": sample_images(),
+    }
+
+
+async def run(args) -> dict:
+    import httpx
+
+    results = {}
+
+    async def drive(client):
+        shared = await setup(client, args.clients)
+        for name in args.scenarios:
+            print(f"{name}: {args.clients} clients for {args.duration:g} s", flush=True)
+            results[name] = await run_scenario(client, name, args.clients, args.duration, shared)
+
+    limits = httpx.Limits(max_connections=args.clients * 2)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+            await drive(client)
+    else:
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=60
+            ) as client:
+                await drive(client)
+    return results
+
+
+def print_results(results: dict):
+    print(f"\n{'endpoint':<42}{'req':>7}{'err':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, endpoints in results.items():
+        print(f"[{name}]")
+        for label, stats in endpoints.items():
+            print(
+                f"  {label:<40}{stats['requests']:>7}{stats['errors']:>6}"
+                f"{stats['throughput']:>9.1f}{stats['p50']:>9.1f}"
+                f"{stats['p95']:>9.1f}{stats['p99']:>9.1f}"
+            )
+    print("latencies in ms")
+
+
+def compare(baseline: dict, results: dict, tolerance: float) -> list[str]:
+    """Print the change per endpoint; returns the regressed ones."""
+    regressions = []
+    print(f"\n{'vs baseline':<42}{'p95':>10}{'change':>9}{'req/s':>10}{'change':>9}")
+    for name, endpoints in results.items():
+        for label, stats in endpoints.items():
+            before = baseline.get("results", {}).get(name, {}).get(label)
+            if before is None:
+                continue
+            p95 = stats["p95"] / before["p95"] - 1 if before["p95"] else 0
+            throughput = stats["throughput"] / before["throughput"] - 1 if before["throughput"] else 0
+            regressed = p95 > tolerance or throughput < -tolerance
+            if regressed:
+                regressions.append(f"{name} {label}")
+            print(
+                f"  {label:<40}{stats['p95']:>10.1f}{p95:>+9.0%}"
+                f"{stats['throughput']:>10.1f}{throughput:>+9.0%}"
+                f"{'  REGRESSED' if regressed else ''}"
+            )
+    return regressions
+
+
+def metadata(args) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "target": args.url or "in-process",
+        "clients": args.clients,
+        "duration": args.duration,
+        "users": args.users,
+        "reports": args.reports,
+    }
+
+
+def main(args):
+    results = asyncio.run(run(args))
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"meta": metadata(args), "results": results}, f, indent=2)
+        print(f"\nsaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.tolerance)
+        if regressions:
+            sys.exit(f"\n{len(regressions)} endpoint(s) regressed beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="a running, seeded server; default: in-process")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10, help="seconds per scenario")
+    parser.add_argument("--users", type=int, default=500, help="in-process seed size")
+    parser.add_argument("--reports", type=int, default=10_000, help="in-process seed size")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--verbose", action="store_true", help="show the slow query log")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if args.clients >= args.users:
+        parser.error("--clients must be smaller than --users")
+    # Paths in --save/--compare are relative to where the command was run
+    for name in ("save", "compare"):
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+
+    if args.url:
+        main(args)
+    else:
+        # Many clients share one address; measure the app, not the limiter
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+        if not args.verbose:
+            # Lock waits under the write scenarios would flood the output
+            logging.getLogger("app.sql").setLevel(logging.ERROR)
+
+        # The app uses ./dev.db and ./uploads; keep them out of the checkout
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            os.makedirs("uploads")
+            from app.migrations import run_migrations
+            from benchmarks.seed import seed
+
+            run_migrations()
+            begin = time.perf_counter()
+            seed(users=args.users, reports=args.reports)
+            print(f"seeded {args.users} users, {args.reports} reports "
+                  f"in {time.perf_counter() - begin:.1f} s")
+            main(args)
@@ -0,0 +1,92 @@
+"""
+Latency of non-auth endpoints while a burst of logins is in flight.
+
+    python -m benchmarks.login_storm [--logins 200] [--probes 200]
+
+Runs the real app in-process (httpx ASGI transport) against a throwaway
+SQLite database, measures GET /health and GET /reports/public latency
+alone, then again while `--logins` concurrent logins are being verified.
+With hashing on its own bounded pool the two runs should look the same.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[max(0, int(len(values) * pct / 100) - 1)]
+
+
+async def probe(client, paths: list[str], count: int) -> list[float]:
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        response = await client.get(paths[i % len(paths)])
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def login(client):
+    response = await client.post(
+        "/auth/login",
+        data={"username": "storm@example.com", "password": "storm-password"},
+    )
+    return response.status_code
+
+
+def summary(label: str, latencies: list[float]):
+    print(
+        f"{label:<22} p50={statistics.median(latencies):7.1f} ms  "
+        f"p95={percentile(latencies, 95):7.1f} ms  "
+        f"p99={percentile(latencies, 99):7.1f} ms"
+    )
+
+
+async def main(logins: int, probes: int):
+    import httpx
+    from app.main import app
+
+    paths = ["/health", "/reports/public"]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json={
+            "name": "Storm",
+            "email": "storm@example.com",
+            "password": "storm-password",
+        })
+
+        summary("idle", await probe(client, paths, probes))
+
+        start = time.perf_counter()
+        storm = asyncio.gather(*(login(client) for _ in range(logins)))
+        latencies = await probe(client, paths, probes)
+        statuses = await storm
+        elapsed = time.perf_counter() - start
+
+        summary(f"during {logins} logins", latencies)
+        print(
+            f"logins: {statuses.count(200)} ok, {statuses.count(503)} shed, "
+            f"{logins / elapsed:.1f}/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--probes", type=int, default=200)
+    args = parser.parse_args()
+
+    # Every login comes from one address; measure the hasher, not the limiter
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    # The app uses ./dev.db and ./uploads; keep them out of the checkout
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.makedirs("uploads")
+        asyncio.run(main(args.logins, args.probes))
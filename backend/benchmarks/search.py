@@ -0,0 +1,138 @@
+"""
+Full-text search vs LIKE '%...%' over a synthetic reports table.
+
+    python -m benchmarks.search [--reports 100000] [--runs 20]
+
+Builds a throwaway SQLite database through the real migrations (so the FTS5
+table and triggers are the ones the app uses), bulk-loads `--reports` rows,
+then times the first page of /reports/search's ranked query against
+substring scans for common, uncommon and rare terms:
+
+  like all   every LIKE match (what ranking or a total count needs)
+  like page  the first LIMIT matches by date; it can stop early, so it is
+             only competitive for terms found in a large share of reports
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+WORDS = (
+    "road street junction lane bridge drain pipe water flood pothole crack "
+    "light lamp pole signal sign tree branch fallen rubbish bin waste smell "
+    "noise park playground bench wall graffiti fence school market bus stop "
+    "traffic jam accident leak burst sewage blocked broken damaged dark "
+    "dangerous near behind opposite beside morning night weekend again"
+).split()
+LOCATIONS = [
+    f"Jalan {name} {n}"
+    for name in ("Ampang", "Bukit", "Tun Razak", "Klang", "Cheras")
+    for n in range(1, 41)
+]
+# Planted at known frequencies so every query has a predictable match count
+PLANTED = {"sinkhole": 0.01, "landslide": 0.0005, "wildfire": 0.00005}
+QUERIES = ("water", "sinkhole", "landslide", "wildfire")
+
+
+def sentence(rng: random.Random, length: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(length)]
+    for word, frequency in PLANTED.items():
+        if rng.random() < frequency:
+            words[rng.randrange(length)] = word
+    return " ".join(words)
+
+
+def seed(count: int):
+    from sqlalchemy import insert
+    from app.database import engine
+    from app.models.report import Report
+    from app.models.user import User
+
+    rng = random.Random(42)
+    start = datetime.utcnow() - timedelta(days=365)
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            insert(User).values(name="Bench", email="bench@example.com", password_hash="x")
+        ).inserted_primary_key[0]
+        for offset in range(0, count, 5000):
+            conn.execute(insert(Report), [
+                {
+                    "title": sentence(rng, 4).capitalize(),
+                    "description": sentence(rng, 30),
+                    "location": rng.choice(LOCATIONS),
+                    "status": rng.choice(("pending", "in_progress", "resolved")),
+                    "user_id": user_id,
+                    "created_at": start + timedelta(seconds=i * 300),
+                }
+                for i in range(offset, min(offset + 5000, count))
+            ])
+
+
+def timed(conn, stmt, runs: int) -> float:
+    latencies = []
+    for _ in range(runs):
+        begin = time.perf_counter()
+        conn.execute(stmt).all()
+        latencies.append((time.perf_counter() - begin) * 1000)
+    return statistics.median(latencies)
+
+
+def main(reports: int, runs: int, limit: int = 20):
+    from sqlalchemy import func, or_, select
+    from app.database import engine
+    from app.models.report import Report
+    from app.core.search import search_matches
+
+    begin = time.perf_counter()
+    seed(reports)
+    print(f"seeded {reports} reports in {time.perf_counter() - begin:.1f} s\n")
+
+    print(
+        f"{'query':<12}{'matches':>9}{'fts ms':>10}{'like all':>10}"
+        f"{'like page':>11}{'vs all':>9}"
+    )
+    with engine.connect() as conn:
+        for term in QUERIES:
+            matches = search_matches("sqlite", term)
+            fts = (
+                select(Report, matches.c.score)
+                .join(matches, Report.id == matches.c.id)
+                .order_by(matches.c.score.desc(), Report.id.desc())
+                .limit(limit)
+            )
+            pattern = f"%{term}%"
+            like = (
+                select(Report)
+                .where(or_(
+                    Report.title.like(pattern),
+                    Report.description.like(pattern),
+                    Report.location.like(pattern),
+                ))
+                .order_by(Report.created_at.desc(), Report.id.desc())
+            )
+            total = conn.execute(select(func.count()).select_from(matches)).scalar()
+
+            fts_ms = timed(conn, fts, runs)
+            like_all_ms = timed(conn, like, runs)
+            like_page_ms = timed(conn, like.limit(limit), runs)
+            print(
+                f"{term:<12}{total:>9}{fts_ms:>10.2f}{like_all_ms:>10.2f}"
+                f"{like_page_ms:>11.2f}{like_all_ms / fts_ms:>8.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    # The app uses ./dev.db; keep it out of the checkout
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.makedirs("uploads")
+        import app.main  # noqa: F401  (runs the migrations)
+        main(args.reports, args.runs)
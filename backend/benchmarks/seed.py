@@ -0,0 +1,340 @@
+"""
+Bulk synthetic data for benchmarks and load tests.
+
+    python -m benchmarks.seed [--users 1000] [--reports 20000] [--comments 3]
+                              [--reactions 8] [--images 40] [--days 180]
+
+Runs the migrations, then fills the app's database (DATABASE_URL, ./dev.db by
+default; it must not have any reports yet) with executemany batches.
+`--comments` and `--reactions` are averages per report. Every user's password
+is `bench-password`. User 1, admin@bench.example, is an admin; the rest are
+user<N>@bench.example.
+
+The data is skewed like a real community feed:
+- a Zipf-like minority of users files most reports, comments and reactions
+- comments and reactions pile onto a few popular, mostly recent reports
+- a few places get most reports
+
+Data the app normally maintains as it goes is written to match:
+- report counters and resolved_at
+- status history and time-in-state sketches
+- the materialized analytics
+- coalesced notifications
+- geohashes and image derivatives
+- FTS rows, through the triggers
+
+`python -m app.report_stats check` passes on the result.
+"""
+import argparse
+import hashlib
+import io
+import math
+import os
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+PASSWORD = "bench-password"
+ADMIN_EMAIL = "admin@bench.example"
+BATCH_SIZE = 5000
+
+CATEGORIES = {
+    # category: (weight, words used in titles and descriptions)
+    "road_damage": (0.35, "pothole crack road surface sinking lane junction tar"),
+    "streetlight": (0.25, "streetlight lamp dark flickering pole bulb night"),
+    "flood": (0.2, "flood water drain blocked overflow puddle rain"),
+    "other": (0.2, "rubbish bin graffiti fallen tree branch noise smell"),
+}
+FILLER = "near the by opposite behind since yesterday again very bad dangerous please fix".split()
+STATUS_WEIGHTS = {"pending": 0.3, "in_progress": 0.2, "resolved": 0.5}
+IMAGE_SHARE = 0.7
+LIKE_SHARE = 0.8
+
+
+def user_email(user_id: int) -> str:
+    return ADMIN_EMAIL if user_id == 1 else f"user{user_id}@bench.example"
+
+
+def zipf_weights(count: int, rng: random.Random, s: float = 1.1) -> list[float]:
+    """Zipf weights over `count` items, in random order."""
+    weights = [1 / (rank + 1) ** s for rank in range(count)]
+    rng.shuffle(weights)
+    return weights
+
+
+def after(start: datetime, mean_seconds: float, rng: random.Random, now: datetime) -> datetime | None:
+    """An exponentially distributed moment after `start`, or None if in the future."""
+    moment = start + timedelta(seconds=rng.expovariate(1 / mean_seconds))
+    return moment if moment <= now else None
+
+
+def make_images(count: int, rng: random.Random) -> list[tuple[str, str, str]]:
+    """Write `count` distinct JPEGs (plus derivatives) to the upload dir."""
+    from PIL import Image, ImageDraw
+    from app.core.uploads import UPLOAD_DIR
+    from app.core.thumbnails import render_derivatives
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    images = []
+    for _ in range(count):
+        image = Image.new("RGB", (1280, 960), tuple(rng.randrange(256) for _ in range(3)))
+        draw = ImageDraw.Draw(image)
+        for _ in range(12):
+            x, y = rng.randrange(1280), rng.randrange(960)
+            draw.ellipse(
+                (x, y, x + rng.randrange(50, 400), y + rng.randrange(50, 400)),
+                fill=tuple(rng.randrange(256) for _ in range(3)),
+            )
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=85)
+        data = buffer.getvalue()
+
+        # Content-addressed, like real uploads
+        path = f"{UPLOAD_DIR}/{hashlib.sha256(data).hexdigest()}.jpg"
+        with open(path, "wb") as f:
+            f.write(data)
+        derivatives = render_derivatives(path)
+        images.append((path, derivatives["thumb"], derivatives["medium"]))
+    return images
+
+
+def insert_batches(conn, table, rows):
+    from sqlalchemy import insert
+
+    for offset in range(0, len(rows), BATCH_SIZE):
+        conn.execute(insert(table), rows[offset:offset + BATCH_SIZE])
+
+
+def seed(
+    users: int = 1000,
+    reports: int = 20_000,
+    comments: float = 3,
+    reactions: float = 8,
+    images: int = 40,
+    days: int = 180,
+    seed: int = 1,
+) -> dict:
+    """Fill the (empty) database; returns row counts per table."""
+    from sqlalchemy import func, select
+    from app.database import engine
+    from app.models.comment import Comment
+    from app.models.notification import Notification
+    from app.models.reaction import Reaction
+    from app.models.report import Report
+    from app.models.report_stats import ReportStateDuration
+    from app.models.report_status_event import ReportStatusEvent
+    from app.models.user import User
+    from app.core.geocoding import PLACES
+    from app.core.geohash import encode as geohash_encode
+    from app.core.notifications import COALESCE_SECONDS
+    from app.core.security import hash_password
+    from app.core.stats import UNCATEGORISED, rebuild_report_stats, sketch_bucket
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    start = now - timedelta(days=days)
+
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(Report)).scalar():
+            raise SystemExit("The database already has reports; seed an empty one")
+
+    password_hash = hash_password(PASSWORD)
+    names = [f"{first} {last}" for first in (
+        "Aina", "Ben", "Chong", "Devi", "Ethan", "Farah", "Gopal", "Hui", "Irfan", "Jia",
+    ) for last in ("Tan", "Lim", "Raj", "Ahmad", "Wong", "Lee", "Kumar", "Ong")]
+    user_rows = [
+        {
+            "id": user_id,
+            "name": names[user_id % len(names)],
+            "email": user_email(user_id),
+            "password_hash": password_hash,
+            "role": "admin" if user_id == 1 else "user",
+        }
+        for user_id in range(1, users + 1)
+    ]
+    user_ids = list(range(1, users + 1))
+    user_weights = zipf_weights(users, rng)
+    user_names = {row["id"]: row["name"] for row in user_rows}
+
+    # Reports, oldest first
+    created = sorted(start + timedelta(seconds=rng.uniform(0, days * 86400)) for _ in range(reports))
+    owners = rng.choices(user_ids, weights=user_weights, k=reports)
+    image_files = make_images(images, rng) if images else []
+    places = list(PLACES.items())
+    place_weights = zipf_weights(len(places), rng)
+    categories = list(CATEGORIES)
+    category_weights = [CATEGORIES[name][0] for name in categories]
+
+    report_rows, event_rows = [], []
+    durations = Counter()
+    for report_id, (created_at, owner) in enumerate(zip(created, owners), start=1):
+        category = confidence = None
+        image = thumb = medium = None
+        if image_files and rng.random() < IMAGE_SHARE:
+            image, thumb, medium = rng.choice(image_files)
+            category = rng.choices(categories, weights=category_weights)[0]
+            confidence = round(rng.uniform(0.55, 0.98), 2)
+        words = CATEGORIES[category or rng.choice(categories)][1].split()
+
+        place, (lat, lon) = rng.choices(places, weights=place_weights)[0]
+        latitude = longitude = geohash = None
+        if rng.random() < 0.9:
+            latitude = lat + rng.uniform(-0.01, 0.01)
+            longitude = lon + rng.uniform(-0.01, 0.01)
+            geohash = geohash_encode(latitude, longitude)
+
+        # Walk the status lifecycle; stop where "now" cuts it short
+        target = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0]
+        status, resolved_at = "pending", None
+        event_rows.append({
+            "report_id": report_id, "from_status": None, "to_status": "pending",
+            "changed_by": owner, "created_at": created_at,
+        })
+        entered = created_at
+        for step, mean_days in (("in_progress", 1), ("resolved", 3)):
+            if target == "pending" or (target == "in_progress" and step == "resolved"):
+                break
+            moment = after(entered, mean_days * 86400, rng, now)
+            if moment is None:
+                break
+            seconds = (moment - entered).total_seconds()
+            durations[(category or UNCATEGORISED, status, sketch_bucket(seconds))] += 1
+            event_rows.append({
+                "report_id": report_id, "from_status": status, "to_status": step,
+                "changed_by": 1, "created_at": moment,
+            })
+            status, entered = step, moment
+            if step == "resolved":
+                resolved_at = moment
+
+        report_rows.append({
+            "id": report_id,
+            "title": f"{rng.choice(words).capitalize()} {rng.choice(words)} at {place.title()}",
+            "description": " ".join(rng.choice(words + FILLER) for _ in range(rng.randint(8, 40))),
+            "location": place.title() if latitude is not None else "Near my house",
+            "latitude": latitude,
+            "longitude": longitude,
+            "geohash": geohash,
+            "status": status,
+            "predicted_category": category,
+            "confidence_score": confidence,
+            "image_path": image,
+            "thumb_path": thumb,
+            "medium_path": medium,
+            "user_id": owner,
+            "created_at": created_at,
+            "resolved_at": resolved_at,
+            "like_count": 0,
+            "dislike_count": 0,
+            "comment_count": 0,
+        })
+
+    # Popularity: Zipf, damped by age so recent reports draw most activity
+    popularity = [
+        weight * math.exp(-(now - row["created_at"]).days / 30)
+        for weight, row in zip(zipf_weights(reports, rng), report_rows)
+    ]
+    report_ids = [row["id"] for row in report_rows]
+    notifications = {}
+
+    def notify(report, actor_id, type, at):
+        if report["user_id"] == actor_id:
+            return
+        key = (report["user_id"], report["id"], type, int(at.timestamp()) // COALESCE_SECONDS)
+        note = notifications.get(key)
+        if note is None:
+            notifications[key] = note = {
+                "user_id": key[0], "report_id": key[1], "type": type, "bucket": key[3],
+                "actor_count": 0, "created_at": at,
+                "is_read": (now - at).days > 7 or rng.random() < 0.3,
+            }
+        note["actor_count"] += 1
+        if at >= note["created_at"]:
+            note.update(created_at=at, last_actor_id=actor_id, actor_name=user_names[actor_id])
+
+    comment_rows = []
+    for report_id, user_id in zip(
+        rng.choices(report_ids, weights=popularity, k=int(reports * comments)),
+        rng.choices(user_ids, weights=user_weights, k=int(reports * comments)),
+    ):
+        report = report_rows[report_id - 1]
+        at = after(report["created_at"], 86400, rng, now) or now
+        comment_rows.append({
+            "content": " ".join(rng.choice(FILLER) for _ in range(rng.randint(3, 20))).capitalize(),
+            "user_id": user_id,
+            "report_id": report_id,
+            "created_at": at,
+        })
+        report["comment_count"] += 1
+        notify(report, user_id, "comment", at)
+
+    reaction_rows = []
+    pairs = set()
+    wanted = min(int(reports * reactions), reports * users)
+    # Skew makes repeat pairs common; keep drawing (up to a bound) until
+    # enough distinct ones are found, since each user reacts once per report
+    for _ in range(10):
+        missing = wanted - len(pairs)
+        if missing <= 0:
+            break
+        draws = [
+            pair for pair in zip(
+                rng.choices(user_ids, weights=user_weights, k=missing),
+                rng.choices(report_ids, weights=popularity, k=missing),
+            )
+            if pair not in pairs
+        ]
+        pairs.update(draws)
+    for user_id, report_id in sorted(pairs, key=lambda pair: (pair[1], pair[0])):
+        report = report_rows[report_id - 1]
+        type = "like" if rng.random() < LIKE_SHARE else "dislike"
+        reaction_rows.append({"type": type, "user_id": user_id, "report_id": report_id})
+        report["like_count" if type == "like" else "dislike_count"] += 1
+        notify(report, user_id, type, after(report["created_at"], 86400, rng, now) or now)
+
+    with engine.begin() as conn:
+        insert_batches(conn, User, user_rows)
+        insert_batches(conn, Report, report_rows)
+        insert_batches(conn, ReportStatusEvent, event_rows)
+        insert_batches(conn, Comment, comment_rows)
+        insert_batches(conn, Reaction, reaction_rows)
+        insert_batches(conn, Notification, list(notifications.values()))
+        rebuild_report_stats(conn)
+        insert_batches(conn, ReportStateDuration, [
+            {"category": category, "state": state, "bucket": bucket, "count": count}
+            for (category, state, bucket), count in durations.items()
+        ])
+
+    return {
+        "users": len(user_rows),
+        "reports": len(report_rows),
+        "status events": len(event_rows),
+        "comments": len(comment_rows),
+        "reactions": len(reaction_rows),
+        "notifications": len(notifications),
+        "images": len(image_files),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--reports", type=int, default=20_000)
+    parser.add_argument("--comments", type=float, default=3, help="average per report")
+    parser.add_argument("--reactions", type=float, default=8, help="average per report")
+    parser.add_argument("--images", type=int, default=40, help="distinct image files")
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from app.migrations import run_migrations
+
+    run_migrations()
+    begin = time.perf_counter()
+    counts = seed(
+        args.users, args.reports, args.comments, args.reactions,
+        args.images, args.days, args.seed,
+    )
+    print(", ".join(f"{count} {name}" for name, count in counts.items()))
+    print(f"seeded in {time.perf_counter() - begin:.1f} s")
@@ -0,0 +1,131 @@
+"""
+Serialization cost of the list endpoints per `--rows` rows (default 10k).
+
+    python -m benchmarks.serialization [--rows 10000] [--runs 5]
+
+before  what the routes used to do: ORM entities, per-row ReportResponse
+        validation (response_model) or dicts through jsonable_encoder + json
+after   column-only rows straight into orjson (ORJSONResponse)
+
+Fetch and serialize are timed separately against an in-memory SQLite table.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+
+def timed(fn, runs: int) -> float:
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def seed(session, rows: int):
+    from app.models.report import Report
+    from app.models.user import User
+
+    session.add(User(id=1, name="Bench", email="bench@example.com", password_hash="x"))
+    start = datetime.utcnow() - timedelta(days=30)
+    session.add_all(
+        Report(
+            title=f"Report {i}",
+            description="Water pipe burst near the junction, road partly flooded.",
+            location="Jalan Ampang",
+            status="pending",
+            predicted_category="flood",
+            confidence_score=0.92,
+            image_path=f"uploads/{i:064x}.jpg",
+            thumb_path=f"uploads/{i:064x}.thumb.webp",
+            medium_path=f"uploads/{i:064x}.medium.webp",
+            user_id=1,
+            created_at=start + timedelta(seconds=i),
+        )
+        for i in range(rows)
+    )
+    session.commit()
+
+
+def main(rows: int, runs: int):
+    import json
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+    from sqlalchemy.pool import StaticPool
+
+    from app.database import Base
+    from app.models.report import Report
+    from app.models.user import User
+    from app.core.responses import ORJSONResponse, row_dicts
+    from app.routes.report import FEED_COLUMNS, REPORT_COLUMNS
+    from app.schemas.report import ReportResponse
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    seed(session, rows)
+
+    reports_adapter = TypeAdapter(list[ReportResponse])
+
+    def orm_reports():
+        session.expunge_all()
+        return session.scalars(select(Report)).all()
+
+    def column_reports():
+        return session.execute(select(*REPORT_COLUMNS)).all()
+
+    def feed_rows():
+        return session.execute(
+            select(*FEED_COLUMNS).join(User, Report.user_id == User.id)
+        ).all()
+
+    entities = orm_reports()
+    report_rows = column_reports()
+    feed = feed_rows()
+    feed_dicts = [row._asdict() for row in feed]  # what the route used to build
+
+    results = [
+        ("fetch /reports (ORM entities)", timed(orm_reports, runs)),
+        ("fetch /reports (columns)", timed(column_reports, runs)),
+        (
+            "serialize /reports before",
+            timed(lambda: reports_adapter.dump_json(
+                reports_adapter.validate_python(entities, from_attributes=True)
+            ), runs),
+        ),
+        (
+            "serialize /reports after",
+            timed(lambda: ORJSONResponse(row_dicts(report_rows)).body, runs),
+        ),
+        (
+            "serialize feed before",
+            timed(lambda: JSONResponse(jsonable_encoder(feed_dicts)).body, runs),
+        ),
+        (
+            "serialize feed after",
+            timed(lambda: ORJSONResponse(row_dicts(feed)).body, runs),
+        ),
+    ]
+
+    # Both paths must produce the same document
+    before = json.loads(JSONResponse(jsonable_encoder(feed_dicts)).body)
+    after = json.loads(ORJSONResponse(row_dicts(feed)).body)
+    assert before == after
+
+    print(f"{rows} rows, median of {runs} runs")
+    for label, ms in results:
+        print(f"  {label:<32}{ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.runs)
@@ -0,0 +1,19 @@
+"""
+The app opens ./dev.db and mounts ./uploads when it is imported, so the
+tests run it from a throwaway directory with its own database.
+
+    cd backend && python -m pytest
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+WORKDIR = tempfile.mkdtemp(prefix="cirs-tests-")
+os.chdir(WORKDIR)
+os.makedirs("uploads")
+os.environ["DATABASE_URL"] = f"sqlite:///{WORKDIR}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["RATE_LIMIT_ENABLED"] = "false"
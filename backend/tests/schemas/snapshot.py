@@ -0,0 +1,123 @@
+"""
+Dump a database created by a checkout of the backend, schema plus a few
+rows, to tests/schemas/v<version>.sql for test_migrations.py.
+
+    python tests/schemas/snapshot.py                    # this checkout
+    python tests/schemas/snapshot.py path/to/backend    # e.g. a git worktree
+
+Run it after adding a migration, so later migrations are tested against
+databases that stopped at that version.
+"""
+import importlib
+import os
+import pkgutil
+import sqlite3
+import sys
+import tempfile
+
+SCHEMAS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Only columns every version has had, so the same rows fit each schema
+SAMPLE_ROWS = [
+    "INSERT INTO users (id, name, email, password_hash, role) "
+    "VALUES (1, 'Aina', 'aina@example.com', 'x', 'user')",
+    "INSERT INTO users (id, name, email, password_hash, role) "
+    "VALUES (2, 'Ben', 'ben@example.com', 'x', 'admin')",
+    "INSERT INTO reports (id, title, description, location, status, user_id, image_path, created_at) "
+    "VALUES (1, 'Broken streetlight', 'Out since Monday', 'Jalan Ampang', 'pending', 1, "
+    "'uploads/streetlight.jpg', '2024-05-01 08:30:00.000000')",
+    "INSERT INTO reports (id, title, description, location, status, user_id, created_at) "
+    "VALUES (2, 'Pothole', 'Deep one', 'Lot 5, 7 Jalan Tun Razak', 'resolved', 2, "
+    "'2024-05-02 09:00:00.000000')",
+    "INSERT INTO comments (id, content, user_id, report_id, created_at) "
+    "VALUES (1, 'Same here', 2, 1, '2024-05-01 09:00:00.000000')",
+    "INSERT INTO reactions (id, type, user_id, report_id) VALUES (1, 'like', 2, 1)",
+    # Second precision, like rows from the old server default
+    "INSERT INTO notifications (id, user_id, actor_name, type, report_id, is_read, created_at) "
+    "VALUES (1, 1, 'Ben', 'like', 1, 0, '2024-05-01 09:05:00')",
+]
+
+
+def create_database(backend_dir: str):
+    """Create ./dev.db the way that checkout does on startup."""
+    sys.path.insert(0, backend_dir)
+    import app.models
+    from app.database import Base, engine
+
+    # Older checkouts registered the models from app.main, not app.models
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"app.models.{module.name}")
+
+    try:
+        from app.migrations import run_migrations
+    except ImportError:  # before versioned migrations
+        Base.metadata.create_all(bind=engine)
+    else:
+        run_migrations()
+    engine.dispose()
+
+
+def dump(conn: sqlite3.Connection) -> str:
+    """
+    Schema and rows as SQL. Unlike iterdump, virtual (full-text) tables are
+    recreated and rebuilt rather than written into sqlite_master directly.
+    """
+    objects = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master "
+        "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+    ).fetchall()
+    virtual = [name for _, name, sql in objects if sql.upper().startswith("CREATE VIRTUAL")]
+
+    def shadow(name):
+        return any(name.startswith(f"{table}_") for table in virtual)
+
+    lines = ["BEGIN TRANSACTION;"]
+    for kind, name, sql in objects:
+        if kind != "table" or name in virtual or shadow(name):
+            continue
+        lines.append(f"{sql};")
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{name}")')]
+        values = " || ',' || ".join(f'quote("{column}")' for column in columns)
+        for (row,) in conn.execute(f'SELECT {values} FROM "{name}" ORDER BY rowid'):
+            lines.append(f'INSERT INTO "{name}" VALUES({row});')
+
+    for _, name, sql in objects:
+        if name in virtual:
+            lines.append(f"{sql};")
+            lines.append(f"INSERT INTO {name} ({name}) VALUES ('rebuild');")
+
+    for kind, name, sql in objects:
+        if kind in ("index", "trigger") and not shadow(name):
+            lines.append(f"{sql};")
+    lines.append("COMMIT;")
+    return "\n".join(lines)
+
+
+def main(backend_dir: str):
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.makedirs("uploads")
+        create_database(os.path.abspath(backend_dir))
+
+        conn = sqlite3.connect("dev.db")
+        try:
+            for statement in SAMPLE_ROWS:
+                conn.execute(statement)
+            conn.commit()
+            version = 0
+            if conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'schema_version'"
+            ).fetchone():
+                version = conn.execute("SELECT version FROM schema_version").fetchone()[0]
+            sql = dump(conn)
+        finally:
+            conn.close()
+
+    path = os.path.join(SCHEMAS_DIR, f"v{version:02d}.sql")
+    with open(path, "w") as out:
+        out.write(sql + "\n")
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.dirname(SCHEMAS_DIR)))
@@ -0,0 +1,77 @@
+BEGIN TRANSACTION;
+CREATE TABLE schema_version (version INTEGER NOT NULL);
+INSERT INTO "schema_version" VALUES(3);
+CREATE TABLE users (
+	id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	email VARCHAR NOT NULL, 
+	password_hash VARCHAR NOT NULL, 
+	role VARCHAR, 
+	PRIMARY KEY (id)
+);
+INSERT INTO "users" VALUES(1,'Aina','aina@example.com','x','user');
+INSERT INTO "users" VALUES(2,'Ben','ben@example.com','x','admin');
+CREATE TABLE reports (
+	id INTEGER NOT NULL, 
+	title VARCHAR NOT NULL, 
+	description TEXT NOT NULL, 
+	status VARCHAR NOT NULL, 
+	predicted_category VARCHAR, 
+	confidence_score FLOAT, 
+	user_id INTEGER NOT NULL, 
+	location VARCHAR NOT NULL, 
+	image_path VARCHAR, 
+	created_at DATETIME, 
+	like_count INTEGER DEFAULT '0' NOT NULL, 
+	dislike_count INTEGER DEFAULT '0' NOT NULL, 
+	comment_count INTEGER DEFAULT '0' NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+INSERT INTO "reports" VALUES(1,'Broken streetlight','Out since Monday','pending',NULL,NULL,1,'Jalan Ampang','uploads/streetlight.jpg','2024-05-01 08:30:00.000000',0,0,0);
+INSERT INTO "reports" VALUES(2,'Pothole','Deep one','resolved',NULL,NULL,2,'Lot 5, 7 Jalan Tun Razak',NULL,'2024-05-02 09:00:00.000000',0,0,0);
+CREATE TABLE comments (
+	id INTEGER NOT NULL, 
+	content TEXT NOT NULL, 
+	user_id INTEGER NOT NULL, 
+	report_id INTEGER NOT NULL, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(report_id) REFERENCES reports (id)
+);
+INSERT INTO "comments" VALUES(1,'Same here',2,1,'2024-05-01 09:00:00.000000');
+CREATE TABLE reactions (
+	id INTEGER NOT NULL, 
+	type VARCHAR NOT NULL, 
+	user_id INTEGER NOT NULL, 
+	report_id INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	CONSTRAINT unique_user_report UNIQUE (user_id, report_id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(report_id) REFERENCES reports (id)
+);
+INSERT INTO "reactions" VALUES(1,'like',2,1);
+CREATE TABLE notifications (
+	id INTEGER NOT NULL, 
+	user_id INTEGER, 
+	actor_name VARCHAR NOT NULL, 
+	type VARCHAR NOT NULL, 
+	report_id INTEGER, 
+	is_read BOOLEAN, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(report_id) REFERENCES reports (id)
+);
+INSERT INTO "notifications" VALUES(1,1,'Ben','like',1,0,'2024-05-01 09:05:00');
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE INDEX ix_users_id ON users (id);
+CREATE INDEX ix_reports_id ON reports (id);
+CREATE INDEX ix_reports_created_at_id ON reports (created_at, id);
+CREATE INDEX ix_reports_status_created_at_id ON reports (status, created_at, id);
+CREATE INDEX ix_reports_user_id ON reports (user_id);
+CREATE INDEX ix_comments_report_id_created_at ON comments (report_id, created_at);
+CREATE INDEX ix_reactions_report_id_type ON reactions (report_id, type);
+CREATE INDEX ix_notifications_user_id_created_at ON notifications (user_id, created_at);
+COMMIT;
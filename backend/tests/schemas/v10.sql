@@ -0,0 +1,124 @@
+BEGIN TRANSACTION;
+CREATE TABLE schema_version (version INTEGER NOT NULL);
+INSERT INTO "schema_version" VALUES(10);
+CREATE TABLE users (
+	id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	email VARCHAR NOT NULL, 
+	password_hash VARCHAR NOT NULL, 
+	role VARCHAR, 
+	PRIMARY KEY (id)
+);
+INSERT INTO "users" VALUES(1,'Aina','aina@example.com','x','user');
+INSERT INTO "users" VALUES(2,'Ben','ben@example.com','x','admin');
+CREATE TABLE report_daily_stats (
+	day DATE NOT NULL, 
+	status VARCHAR NOT NULL, 
+	category VARCHAR NOT NULL, 
+	count INTEGER DEFAULT '0' NOT NULL, 
+	PRIMARY KEY (day, status, category)
+);
+CREATE TABLE report_resolution_stats (
+	day DATE NOT NULL, 
+	category VARCHAR NOT NULL, 
+	bucket INTEGER NOT NULL, 
+	count INTEGER DEFAULT '0' NOT NULL, 
+	PRIMARY KEY (day, category, bucket)
+);
+CREATE TABLE report_state_durations (
+	category VARCHAR NOT NULL, 
+	state VARCHAR NOT NULL, 
+	bucket INTEGER NOT NULL, 
+	count INTEGER DEFAULT '0' NOT NULL, 
+	PRIMARY KEY (category, state, bucket)
+);
+CREATE TABLE reports (
+	id INTEGER NOT NULL, 
+	title VARCHAR NOT NULL, 
+	description TEXT NOT NULL, 
+	status VARCHAR NOT NULL, 
+	predicted_category VARCHAR, 
+	confidence_score FLOAT, 
+	user_id INTEGER NOT NULL, 
+	location VARCHAR NOT NULL, 
+	image_path VARCHAR, 
+	thumb_path VARCHAR, 
+	medium_path VARCHAR, 
+	image_phash VARCHAR(16), 
+	duplicate_of_id INTEGER, 
+	created_at DATETIME, 
+	resolved_at DATETIME, 
+	like_count INTEGER DEFAULT '0' NOT NULL, 
+	dislike_count INTEGER DEFAULT '0' NOT NULL, 
+	comment_count INTEGER DEFAULT '0' NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(duplicate_of_id) REFERENCES reports (id)
+);
+INSERT INTO "reports" VALUES(1,'Broken streetlight','Out since Monday','pending',NULL,NULL,1,'Jalan Ampang','uploads/streetlight.jpg',NULL,NULL,NULL,NULL,'2024-05-01 08:30:00.000000',NULL,0,0,0);
+INSERT INTO "reports" VALUES(2,'Pothole','Deep one','resolved',NULL,NULL,2,'Lot 5, 7 Jalan Tun Razak',NULL,NULL,NULL,NULL,NULL,'2024-05-02 09:00:00.000000',NULL,0,0,0);
+CREATE TABLE comments (
+	id INTEGER NOT NULL, 
+	content TEXT NOT NULL, 
+	user_id INTEGER NOT NULL, 
+	report_id INTEGER NOT NULL, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(report_id) REFERENCES reports (id)
+);
+INSERT INTO "comments" VALUES(1,'Same here',2,1,'2024-05-01 09:00:00.000000');
+CREATE TABLE reactions (
+	id INTEGER NOT NULL, 
+	type VARCHAR NOT NULL, 
+	user_id INTEGER NOT NULL, 
+	report_id INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	CONSTRAINT unique_user_report UNIQUE (user_id, report_id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(report_id) REFERENCES reports (id)
+);
+INSERT INTO "reactions" VALUES(1,'like',2,1);
+CREATE TABLE notifications (
+	id INTEGER NOT NULL, 
+	user_id INTEGER, 
+	actor_name VARCHAR NOT NULL, 
+	type VARCHAR NOT NULL, 
+	report_id INTEGER, 
+	is_read BOOLEAN, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	bucket INTEGER, 
+	actor_count INTEGER DEFAULT '1' NOT NULL, 
+	last_actor_id INTEGER, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(report_id) REFERENCES reports (id)
+);
+INSERT INTO "notifications" VALUES(1,1,'Ben','like',1,0,'2024-05-01 09:05:00',NULL,1,NULL);
+CREATE TABLE report_status_events (
+	id INTEGER NOT NULL, 
+	report_id INTEGER NOT NULL, 
+	from_status VARCHAR, 
+	to_status VARCHAR NOT NULL, 
+	changed_by INTEGER, 
+	created_at DATETIME NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(report_id) REFERENCES reports (id) ON DELETE CASCADE, 
+	FOREIGN KEY(changed_by) REFERENCES users (id)
+);
+CREATE INDEX ix_users_id ON users (id);
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE INDEX ix_reports_status_created_at_id ON reports (status, created_at, id);
+CREATE INDEX ix_reports_duplicate_of_id ON reports (duplicate_of_id);
+CREATE INDEX ix_reports_id ON reports (id);
+CREATE INDEX ix_reports_user_id ON reports (user_id);
+CREATE INDEX ix_reports_created_at_id ON reports (created_at, id);
+CREATE INDEX ix_reports_image_path ON reports (image_path);
+CREATE INDEX ix_comments_report_id_created_at ON comments (report_id, created_at);
+CREATE INDEX ix_reactions_report_id_type ON reactions (report_id, type);
+CREATE INDEX ix_notifications_user_id_created_at ON notifications (user_id, created_at);
+CREATE UNIQUE INDEX ux_notifications_coalesce ON notifications (user_id, report_id, type, bucket);
+CREATE INDEX ix_notifications_user_id_is_read ON notifications (user_id, is_read);
+CREATE INDEX ix_report_status_events_report_id_created_at ON report_status_events (report_id, created_at);
+CREATE INDEX ix_report_status_events_to_status_created_at ON report_status_events (to_status, created_at);
+COMMIT;
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import select
+
+from app.ai import classifier
+from app.ai.batching import queue_classification
+from app.core.jobs import CLASSIFY, run_next_job
+from app.core.stats import apply_report_stats_sync, check_report_stats, report_facts
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.models.job import Job
+from app.models.report import Report
+from app.models.user import User
+
+
+def test_classification_is_a_durable_job():
+    run_migrations(engine)
+    with SessionLocal() as db:
+        user = User(name="classify", email="classify@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        report = Report(title="Water", description="d", location="l",
+                        user_id=user.id, image_path="uploads/missing.jpg")
+        db.add(report)
+        db.flush()
+        apply_report_stats_sync(db, None, report_facts(report))
+        queue_classification(db, report.id, report.image_path, "flood.jpg")
+        db.commit()
+        report_id = report.id
+
+    # Stored with the report, not held in memory until a worker gets to it
+    with SessionLocal() as db:
+        job = db.scalar(select(Job).where(Job.kind == CLASSIFY))
+        assert job.payload["report_id"] == report_id and job.status == "pending"
+
+    while run_next_job():
+        pass
+
+    with SessionLocal() as db:
+        assert db.get(Report, report_id).predicted_category == "flood"
+        assert db.get(Job, job.id).status == "done"
+        assert check_report_stats(db) == []
+
+
+def test_missing_model_fails_when_required(monkeypatch, tmp_path):
+    monkeypatch.setattr(classifier, "MODEL_PATH", str(tmp_path / "missing.joblib"))
+
+    monkeypatch.setenv("CLASSIFIER_BACKEND", "feature_model")
+    with pytest.raises(RuntimeError, match="python -m app.ai.train"):
+        classifier.load_classifier()
+
+    monkeypatch.delenv("CLASSIFIER_BACKEND")
+    assert isinstance(classifier.load_classifier(), classifier.FilenameClassifier)
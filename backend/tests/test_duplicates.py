@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from PIL import Image
+
+from app.ai.duplicates import MultiIndexHash, detect_duplicates, duplicate_index
+from app.core.stats import apply_report_stats_sync, report_facts
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.models.report import Report
+from app.models.user import User
+
+
+def test_evict_drops_entries_older_than_the_window():
+    index = MultiIndexHash()
+    now = datetime.utcnow()
+    index.add(1, 0xFF, now - timedelta(days=10))
+    index.add(2, 0xFF, now)
+    # Re-adding moves an entry's age; its old heap slot must not evict it
+    index.add(3, 0xFF, now - timedelta(days=10))
+    index.add(3, 0xFF, now)
+
+    assert index.evict(before=now - timedelta(days=7)) == 1
+    assert [item_id for item_id, _ in index.search(0xFF, 0)] == [2, 3]
+
+
+def _photo(path: str) -> str:
+    img = Image.new("L", (90, 80))
+    img.putdata([(x * 7 + y * 3) % 256 for y in range(80) for x in range(90)])
+    img.save(path)
+    return path
+
+
+def test_only_reports_nearby_are_duplicates(tmp_path):
+    run_migrations(engine)
+    photo = _photo(str(tmp_path / "pothole.png"))
+    with SessionLocal() as db:
+        user = User(name="dup", email="dup@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        places = {"first": (3.1390, 101.6869), "next door": (3.1391, 101.6870),
+                  "far away": (3.2000, 101.7000)}
+        reports = {}
+        for name, (lat, lon) in places.items():
+            reports[name] = Report(title=name, description="d", location=name,
+                                   latitude=lat, longitude=lon,
+                                   user_id=user.id, image_path=photo)
+            db.add(reports[name])
+            db.flush()
+            apply_report_stats_sync(db, None, report_facts(reports[name]))
+        db.commit()
+        ids = {name: report.id for name, report in reports.items()}
+
+    duplicate_index.loaded_at = None
+    for report_id in ids.values():
+        detect_duplicates(report_id, photo)
+
+    with SessionLocal() as db:
+        duplicate_of = {name: db.get(Report, report_id).duplicate_of_id
+                        for name, report_id in ids.items()}
+    assert duplicate_of == {"first": None, "next door": ids["first"], "far away": None}
@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.export import accepts_gzip
+from app.database import SessionLocal
+from app.main import app
+from app.models.user import User
+
+
+@pytest.mark.parametrize("header, gzip", [
+    ("", False),
+    ("gzip", True),
+    ("deflate, gzip;q=0.5", True),
+    ("GZIP", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, identity", False),
+    ("gzips", False),
+    ("x-gzip", True),
+    ("*", True),
+    ("*;q=0", False),
+    ("gzip;q=0, *", False),
+    ("br, *;q=0.1", True),
+    ("identity", False),
+])
+def test_accepts_gzip(header, gzip):
+    assert accepts_gzip(header) is gzip
+
+
+def test_export_honours_accept_encoding():
+    with TestClient(app) as client:
+        client.post("/auth/register", json={
+            "name": "exporter", "email": "exporter@example.com", "password": "pw",
+        })
+        with SessionLocal() as db:
+            db.execute(update(User).where(User.email == "exporter@example.com").values(role="admin"))
+            db.commit()
+        token = client.post("/auth/login", data={
+            "username": "exporter@example.com", "password": "pw",
+        }).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+
+        for accept, encoding in [("gzip", "gzip"), ("gzip;q=0", None)]:
+            response = client.get("/reports/export", headers={**auth, "Accept-Encoding": accept})
+            assert response.status_code == 200, response.text
+            assert response.headers.get("content-encoding") == encoding
+            assert "Accept-Encoding" in response.headers["vary"]
+            assert response.text.startswith("id,")
@@ -0,0 +1,75 @@
+"""
+/reports/feed must build a page, comments and reactions included, in a
+fixed number of statements whatever the page size (no N+1), as checked at
+scale by benchmarks/feed_queries.py.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.response_cache import response_cache
+from app.database import async_engine
+from app.main import app
+
+PAGE_SIZES = (1, 3, 6)
+# page of reports + their latest comments, + the reader's own reactions
+STATEMENTS = {None: 2, "reader": 3}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        headers = {}
+        for name in ("poster", "reader"):
+            client.post("/auth/register", json={
+                "name": name, "email": f"feed-{name}@example.com", "password": "pw",
+            })
+            token = client.post("/auth/login", data={
+                "username": f"feed-{name}@example.com", "password": "pw",
+            }).json()["access_token"]
+            headers[name] = {"Authorization": f"Bearer {token}"}
+
+        for i in range(max(PAGE_SIZES)):
+            report_id = client.post(
+                "/reports/",
+                data={"title": f"Feed report {i}", "description": "d", "location": "l"},
+                headers=headers["poster"],
+            ).json()["id"]
+            for _ in range(2):
+                client.post(f"/reports/{report_id}/comments",
+                            data={"content": "c"}, headers=headers["reader"])
+            client.post(f"/reports/{report_id}/reaction",
+                        data={"type": "like"}, headers=headers["reader"])
+
+        # Warm up: caches the signed-in principal, as on any later request
+        client.get("/reports/feed?limit=1", headers=headers["reader"])
+        client.headers_by_user = headers
+        yield client
+
+
+def _statement_count(client, path: str, headers: dict | None) -> int:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    response_cache.clear()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.get(path, headers=headers)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200, response.text
+    assert all(item["comments"] for item in response.json()["items"])
+    return len(statements)
+
+
+@pytest.mark.parametrize("user", STATEMENTS, ids=["anonymous", "signed in"])
+def test_feed_statements_do_not_grow_with_page_size(client, user):
+    headers = client.headers_by_user[user] if user else None
+    counts = {
+        limit: _statement_count(client, f"/reports/feed?limit={limit}", headers)
+        for limit in PAGE_SIZES
+    }
+    assert set(counts.values()) == {STATEMENTS[user]}, counts
@@ -0,0 +1,16 @@
+import pytest
+
+from app.core.geocoding import OfflineGeocoder
+
+
+@pytest.mark.parametrize("location, expected", [
+    ("3.1390, 101.6869", (3.1390, 101.6869)),
+    (" -2.5,100 ", (-2.5, 100.0)),
+    # numbers inside an address are not coordinates
+    ("Lot 5, 7 Jalan Ampang", (3.1500, 101.7600)),
+    ("No. 12, 3 Jalan Sentul", (3.1850, 101.6930)),
+    ("Near 3.1, 101.6 somewhere", None),
+    ("95, 10", None),
+])
+def test_geocode(location, expected):
+    assert OfflineGeocoder().geocode(location) == expected
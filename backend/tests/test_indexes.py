@@ -0,0 +1,112 @@
+"""
+Every hot-path route must read through an index: EXPLAIN QUERY PLAN of the
+statements each route actually issues may not contain a full table scan.
+"""
+import re
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+
+from app.database import Base, SessionLocal, async_engine, engine
+from app.main import app
+from app.core.response_cache import response_cache
+from app.models.notification import Notification
+
+# "SCAN reports" is a full scan; "SCAN reports USING INDEX ..." walks an
+# index in order, and "SEARCH ..." is an index lookup.
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+# (path, signed in as, index the route must use)
+HOT_PATHS = [
+    ("/reports/public?limit=5", None, "ix_reports_created_at_id"),
+    ("/reports/public?status=pending&limit=5", None, "ix_reports_status_created_at_id"),
+    ("/reports/feed?limit=5", None, "ix_reports_created_at_id"),
+    ("/reports/feed?limit=5", "reader", "ix_comments_report_id_created_at"),
+    ("/reports/me", "author", "ix_reports_user_id"),
+    ("/reports/1/comments", None, "ix_comments_report_id_created_at"),
+    ("/reports/1/reactions", "author", None),
+    ("/notifications/?limit=5", "author", "ix_notifications_user_id_created_at"),
+    ("/notifications/unread-count", "author", "ix_notifications_user_id_is_read"),
+]
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        headers = {}
+        for name in ("author", "reader"):
+            client.post("/auth/register", json={
+                "name": name, "email": f"{name}@example.com", "password": "pw",
+            })
+            token = client.post("/auth/login", data={
+                "username": f"{name}@example.com", "password": "pw",
+            }).json()["access_token"]
+            headers[name] = {"Authorization": f"Bearer {token}"}
+
+        for i in range(5):
+            report_id = client.post(
+                "/reports/",
+                data={"title": f"Report {i}", "description": "d", "location": "l"},
+                headers=headers["author"],
+            ).json()["id"]
+            client.post(f"/reports/{report_id}/comments",
+                        data={"content": "c"}, headers=headers["reader"])
+            client.post(f"/reports/{report_id}/reaction",
+                        data={"type": "like"}, headers=headers["reader"])
+
+        _wait_for_notifications(10)
+        client.headers_by_user = headers
+        yield client
+
+
+def _wait_for_notifications(expected: int, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with SessionLocal() as db:
+            if db.scalar(select(func.count(Notification.id))) >= expected:
+                return
+        time.sleep(0.05)
+    raise AssertionError("notification jobs did not run")
+
+
+def _route_statements(client, path: str, headers: dict | None):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    response_cache.clear()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.get(path, headers=headers)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200, response.text
+    return statements
+
+
+@pytest.mark.parametrize("path, user, index", HOT_PATHS)
+def test_route_reads_through_an_index(client, path, user, index):
+    headers = client.headers_by_user[user] if user else None
+    statements = _route_statements(client, path, headers)
+    assert statements, f"{path} issued no SELECT"
+
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = [row[3] for row in conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )]
+            for step in plan:
+                scan = FULL_SCAN.match(step)
+                assert not (scan and scan.group(1) in Base.metadata.tables), (
+                    f"{path} scans {scan.group(1)}:\n{statement}\n" + "\n".join(plan)
+                )
+            plans.extend(plan)
+
+    if index is not None:
+        assert any(index in step for step in plans), "\n".join(plans)
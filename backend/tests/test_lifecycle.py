@@ -0,0 +1,98 @@
+"""
+Status changes of the same report racing each other: exactly one may apply,
+and the event log and the analytics must count it once.
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.core.lifecycle import change_status, record_created
+from app.core.stats import apply_report_stats, check_report_stats, report_facts
+from app.database import AsyncSessionLocal, SessionLocal, engine
+from app.migrations import run_migrations
+from app.models.report import Report
+from app.models.report_stats import ReportStateDuration
+from app.models.report_status_event import ReportStatusEvent
+from app.models.user import User
+
+
+async def _create_report(email: str) -> int:
+    async with AsyncSessionLocal() as db:
+        user = User(name="admin", email=email, password_hash="x", role="admin")
+        db.add(user)
+        await db.flush()
+        report = Report(title="Pothole", description="Deep", location="Main St", user_id=user.id)
+        db.add(report)
+        await db.flush()
+        record_created(db, report, user.id)
+        await apply_report_stats(db, None, report_facts(report))
+        await db.commit()
+        return report.id
+
+
+async def _race(report_id: int, status: str) -> list:
+    sessions = [AsyncSessionLocal() for _ in range(2)]
+    try:
+        # Both read the report before either writes
+        reports = [await db.get(Report, report_id) for db in sessions]
+
+        async def transition(db, report):
+            changed = await change_status(db, report, status, None)
+            await db.commit()
+            return changed
+
+        return await asyncio.gather(
+            *(transition(db, report) for db, report in zip(sessions, reports)),
+            return_exceptions=True,
+        )
+    finally:
+        for db in sessions:
+            await db.close()
+
+
+def _pending_durations() -> int:
+    with SessionLocal() as db:
+        return db.scalar(
+            select(func.coalesce(func.sum(ReportStateDuration.count), 0))
+            .where(ReportStateDuration.state == "pending")
+        )
+
+
+def test_concurrent_transitions_apply_once():
+    run_migrations(engine)
+    report_id = asyncio.run(_create_report("race@example.com"))
+    durations = _pending_durations()
+
+    outcomes = asyncio.run(_race(report_id, "in_progress"))
+
+    assert outcomes.count(True) == 1
+    [conflict] = [o for o in outcomes if o is not True]
+    assert isinstance(conflict, HTTPException) and conflict.status_code == 409
+
+    with SessionLocal() as db:
+        assert db.get(Report, report_id).status == "in_progress"
+        assert db.scalar(
+            select(func.count()).where(ReportStatusEvent.report_id == report_id)
+        ) == 2
+        assert check_report_stats(db) == []
+    assert _pending_durations() == durations + 1
+
+
+def test_stale_transition_is_rejected():
+    run_migrations(engine)
+    report_id = asyncio.run(_create_report("stale@example.com"))
+
+    async def stale():
+        async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+            report = await first.get(Report, report_id)
+            stale_report = await second.get(Report, report_id)
+            assert await change_status(first, report, "in_progress", None)
+            await first.commit()
+            # Valid from the status `second` read, but that is out of date
+            with pytest.raises(HTTPException) as raised:
+                await change_status(second, stale_report, "in_progress", None)
+            assert raised.value.status_code == 409
+
+    asyncio.run(stale())
@@ -0,0 +1,57 @@
+import math
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.geohash import EARTH_RADIUS_M, encode, haversine_m
+from app.core.stats import apply_report_stats_sync, report_facts
+from app.database import SessionLocal
+from app.main import app
+from app.models.report import Report
+from app.models.user import User
+
+ORIGIN = (51.5007, -0.1246)
+# Reports every 100 m going north-east, listed out of distance order
+STEPS = [7, 2, 9, 0, 4, 1, 8, 3, 6, 5]
+
+
+@pytest.fixture(scope="module")
+def client():
+    step = math.degrees(100 / EARTH_RADIUS_M) / math.sqrt(2)
+    with SessionLocal() as db:
+        user = User(name="nearby", email="nearby@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        for n in STEPS:
+            lat = ORIGIN[0] + n * step
+            lon = ORIGIN[1] + n * step / math.cos(math.radians(ORIGIN[0]))
+            report = Report(title=f"{n * 100} m", description="d", location="Westminster",
+                            latitude=lat, longitude=lon, geohash=encode(lat, lon),
+                            user_id=user.id)
+            db.add(report)
+            db.flush()
+            apply_report_stats_sync(db, None, report_facts(report))
+        db.commit()
+
+    with TestClient(app) as client:
+        yield client
+
+
+def _nearby(client, **params):
+    response = client.get("/reports/public/nearby",
+                          params={"lat": ORIGIN[0], "lon": ORIGIN[1], **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_nearest_reports_first(client):
+    hits = _nearby(client, radius=5000, limit=4)
+    assert [hit["title"] for hit in hits] == ["0 m", "100 m", "200 m", "300 m"]
+    for hit in hits:
+        exact = haversine_m(*ORIGIN, hit["latitude"], hit["longitude"])
+        assert hit["distance_m"] == round(exact)
+
+
+def test_radius_is_exact(client):
+    hits = _nearby(client, radius=250, limit=50)
+    assert [hit["title"] for hit in hits] == ["0 m", "100 m", "200 m"]
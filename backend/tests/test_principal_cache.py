@@ -0,0 +1,39 @@
+from sqlalchemy import update
+
+from app.core.deps import Principal, principal_cache
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.models.user import User
+
+
+def _cached_user(email: str) -> int:
+    run_migrations(engine)
+    with SessionLocal() as db:
+        user = User(name="cached", email=email, password_hash="x")
+        db.add(user)
+        db.commit()
+        principal_cache.set(user.id, Principal(user.id, user.name, user.email, user.role))
+        return user.id
+
+
+def test_change_is_evicted_only_when_committed():
+    user_id = _cached_user("promoted@example.com")
+    with SessionLocal() as db:
+        db.get(User, user_id).role = "admin"
+        db.flush()
+        assert principal_cache.get(user_id) is not None
+        db.rollback()
+    assert principal_cache.get(user_id) is not None
+
+    with SessionLocal() as db:
+        db.get(User, user_id).role = "admin"
+        db.commit()
+    assert principal_cache.get(user_id) is None
+
+
+def test_bulk_update_evicts():
+    user_id = _cached_user("bulk@example.com")
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.id == user_id).values(role="admin"))
+        db.commit()
+    assert principal_cache.get(user_id) is None
@@ -0,0 +1,44 @@
+from sqlalchemy import update
+
+from app.ai.batching import _store_prediction
+from app.core.stats import check_report_stats, rebuild_report_stats
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.models.report import Report
+from app.models.user import User
+
+
+def _report(db, email: str) -> Report:
+    user = User(name="stats", email=email, password_hash="x")
+    db.add(user)
+    db.flush()
+    report = Report(title="Bin", description="Full", location="Park",
+                    user_id=user.id, image_path="uploads/bin.jpg")
+    db.add(report)
+    db.flush()
+    return report
+
+
+def test_rebuild_skips_reports_without_created_at():
+    run_migrations(engine)
+    with SessionLocal() as db:
+        report = _report(db, "undated@example.com")
+        db.execute(update(Report).where(Report.id == report.id).values(created_at=None))
+        rebuild_report_stats(db)
+        assert check_report_stats(db) == []
+        db.rollback()
+
+
+def test_prediction_moves_report_between_categories():
+    run_migrations(engine)
+    with SessionLocal() as db:
+        report = _report(db, "classified@example.com")
+        rebuild_report_stats(db)
+
+        _store_prediction(db, report.id, "uploads/bin.jpg", "waste", 0.9)
+        assert check_report_stats(db) == []
+        # An image that was replaced while queued is not classified
+        _store_prediction(db, report.id, "uploads/old.jpg", "roads", 0.9)
+        db.refresh(report)
+        assert report.predicted_category == "waste"
+        db.rollback()
@@ -0,0 +1,17 @@
+import os
+
+from PIL import Image
+
+from app.core.thumbnails import derivative_path, generate_derivatives
+
+
+def test_oversized_image_keeps_the_original(monkeypatch, tmp_path):
+    path = str(tmp_path / "huge.png")
+    Image.new("RGB", (200, 200)).save(path)
+    # Pillow refuses images over twice this many pixels outright
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 10_000)
+
+    generate_derivatives(0, path)
+
+    assert not os.path.exists(derivative_path(path, "thumb"))
+    assert os.listdir(tmp_path) == ["huge.png"]
@@ -0,0 +1,44 @@
+import io
+import os
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.core import uploads
+from app.main import app
+
+
+def test_upload_is_staged_outside_the_public_directory(monkeypatch):
+    held = []
+    finish = uploads.finish_upload
+
+    def finish_upload(upload, referenced):
+        # Still linked from staging while the request runs
+        held.append((upload.held_path, os.path.exists(upload.held_path)))
+        finish(upload, referenced)
+
+    monkeypatch.setattr(uploads, "finish_upload", finish_upload)
+
+    image = io.BytesIO()
+    Image.new("RGB", (64, 48), "red").save(image, "PNG")
+    with TestClient(app) as client:
+        client.post("/auth/register", json={
+            "name": "uploader", "email": "uploader@example.com", "password": "pw",
+        })
+        token = client.post("/auth/login", data={
+            "username": "uploader@example.com", "password": "pw",
+        }).json()["access_token"]
+        response = client.post(
+            "/reports/",
+            data={"title": "Red", "description": "d", "location": "l"},
+            files={"image": ("red.png", image.getvalue(), "image/png")},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert response.status_code == 200, response.text
+    [(held_path, existed)] = held
+    assert existed
+    assert os.path.dirname(held_path) == uploads.UPLOAD_STAGING_DIR
+    assert os.path.commonpath([held_path, uploads.UPLOAD_DIR]) != uploads.UPLOAD_DIR
+    assert os.listdir(uploads.UPLOAD_STAGING_DIR) == []
+    assert os.path.exists(response.json()["image_path"])
@@ -152,12 +152,11 @@ document.addEventListener("click", (e) => {
 async function loadNotificationBadge() {
   if (!isAuthenticated()) return;
 
-  const res = await fetch(`${API}/notifications/`, {
+  const res = await fetch(`${API}/notifications/unread-count`, {
     headers: { Authorization: `Bearer ${getToken()}` }
   });
 
-  const data = await res.json();
-  const unread = data.filter(n => !n.is_read).length;
+  const { unread } = await res.json();
 
   const badge = document.getElementById("notifBadge");
   if (!badge) return;